@@ -0,0 +1,426 @@
+# Davka v Pythonu. Profil alokaci knihoven z lib/ - kolik objektu a bajtu alokuje kazda metoda ovladace
+# a kazda nota melodie, a ktere radky jsou nejhorsi. Slouzi k odhadu pauz garbage collectoru na pico:ed.
+# Verze souboru ze dne 2026-10-19
+#
+# Jak to funguje:
+# - pripady (volani metod a melodie) jsou stejne jako v bench.py
+# - jedno volani se projde sys.settrace; mezi dvema udalostmi se zmeri prirustek bloku
+#   (sys.getallocatedblocks) a bajtu (tracemalloc) a pripise se radku, ktery se prave provadel
+# - CPython recykluje floaty, male seznamy a n-tice (free list), takze je tracemalloc nevidi.
+#   Na pico:ed je ale kazdy float, f-string, bytearray nebo seznam novy objekt na heapu.
+#   Proto se ke kazdemu radku jeste z AST spocita, kolik takovych objektu vytvori (odhad pro zarizeni,
+#   vcetne instanci trid z lib/ a stubu jako DigitalInOut nebo PulseIn), a vynasobi se poctem provedeni radku.
+#   Pocita se i formatovani retezcu (f-string, +, %, str(), join), generatorove vyrazy a volani
+#   generatoru a async funkci ze stejneho souboru (novy generator/korutina na heapu).
+#   Tento odhad je presne opakovatelny (hlida ho bench.py).
+#   Slepa mista odhadu: objekty, ktere vrati volana funkce nebo metoda (napr. seznam z jine metody,
+#   n-tice ze struct.unpack, range a iteratory), z AST nepozna - ty zachyti jen namerene bloky.
+#   Namerene bloky a bajty zavisi na stavu interpretu; bench.py hlida bloky jen hrube (nejmensi ze tri
+#   mereni, s rezervou).
+# - pocitaji se radky z lib/ a ze stubu adafruit_irremote a adafruit_motor (kopiruji kod knihoven,
+#   ktere na pico:ed bezi take); ostatni stuby jen s --stubs
+# - noty se meri kazda zvlast (vsechny ruzne noty ze vsech vestavenych melodii)
+#
+# Pouziti:
+#   python .vscode/allocprof.py                  (zebricek metod, not a nejhorsich radku)
+#   python .vscode/allocprof.py --top 30
+#   python .vscode/allocprof.py --filter music --json alloc.json
+import argparse
+import ast
+import gc
+import json
+import linecache
+import os
+import sys
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench  # noqa: E402
+import fakehw  # noqa: E402
+import board  # noqa: E402
+
+# Vestavene funkce a metody retezcu, ktere vzdy vytvori novy objekt
+ALLOCATING_CALLS = {
+    "bytearray": "bytes", "bytes": "bytes", "memoryview": "bytes",
+    "list": "list", "dict": "dict", "tuple": "tuple", "set": "set", "sorted": "list",
+    "str": "str", "repr": "str", "format": "str", "float": "float",
+}
+# Kde se pocitaji alokace: lib/ a stuby, ktere kopiruji kod knihoven nahravanych na pico:ed do /lib
+# (skutecne cesty - modul naimportovany pres jinak zapsanou cestu v sys.path se musi pocitat taky)
+DEVICE_PREFIXES = (
+    os.path.join(os.path.realpath(fakehw.LIB_DIR), ""),
+    os.path.join(os.path.realpath(fakehw.LIB_VSC_ONLY_DIR), "adafruit_irremote.py"),
+    os.path.join(os.path.realpath(fakehw.LIB_VSC_ONLY_DIR), "adafruit_motor", ""),
+)
+STR_METHODS = {
+    "lower", "upper", "split", "strip", "lstrip", "rstrip", "replace", "join", "format",
+    "encode", "decode",
+}
+
+
+def trace_lines(call, prefixes=DEVICE_PREFIXES):
+    # Provede call() pod sys.settrace a vrati {(soubor, radek): [provedeni, bloky, bajty]}
+    # jen pro soubory, jejichz cesta zacina nekterym z prefixes.
+    # Tracer sam o sobe posune citace o konstantu, ta se odecte (zmeri se na funkci,
+    # ktera nic nealokuje, bere se nejcastejsi hodnota). Objekt ramce vytvari az sys.settrace, na zarizeni neexistuje.
+    blocks = sys.getallocatedblocks
+    memory = tracemalloc.get_traced_memory
+    last = array("q", [0, 0])
+    bias = array("q", [0, 0])
+    lines = {}
+    current = [None, 0]      # soubor a radek, ktery se prave provadi (None = mimo prefixes)
+    resolved = {}            # co_filename -> skutecna cesta, nebo None mimo prefixes
+
+    def tracer(frame, event, arg):
+        delta_blocks = blocks() - last[0] - bias[0]
+        delta_bytes = memory()[0] - last[1] - bias[1]
+        if event == "call":
+            delta_blocks -= 1
+            delta_bytes -= sys.getsizeof(frame)
+        if current[0] is not None and (delta_blocks > 0 or delta_bytes > 0):
+            entry = lines[(current[0], current[1])]
+            entry[1] += max(delta_blocks, 0)
+            entry[2] += max(delta_bytes, 0)
+        filename = frame.f_code.co_filename
+        if filename in resolved:
+            filename = resolved[filename]
+        else:
+            path = os.path.realpath(filename)
+            filename = resolved[filename] = path if path.startswith(prefixes) else None
+        if filename is not None:
+            current[0] = filename
+            current[1] = frame.f_lineno
+            entry = lines.get((filename, current[1]))
+            if entry is None:
+                entry = lines[(filename, current[1])] = [0, 0, 0]
+            if event == "line":
+                entry[0] += 1
+        else:
+            current[0] = None
+        last[0] = blocks()
+        last[1] = memory()[0]
+        return tracer
+
+    def idle():
+        a = 1
+        b = a
+        a = b
+        b = a
+        a = b
+        b = a
+        return b
+
+    samples = []
+
+    def calibrate(frame, event, arg):
+        if event == "line":
+            samples.append((blocks() - last[0], memory()[0] - last[1]))
+        last[0] = blocks()
+        last[1] = memory()[0]
+        return calibrate
+
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    try:
+        call()      # zahrati - prvni volani plni cache, importuje, ...
+        call()
+        gc.collect()
+        last[0] = blocks()
+        last[1] = memory()[0]
+        sys.settrace(calibrate)
+        idle()
+        sys.settrace(None)
+        # Nejcastejsi posun (ojedinele hodnoty jsou uvolneni objektu mimo tracer)
+        bias[0] = max(set(sample[0] for sample in samples), key=[sample[0] for sample in samples].count)
+        bias[1] = max(set(sample[1] for sample in samples), key=[sample[1] for sample in samples].count)
+        lines.clear()
+        sys.settrace(tracer)
+        call()
+    finally:
+        sys.settrace(None)
+        if not started:
+            tracemalloc.stop()
+    return lines
+
+
+_classes = set()
+
+
+def known_classes():
+    # Jmena trid z lib/ a lib_vsc_only/ (stuby kopiruji moduly zarizeni: DigitalInOut, PulseIn, GenericDecode, ...).
+    # Vytvoreni instance je na zarizeni novy objekt na heapu (vysledek se uklada).
+    if not _classes:
+        for directory in (fakehw.LIB_DIR, fakehw.LIB_VSC_ONLY_DIR):
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    if name.endswith(".py"):
+                        with open(os.path.join(root, name), encoding="utf-8") as file:
+                            tree = ast.parse(file.read(), name)
+                        _classes.update(node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef))
+    return _classes
+
+
+class _DeviceAllocations(ast.NodeVisitor):
+    # Projde AST souboru a ke kazdemu radku zapise, ktere objekty na nem vzniknou
+    # na CircuitPythonu ({radek: {"float": 2, "str": 1, ...}}).
+    def __init__(self, classes=(), generators=()):
+        self.lines = {}
+        self.classes = classes
+        self.generators = generators
+
+    def _add(self, node, kind):
+        kinds = self.lines.setdefault(node.lineno, {})
+        kinds[kind] = kinds.get(kind, 0) + 1
+
+    @staticmethod
+    def _is_float(node):
+        if isinstance(node, ast.Constant):
+            return isinstance(node.value, float)
+        if isinstance(node, ast.BinOp):
+            return isinstance(node.op, ast.Div) or \
+                _DeviceAllocations._is_float(node.left) or _DeviceAllocations._is_float(node.right)
+        if isinstance(node, ast.UnaryOp):
+            return _DeviceAllocations._is_float(node.operand)
+        if isinstance(node, ast.Call):
+            return isinstance(node.func, ast.Name) and node.func.id == "float"
+        return False
+
+    def visit_BinOp(self, node):
+        if self._is_float(node):
+            self._add(node, "float")
+        elif isinstance(node.op, ast.Add) and any(
+                isinstance(side, (ast.JoinedStr, ast.Constant)) and isinstance(getattr(side, "value", ""), str)
+                for side in (node.left, node.right)):
+            self._add(node, "str")
+        elif isinstance(node.op, ast.Mod) and isinstance(node.left, ast.Constant) and isinstance(node.left.value, str):
+            # "%d ms" % value
+            self._add(node, "str")
+        self.generic_visit(node)
+
+    def visit_UnaryOp(self, node):
+        if self._is_float(node) and not isinstance(node.operand, ast.Constant):
+            self._add(node, "float")
+        self.generic_visit(node)
+
+    def visit_JoinedStr(self, node):
+        self._add(node, "str")
+        # Vnorene FormattedValue nevytvari dalsi vysledny retezec, ale kazda hodnota se formatuje
+        for value in node.values:
+            if isinstance(value, ast.FormattedValue):
+                self._add(node, "str")
+                self.visit(value.value)
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Name) and func.id in ALLOCATING_CALLS:
+            self._add(node, ALLOCATING_CALLS[func.id])
+        elif isinstance(func, ast.Name) and func.id in self.classes or \
+                isinstance(func, ast.Attribute) and func.attr in self.classes:
+            # Instance tridy stejne jako v heapbudget.py (Cutebot(), digitalio.DigitalInOut(pin), ...)
+            self._add(node, "object")
+        elif isinstance(func, ast.Attribute) and func.attr in STR_METHODS:
+            self._add(node, "str" if func.attr != "split" else "list")
+        elif isinstance(func, ast.Name) and func.id in self.generators or \
+                isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and \
+                func.value.id == "self" and func.attr in self.generators:
+            # Volani generatoru nebo async funkce vytvori objekt generatoru/korutiny
+            self._add(node, "generator")
+        self.generic_visit(node)
+
+    def visit_List(self, node):
+        self._add(node, "list")
+        self.generic_visit(node)
+
+    def visit_Dict(self, node):
+        self._add(node, "dict")
+        self.generic_visit(node)
+
+    def visit_Set(self, node):
+        self._add(node, "set")
+        self.generic_visit(node)
+
+    def visit_Tuple(self, node):
+        # Konstantni n-tice jsou v bajtkodu predem pripravene, nic nealokuji
+        if isinstance(node.ctx, ast.Load) and \
+                not all(isinstance(element, ast.Constant) for element in node.elts):
+            self._add(node, "tuple")
+        self.generic_visit(node)
+
+    def visit_ListComp(self, node):
+        self._add(node, "list")
+        self.generic_visit(node)
+
+    def visit_DictComp(self, node):
+        self._add(node, "dict")
+        self.generic_visit(node)
+
+    def visit_SetComp(self, node):
+        self._add(node, "set")
+        self.generic_visit(node)
+
+    def visit_GeneratorExp(self, node):
+        self._add(node, "generator")
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node):
+        if isinstance(node.slice, ast.Slice):
+            self._add(node, "slice")
+        self.generic_visit(node)
+
+    def visit_Lambda(self, node):
+        self._add(node, "closure")
+        self.generic_visit(node)
+
+
+_device_cache = {}
+
+
+def _generator_functions(tree):
+    # Jmena funkci a metod souboru, jejichz volani vrati generator nebo korutinu.
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.AsyncFunctionDef):
+            names.add(node.name)
+        elif isinstance(node, ast.FunctionDef) and any(
+                isinstance(child, (ast.Yield, ast.YieldFrom)) for child in ast.walk(node)):
+            names.add(node.name)
+    return names
+
+
+def device_allocations(filename):
+    # Vrati {radek: {druh: pocet}} pro soubor (vysledek se uklada).
+    result = _device_cache.get(filename)
+    if result is None:
+        with open(filename, encoding="utf-8") as file:
+            tree = ast.parse(file.read(), filename)
+        visitor = _DeviceAllocations(known_classes(), _generator_functions(tree))
+        visitor.visit(tree)
+        result = _device_cache[filename] = visitor.lines
+    return result
+
+
+def profile(call, prefixes=DEVICE_PREFIXES):
+    # Zmeri jedno volani. Vrati souhrn {"blocks", "bytes", "device", "kinds"}
+    # a seznam radku [(soubor, radek, provedeni, bloky, bajty, {druh: pocet na zarizeni})].
+    rows = []
+    summary = {"blocks": 0, "bytes": 0, "device": 0, "kinds": {}}
+    for (filename, lineno), (hits, blocks, size) in trace_lines(call, prefixes).items():
+        kinds = {
+            kind: count * hits
+            for kind, count in device_allocations(filename).get(lineno, {}).items()
+        }
+        if not (blocks or size or kinds):
+            continue
+        rows.append((filename, lineno, hits, blocks, size, kinds))
+        summary["blocks"] += blocks
+        summary["bytes"] += size
+        for kind, count in kinds.items():
+            summary["kinds"][kind] = summary["kinds"].get(kind, 0) + count
+            summary["device"] += count
+    return summary, rows
+
+
+def note_cases(music_module):
+    # Pripad pro kazdou ruznou notu ze vsech vestavenych melodii (jak ji hraje Music.play).
+    notes = set()
+    for name in dir(music_module.Music):
+        tune = getattr(music_module.Music, name)
+        if name.isupper():
+            notes.update(music_module.Music.tune_notes(tune))
+
+    def setup(note):
+        def call():
+            music = music_module.Music(board.BUZZER)
+            return lambda: music.pitch(*music._get_frequency_duration(note))
+        return call
+
+    return [bench.Case(f"nota '{note}'", setup(note)) for note in sorted(notes)]
+
+
+def format_kinds(kinds):
+    return " ".join(f"{kind}:{count}" for kind, count in sorted(kinds.items(), key=lambda item: -item[1]))
+
+
+def short_path(filename):
+    return os.path.relpath(filename, fakehw.ROOT_DIR).replace(os.sep, "/")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profil alokaci knihoven z lib/ nad fake hardware.")
+    parser.add_argument("--filter", help="jen pripady, jejichz jmeno obsahuje tento text")
+    parser.add_argument("--top", type=int, default=15, help="kolik polozek vypsat v kazdem zebricku")
+    parser.add_argument("--stubs", action="store_true", help="pocitat i radky ostatnich stubu z lib_vsc_only/")
+    parser.add_argument("--json", help="ulozit kompletni vysledky do JSON souboru")
+    args = parser.parse_args()
+
+    prefixes = DEVICE_PREFIXES + (os.path.join(os.path.realpath(fakehw.LIB_VSC_ONLY_DIR), ""),) if args.stubs else DEVICE_PREFIXES
+    cases = bench.make_cases()
+    music_module = fakehw.import_lib("elecfreaks_music")
+    notes = note_cases(music_module)
+    if args.filter:
+        cases = [case for case in cases if args.filter in case.name]
+        notes = [case for case in notes if args.filter in case.name]
+
+    results = {}
+    hot_lines = {}
+    for case in cases + notes:
+        bench.reset_stubs()
+        summary, rows = profile(case.setup(), prefixes)
+        summary["units"] = case.units
+        results[case.name] = summary
+        if case in notes:
+            continue
+        for filename, lineno, hits, blocks, size, kinds in rows:
+            line = hot_lines.setdefault((filename, lineno), {"blocks": 0, "bytes": 0, "device": 0, "kinds": {}, "cases": 0})
+            line["blocks"] += blocks
+            line["bytes"] += size
+            line["device"] += sum(kinds.values())
+            line["cases"] += 1
+            for kind, count in kinds.items():
+                line["kinds"][kind] = line["kinds"].get(kind, 0) + count
+
+    def ranked(names):
+        return sorted(names, key=lambda name: (-results[name]["device"] / results[name]["units"], -results[name]["bytes"]))
+
+    methods = [case.name for case in cases]
+    print(f"Metody a melodie - alokace na jedno volani (zarizeni = odhad objektu na heapu CircuitPythonu)")
+    print(f"{'pripad':<32} {'zarizeni':>8} {'/nota':>6} {'bloky':>6} {'B':>7}  druhy")
+    for name in ranked(methods)[:args.top]:
+        result = results[name]
+        per_unit = f"{result['device'] / result['units']:>6.1f}" if result["units"] > 1 else f"{'':>6}"
+        print(f"{name:<32} {result['device']:>8} {per_unit} {result['blocks']:>6} {result['bytes']:>7}  {format_kinds(result['kinds'])}")
+
+    if notes:
+        print()
+        print(f"Noty - alokace na jednu notu ({len(notes)} ruznych not)")
+        print(f"{'nota':<32} {'zarizeni':>8} {'':>6} {'bloky':>6} {'B':>7}  druhy")
+        for name in ranked([case.name for case in notes])[:args.top]:
+            result = results[name]
+            print(f"{name:<32} {result['device']:>8} {'':>6} {result['blocks']:>6} {result['bytes']:>7}  {format_kinds(result['kinds'])}")
+
+    print()
+    print("Nejhorsi radky (soucet pres vsechny pripady)")
+    print(f"{'radek':<38} {'zarizeni':>8} {'bloky':>6} {'B':>7}  zdroj")
+    worst = sorted(hot_lines.items(), key=lambda item: (-item[1]["device"], -item[1]["bytes"]))
+    for (filename, lineno), line in worst[:args.top]:
+        source = linecache.getline(filename, lineno).strip()
+        print(f"{short_path(filename) + ':' + str(lineno):<38} {line['device']:>8} {line['blocks']:>6} {line['bytes']:>7}  {source[:60]}")
+        if line["kinds"]:
+            print(f"{'':<38} {'':>8} {'':>6} {'':>7}  ({format_kinds(line['kinds'])})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({
+                "cases": results,
+                "lines": [
+                    dict(line, file=short_path(filename), line=lineno)
+                    for (filename, lineno), line in worst
+                ],
+            }, file, indent=2)
+        print(f"Vysledky ulozeny do '{args.json}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,468 @@
+# Davka v Pythonu. Mereni rychlosti a alokaci knihoven z lib/ (cutebot, ringbit, elecfreaks_music) nad fake hardware.
+# Vysledky porovna se zakladnou v .vscode/bench_baseline.json a skonci chybou, kdyz se neco zhorsi.
+# Verze souboru ze dne 2026-10-19
+#
+# Jak to funguje:
+# - knihovny se naimportuji pres lib_vsc_only/fakehw.py (time.sleep jen posouva simulovany cas)
+# - kazdy "pripad" je jedno volani verejne metody ovladace (a kazda vestavena melodie pres play i play_async);
+#   asynchronni metody se provedou bez event loopu, asyncio.sleep jen posune simulovany cas
+# - cas na volani: nekolik kol, v kazdem tolik volani, aby kolo trvalo aspon --min-time; bere se nejlepsi kolo
+#   a porovnava se v pomeru k referencni praci zmerene tesne pred nim (zakladna se prepocte na tento pocitac)
+# - alokace na volani (viz allocprof.py): "objekty" je odhad objektu, ktere volani vytvori na heapu
+#   CircuitPythonu (floaty, retezce vcetne %, str() a join, seznamy, bytearray, instance trid,
+#   generatory, ...) - spocita se z AST provedenych radku, je stejny pri kazdem behu (spusteni skriptem
+#   i import modulu) a hlida se presne: kazde zvyseni je chyba
+# - slepa mista odhadu: objekty vracene z volanych funkci a metod (seznam z jine metody, n-tice ze
+#   struct.unpack, range, iteratory) - proto se hlidaji i "bloky" namerene v CPythonu
+#   (sys.getallocatedblocks, nejmensi ze TRACE_RUNS mereni); ty kolisaji se stavem interpretu
+#   (free listy, prvni pouziti), takze chyba je az zvyseni o vic nez BLOCKS_SLACK bloku a BLOCKS_THRESHOLD;
+#   "B" jsou bajty z tracemalloc - jen pro orientaci
+# - --imports: kazdy modul z lib/ se naimportuje v samostatnem procesu (board, digitalio, micropython
+#   a picoed uz jsou nactene, jako vestavene moduly na zarizeni; asyncio taky - import asyncio z CPythonu
+#   trva stovky ms a se zarizenim nema nic spolecneho) - cas importu (median z IMPORT_RUNS), pamet, ktera v CPythonu
+#   po importu zustane (tracemalloc), odhad heapu na zarizeni (heapbudget.py) pro nactene moduly z lib/
+#   a seznam nactenych modulu z lib/ a stubu; na zarizeni se to zmeri pres gc.mem_free() pred a po importu.
+#   Chyba je, kdyz import nove nacte modul, ktery v zakladne nenacital (napr. neopixel v cutebot)
+#
+# Pouziti:
+#   python .vscode/bench.py                      (zmerit a porovnat se zakladnou)
+#   python .vscode/bench.py --update             (zmerit a ulozit jako novou zakladnu)
+#   python .vscode/bench.py --filter cutebot     (jen pripady obsahujici "cutebot")
+#   python .vscode/bench.py --no-time            (porovnat jen alokace - na jinem pocitaci)
+#   python .vscode/bench.py --imports [--update] (cas a pamet importu knihoven z lib/)
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib_vsc_only")))
+import fakehw  # noqa: E402
+fakehw.setup_path()
+import adafruit_ticks as ticks  # noqa: E402
+import board  # noqa: E402
+import pulseio  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+TIME_THRESHOLD = 0.25    # o kolik muze byt volani pomalejsi nez zakladna (25 %)
+TIME_MIN_NS = 500        # mensi rozdily jsou sum mereni
+TRACE_RUNS = 3           # kolikrat se volani projde tracerem (bere se nejmensi pocet bloku)
+BLOCKS_SLACK = 3         # o kolik bloku CPythonu se muze volani zhorsit (sum mereni)
+BLOCKS_THRESHOLD = 0.25  # ... a o kolik procent
+IMPORT_RUNS = 5          # kolikrat se meri import kazdeho modulu (bere se median)
+IR_FRAME = pulseio.nec_frame(0x00, 0x10, address_inv=0xBF)   # klavesa "1" ovladace Elecfreaks
+
+
+class Case:
+    # Jeden merený pripad: jmeno, funkce, ktera pripravi a vrati volani, a pocet "jednotek" na volani
+    # (u melodii pocet not, aby slo porovnat cas na notu).
+    def __init__(self, name, setup, units=1):
+        self.name = name
+        self.setup = setup
+        self.units = units
+
+
+class _RepeatIr(pulseio.NecSource):
+    # IR zdroj, kteremu nikdy nedojdou rámce - kazde cteni dostane stejnou klavesu
+    def __init__(self, frame):
+        super().__init__([])
+        self._frame = frame
+
+    def take(self, now_ms):
+        if not self._script:
+            self._script.append(self._frame)
+        return super().take(now_ms)
+
+    @property
+    def exhausted(self):
+        return False
+
+
+class _Sink:
+    # Vystup, ktery zapsana data zahodi (telemetrie bez USB)
+    def write(self, data):
+        return len(data)
+
+
+class _InstantAsyncio:
+    # Nahrada modulu asyncio pro mereni: sleep() jen posune simulovany cas (jako fake time.sleep)
+    # a nepreda rizeni, takze play_async/pitch_async dobehnou bez event loopu a bez cekani
+    @staticmethod
+    async def sleep(seconds):
+        fakehw.fake_time().sleep(seconds)
+
+
+def run_async(coroutine):
+    # Provede korutinu az do konce (s _InstantAsyncio nikdy neceka na event loop).
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("korutina ceka na event loop")
+
+
+def make_cases():
+    # Vrati seznam vsech pripadu (ovladace a vsechny vestavene melodie).
+    cutebot = fakehw.import_lib("cutebot")
+    ringbit = fakehw.import_lib("ringbit")
+    music_module = fakehw.import_lib("elecfreaks_music")
+    music_module.asyncio = _InstantAsyncio
+    linefollow = fakehw.import_lib("linefollow")
+    motion = fakehw.import_lib("motion")
+    scroller = fakehw.import_lib("scroller")
+    telemetry = fakehw.import_lib("telemetry")
+    pulseio.attach_source(board.P12, pulseio.EchoSource(30))
+    pulseio.attach_source(board.P16, _RepeatIr(IR_FRAME))
+
+    def with_cutebot(method):
+        def setup():
+            bot = cutebot.Cutebot()
+            return lambda: method(bot)
+        return setup
+
+    def cutebot_leds():
+        bot = cutebot.Cutebot()
+        bot.init_rainbow_leds()
+        return lambda: bot.rainbow_leds.__setitem__(0, (255, 64, 0))
+
+    def with_ringbit(method):
+        def setup():
+            car = ringbit.Ringbit(board.P1, board.P2)
+            return lambda: method(car)
+        return setup
+
+    def ringbit_leds():
+        car = ringbit.Ringbit(board.P1, board.P2)
+        car.init_rainbow_leds(board.P0, 24)
+        return lambda: car.rainbow_leds.__setitem__(0, (255, 64, 0))
+
+    def line_follower():
+        follower = linefollow.LineFollower(cutebot.Cutebot())
+        return follower.step
+
+    def scroll_frame():
+        import picoed
+        text = scroller.Scroller(picoed.display)
+        columns = text.cache.get("Hello")
+        offsets = itertools.cycle(range(-text.display.width, len(columns)))
+        return lambda: text.draw(columns, next(offsets))
+
+    def telemetry_send(binary):
+        def setup():
+            tele = telemetry.Telemetry(3, _Sink(), binary)
+            values = [12.5, 0.0, 1.0]
+            return lambda: tele.send(123456, values)
+        return setup
+
+    def with_music(method):
+        def setup():
+            music = music_module.Music(board.BUZZER)
+            return lambda: method(music)
+        return setup
+
+    cases = [
+        Case("cutebot.Cutebot()", lambda: cutebot.Cutebot),
+        Case("cutebot.Cutebot(defer_init)", lambda: lambda: cutebot.Cutebot(defer_init=True)),
+        Case("cutebot.init_hardware", with_cutebot(lambda bot: bot.init_hardware())),
+        Case("cutebot.set_speed", with_cutebot(lambda bot: bot.set_speed(60, -40))),
+        Case("cutebot.set_light", with_cutebot(lambda bot: bot.set_light(cutebot.RGB.left, 255, 64, 0))),
+        Case("cutebot.set_servo", with_cutebot(lambda bot: bot.set_servo(cutebot.Servo.s1, 90))),
+        Case("cutebot.get_tracking", with_cutebot(lambda bot: bot.get_tracking())),
+        Case("cutebot.get_tracking_bits", with_cutebot(lambda bot: bot.get_tracking_bits())),
+        Case("cutebot.get_distance", with_cutebot(lambda bot: bot.get_distance(cutebot.Unit.cm))),
+        Case("cutebot.get_ir_value", with_cutebot(lambda bot: bot.get_ir_value())),
+        Case("cutebot.rainbow_leds[0]", cutebot_leds),
+        Case("ringbit.Ringbit()", lambda: lambda: ringbit.Ringbit(board.P1, board.P2)),
+        Case("ringbit.set_speed", with_ringbit(lambda car: car.set_speed(60, -40))),
+        Case("ringbit.get_tracking", with_ringbit(lambda car: car.get_tracking(board.P0))),
+        Case("ringbit.get_distance", with_ringbit(lambda car: car.get_distance(board.P12, ringbit.Unit.cm))),
+        Case("ringbit.rainbow_leds[0]", ringbit_leds),
+        Case("linefollow.step", line_follower),
+        Case("motion.Profile(drive)", lambda: lambda: motion.Profile(60, 60, 1500)),
+        Case("scroller.draw", scroll_frame),
+        Case("telemetry.send", telemetry_send(True)),
+        Case("telemetry.send(text)", telemetry_send(False)),
+        Case("music.Music()", lambda: lambda: music_module.Music(board.BUZZER)),
+        Case("music._get_frequency_duration", with_music(lambda music: music._get_frequency_duration("c#5:8"))),
+        Case("music.pitch", with_music(lambda music: music.pitch(440, 10))),
+        Case("music.pitch_async", with_music(lambda music: run_async(music.pitch_async(440, 10)))),
+        Case("music.set_tempo", with_music(lambda music: music.set_tempo(4, 100))),
+        Case("music.get_tempo", with_music(lambda music: music.get_tempo())),
+        Case("music.stop", with_music(lambda music: music.stop())),
+        Case("music.reset", with_music(lambda music: music.reset())),
+    ]
+    names = sorted(n for n in dir(music_module.Music) if n.isupper())
+    for name in names:
+        tune = getattr(music_module.Music, name)
+        units = len(music_module.Music.tune_notes(tune))
+        cases.append(Case(f"music.play({name})", with_music(lambda music, tune=tune: music.play(tune)), units))
+    for name in names:
+        tune = getattr(music_module.Music, name)
+        units = len(music_module.Music.tune_notes(tune))
+        cases.append(Case(f"music.play_async({name})",
+                          with_music(lambda music, tune=tune: run_async(music.play_async(tune))), units))
+    return cases
+
+
+def reset_stubs():
+    # Smaze historie zapisu ve stubech, at pamet behem mereni neroste.
+    import picoed
+    del picoed.i2c.write_history[:]
+    del picoed.i2c.read_history[:]
+    del picoed.internal_i2c.write_history[:]
+    del picoed.internal_i2c.read_history[:]
+    ticks.set_ticks_ms(0)
+
+
+def time_per_call(setup, min_time=0.05, rounds=7):
+    # Vrati nejlepsi cas jednoho volani v ns. Kazde kolo si pripravi volani znovu
+    # (setup), at v nem nerostou historie zapisu ve stubech.
+    call = setup()
+    call()
+    count = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(count):
+            call()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_time * 1e9 / 4:
+            break
+        count *= 4
+    count = max(1, int(count * min_time * 1e9 / max(elapsed, 1)))
+    best = None
+    for _ in range(rounds):
+        reset_stubs()
+        call = setup()
+        start = time.perf_counter_ns()
+        for _ in range(count):
+            call()
+        per_call = (time.perf_counter_ns() - start) / count
+        best = per_call if best is None else min(best, per_call)
+    return best
+
+
+def reference():
+    # Pevna referencni prace (cisty Python). Jeji cas se meri pred kazdym pripadem
+    # a casy se porovnavaji v pomeru k ni - tim se odfiltruje rozdilna rychlost
+    # pocitacu i kolisani vykonu (turbo, jine procesy).
+    total = 0
+    for i in range(200):
+        total += i * 3 % 7
+    return total
+
+
+def allocations_per_call(setup):
+    # Vrati (objekty na zarizeni, bloky v CPythonu, bajty v CPythonu) pro jedno volani (viz allocprof.profile).
+    # Odhad pro zarizeni je pokazde stejny; bloky a bajty jsou nejmensi z TRACE_RUNS mereni.
+    import allocprof
+    device = blocks = size = None
+    for _ in range(TRACE_RUNS):
+        reset_stubs()
+        summary, _ = allocprof.profile(setup())
+        device = summary["device"]
+        blocks = summary["blocks"] if blocks is None else min(blocks, summary["blocks"])
+        size = summary["bytes"] if size is None else min(size, summary["bytes"])
+    return device, blocks, size
+
+
+def measure(cases, measure_time=True, min_time=0.05, rounds=7):
+    # Zmeri vsechny pripady, vrati {jmeno: {"ns": ..., "allocs": ..., "bytes": ..., "units": ...}}.
+    # Nejdriv alokace vsech pripadu, pak casy - mereni casu by jinak menilo stav stubu
+    # pro dalsi pripady a pocty alokaci by nebyly mezi behy stejne.
+    results = {}
+    for case in cases:
+        result = {"units": case.units}
+        result["allocs"], result["blocks"], result["bytes"] = allocations_per_call(case.setup)
+        results[case.name] = result
+    if measure_time:
+        gc.disable()
+        try:
+            for case in cases:
+                reset_stubs()
+                results[case.name]["ref_ns"] = round(time_per_call(lambda: reference, min_time / 2, rounds))
+                results[case.name]["ns"] = round(time_per_call(case.setup, min_time, rounds))
+        finally:
+            gc.enable()
+    return results
+
+
+def compare(results, baseline, time_threshold=TIME_THRESHOLD):
+    # Vrati seznam textu s regresemi proti zakladne (prazdny = vse v poradku).
+    problems = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if "ns" in result and "ns" in base:
+            expected = scaled_baseline(result, base)
+            if result["ns"] > expected * (1 + time_threshold) and result["ns"] - expected > TIME_MIN_NS:
+                problems.append(f"{name}: cas {expected:.0f} -> {result['ns']} ns/volani")
+        if result["allocs"] > base["allocs"]:
+            problems.append(f"{name}: alokace {base['allocs']} -> {result['allocs']} objektu/volani")
+        if "blocks" in base and result["blocks"] > base["blocks"] + max(BLOCKS_SLACK, base["blocks"] * BLOCKS_THRESHOLD):
+            problems.append(f"{name}: bloky v CPythonu {base['blocks']} -> {result['blocks']} na volani")
+    return problems
+
+
+def scaled_baseline(result, base):
+    # Cas ze zakladny prepocteny na aktualni rychlost pocitace (podle referencni prace).
+    if result.get("ref_ns") and base.get("ref_ns"):
+        return base["ns"] * result["ref_ns"] / base["ref_ns"]
+    return base["ns"]
+
+
+# Mereni jednoho importu v cistem procesu (vysledek jako JSON na stdout)
+_IMPORT_PROBE = """
+import gc, json, os, sys, time, tracemalloc
+sys.path.insert(0, {lib_vsc_only!r})
+import fakehw
+fakehw.setup_path()
+import asyncio, board, digitalio, micropython, picoed
+before = set(sys.modules)
+gc.collect()
+tracemalloc.start()
+start = time.perf_counter()
+fakehw.import_lib({name!r})
+elapsed = time.perf_counter() - start
+gc.collect()
+heap = tracemalloc.get_traced_memory()[0]
+files = {{name: getattr(sys.modules[name], "__file__", None) or "" for name in set(sys.modules) - before}}
+print(json.dumps({{"ms": elapsed * 1000, "heap": heap, "modules": sorted(
+    name for name, path in files.items() if path and os.path.abspath(path).startswith(fakehw.ROOT_DIR))}}))
+"""
+
+
+def import_modules():
+    # Jmena modulu z lib/ (kazdy se meri zvlast).
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(fakehw.LIB_DIR) if name.endswith(".py"))
+
+
+def measure_import(name, runs=IMPORT_RUNS):
+    # Vrati {"ms", "heap", "device", "modules"} pro import modulu name z lib/ (median z runs procesu).
+    import heapbudget
+    probes = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE.format(lib_vsc_only=fakehw.LIB_VSC_ONLY_DIR, name=name)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        probes.append(json.loads(output.splitlines()[-1]))
+    modules = probes[0]["modules"]
+    paths = [os.path.join(fakehw.LIB_DIR, module + ".py") for module in modules]
+    device = sum(item[3] for item in heapbudget.analyze([path for path in paths if os.path.exists(path)]))
+    return {
+        "ms": round(statistics.median(probe["ms"] for probe in probes), 2),
+        "heap": round(statistics.median(probe["heap"] for probe in probes)),
+        "device": device,
+        "modules": modules,
+    }
+
+
+def compare_imports(results, baseline):
+    # Vrati seznam textu s regresemi importu (modul nove nacita dalsi moduly).
+    problems = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        added = sorted(set(result["modules"]) - set(base["modules"]))
+        if added:
+            problems.append(f"import {name}: nove nacita {', '.join(added)}")
+    return problems
+
+
+def print_imports(results, baseline):
+    print(f"{'modul':<20} {'import ms':>9} {'zakladna':>9} {'heap PC KB':>10} {'zarizeni KB':>11}  nactene moduly")
+    for name, result in results.items():
+        base = baseline.get(name, {})
+        base_ms = f"{base['ms']:>9.1f}" if "ms" in base else f"{'-':>9}"
+        print(f"{name:<20} {result['ms']:>9.1f} {base_ms} {result['heap'] / 1024:>10.1f} "
+              f"{result['device'] / 1024:>11.1f}  {' '.join(result['modules'])}")
+
+
+def print_table(results, baseline):
+    print(f"{'pripad':<32} {'ns/volani':>11} {'zakladna':>10} {'zmena':>7} {'ns/nota':>8} {'objekty':>8} {'bloky':>6} {'B':>6}")
+    for name, result in results.items():
+        base = baseline.get(name, {})
+        ns = result.get("ns")
+        line = f"{name:<32} "
+        if ns is not None:
+            line += f"{ns:>11} "
+            if "ns" in base:
+                expected = scaled_baseline(result, base)
+                line += f"{expected:>10.0f} {(ns / expected - 1) * 100:>+6.0f}% "
+            else:
+                line += f"{'-':>10} {'':>7} "
+            line += f"{ns / result['units']:>8.0f} " if result["units"] > 1 else f"{'':>8} "
+        else:
+            line += f"{'-':>11} {'':>10} {'':>7} {'':>8} "
+        line += f"{result['allocs']:>8} {result['blocks']:>6} {result['bytes']:>6}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mereni rychlosti a alokaci knihoven z lib/ nad fake hardware.")
+    parser.add_argument("--update", action="store_true", help="ulozit vysledky jako novou zakladnu")
+    parser.add_argument("--filter", help="jen pripady, jejichz jmeno obsahuje tento text")
+    parser.add_argument("--baseline", default=BASELINE, help="soubor se zakladnou (JSON)")
+    parser.add_argument("--no-time", action="store_true", help="nemerit cas, jen alokace")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimalni delka jednoho kola v s")
+    parser.add_argument("--rounds", type=int, default=7, help="pocet kol mereni casu")
+    parser.add_argument("--imports", action="store_true", help="merit cas a pamet importu modulu z lib/")
+    parser.add_argument("--threshold", type=float, default=TIME_THRESHOLD, help="povolene zpomaleni (0.25 = 25 %%)")
+    args = parser.parse_args()
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            stored = json.load(file)
+
+    if args.imports:
+        names = [name for name in import_modules() if not args.filter or args.filter in name]
+        baseline = stored.get("imports", {})
+        results = {name: measure_import(name) for name in names}
+        print_imports(results, baseline)
+        key = "imports"
+        problems = compare_imports(results, baseline)
+    else:
+        cases = make_cases()
+        if args.filter:
+            cases = [case for case in cases if args.filter in case.name]
+        baseline = stored.get("cases", {})
+        results = measure(cases, not args.no_time, args.min_time, args.rounds)
+        print_table(results, baseline)
+        key = "cases"
+        problems = compare(results, baseline, args.threshold)
+
+    if args.update:
+        merged = dict(baseline)
+        merged.update(results)
+        stored.update({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            key: dict(sorted(merged.items())),
+        })
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(stored, file, indent=2)
+            file.write("\n")
+        print(f"Zakladna ulozena do '{args.baseline}'.")
+        return
+
+    missing = [name for name in results if name not in baseline]
+    if missing:
+        print(f"Bez zakladny ({len(missing)}): {', '.join(missing)}")
+    if problems:
+        print("Zhorseni proti zakladne:")
+        for problem in problems:
+            print("  " + problem)
+        sys.exit(1)
+    print("Bez zhorseni proti zakladne.")
+
+
+if __name__ == "__main__":
+    main()
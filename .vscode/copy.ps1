@@ -3,10 +3,11 @@
 param (
     [string]$sourceRoot,            # pracovni adresar projektu v pocitaci                        (prvni parametr)
     [string]$relativePath,          # reletivni cesta souboru, ktery chceme zkopirovat            (druhy parametr)
-    [string]$ignoreFilePath         # relativni cesta k souboru se seznamem ignorovanych souboru  (treti parametr)
+    [string]$ignoreFilePath,        # relativni cesta k souboru se seznamem ignorovanych souboru  (treti parametr)
+    [string]$mode = "py"            # py = kopie beze zmeny, mpy = lib/*.py prelozit na .mpy, min = lib/*.py zmensit (ctvrty parametr, nepovinny)
 )
 # Verze souboru:
-$version = "2026-01-13"
+$version = "2026-10-19"
 
 # Přepneme kodovani na UTF-8, aby se spravne zobrazoaly ceske znaky
 [Console]::OutputEncoding = [System.Text.Encoding]::UTF8
@@ -123,7 +124,16 @@ if (Test-Path $sourcePath -PathType Container) {
     } else {
         Write-Host "Zacinam kopirovat."
         try {
-            Copy-Item -Path $sourcePath -Destination $destPath -Force
+            $normalizedPath = $relativePath -replace '\\','/'
+            if ($mode -ne "py" -and $normalizedPath -like "lib/*.py") {
+                # Knihovny z lib/ nahraje deploy.py jako .mpy (nebo zmensene .py)
+                python (Join-Path -Path $sourceRoot -ChildPath ".vscode/deploy.py") --mode $mode --dest $destinationRoot $sourcePath
+                if ($LASTEXITCODE -ne 0) {
+                    throw "deploy.py skoncil s chybou $LASTEXITCODE"
+                }
+            } else {
+                Copy-Item -Path $sourcePath -Destination $destPath -Force
+            }
             Write-Host "Info: Vypada to, ze vsechno probehlo spravne."
         } catch {
             Write-Host "Error: Kopirovani neprobehlo uspesne."
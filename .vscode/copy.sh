@@ -1,17 +1,19 @@
 #!/bin/bash
 # Kopírování souborů do CIRCUITPY (macOS/Linux)
-version="2026-01-13"
+version="2026-10-19"
 
 shopt -s globstar nullglob
 
-if [ "$#" -ne 3 ]; then
-    echo "Použití: $0 sourceRoot relativePath ignoreFilePath"
+if [ "$#" -ne 3 ] && [ "$#" -ne 4 ]; then
+    echo "Použití: $0 sourceRoot relativePath ignoreFilePath [mode]"
+    echo "         mode: py (výchozí, kopie beze změny), mpy (lib/*.py přeložit na .mpy), min (lib/*.py zmenšit)"
     exit 1
 fi
 
 sourceRoot="$1"
 relativePath="$2"
 ignoreFilePath="$3"
+mode="${4:-py}"
 
 echo "-------(verze=$version)-----------------------------------------------"
 echo "Spouštím kopírování souboru do Pico:ed-u. Chci zkopírovat soubor '$relativePath' v adresáři '$sourceRoot'."
@@ -89,7 +91,12 @@ else
     fi
 
     echo "Začínám kopírovat."
-    cp -f "$sourcePath" "$destPath"
+    if [ "$mode" != "py" ] && [[ "$relativePath" == lib/*.py ]]; then
+        # Knihovny z lib/ nahraje deploy.py jako .mpy (nebo zmenšené .py)
+        python3 "$sourceRoot/.vscode/deploy.py" --mode "$mode" --dest "$destinationRoot" "$sourcePath"
+    else
+        cp -f "$sourcePath" "$destPath"
+    fi
 
     if [ $? -ne 0 ]; then
         echo "Při kopírování došlo k chybě. Návratový kód přepínám na 4."
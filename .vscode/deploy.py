@@ -0,0 +1,382 @@
+# Davka v Pythonu. Nahrava knihovny z lib/ do pico:ed-u (disk CIRCUITPY) predkompilovane do .mpy,
+# aby je CircuitPython nemusel pri kazdem startu prekladat (setri RAM i cas startu).
+# Verze souboru ze dne 2026-10-19
+#
+# Rezimy (--mode):
+#   py   - zkopiruje zdrojak beze zmeny (jako copy.sh / copy.ps1)
+#   mpy  - prelozi soubor pomoci mpy-cross na .mpy; kdyz mpy-cross neni nainstalovany,
+#          pouzije se rezim min
+#   min  - zmensi zdrojak: odstrani docstringy, komentare a prazdne radky (radky SPDX licence zustanou)
+#
+# - vystupy se ukladaji do cache (.vscode/.deploy_cache) podle hashe obsahu, rezimu a verze mpy-cross,
+#   takze se prekladaji jen zmenene soubory
+# - pri zapisu .mpy se na disku smaze stary .py se stejnym jmenem (a naopak), jinak by se nacital ten stary
+# - --sync projde cely projekt (masky z .ignoreCopy se nactou jednou), porovna hash kazdeho vystupu
+#   s manifestem na disku (.deploy_manifest.json) a v jednom behu zkopiruje jen zmenene soubory;
+#   soubory, ktere z projektu zmizely, smaze (jen ty, ktere nahral on sam)
+# - zapisuje se az po prelozeni vseho, jednou davkou: kazdy soubor pres docasny soubor a prejmenovani,
+#   code.py / main.py / boot.py az nakonec a na konci jedno vyprazdneni cache disku, takze
+#   CircuitPython po nahrani restartuje jen jednou a nikdy nenajde napul zapsany soubor
+# - pro kazdy soubor se vypise velikost na disku a odhad, kolik se usetri pri importu
+#   (.mpy se na zarizeni neparsuje ani nepreklada, zmenseny zdrojak se parsuje kratsi)
+#
+# Pouziti:
+#   python .vscode/deploy.py                         (vsechny soubory z lib/, rezim mpy, disk CIRCUITPY se najde sam)
+#   python .vscode/deploy.py lib/cutebot.py --mode min
+#   python .vscode/deploy.py --dest /tmp/circuitpy   (misto disku CIRCUITPY pouzije adresar)
+#   python .vscode/deploy.py --dry-run               (jen prelozi a vypise velikosti, nic nekopiruje)
+#   python .vscode/deploy.py --sync                  (cely projekt, jen zmenene soubory)
+#   python .vscode/deploy.py --sync --dest /tmp/circuitpy --mode py
+import argparse
+import ast
+import fnmatch
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tokenize
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT_DIR, ".vscode", ".deploy_cache")
+IGNORE_FILE = os.path.join(ROOT_DIR, ".vscode", ".ignoreCopy")
+MANIFEST = ".deploy_manifest.json"     # na disku CIRCUITPY: hash kazdeho nahraneho souboru
+MODES = ("py", "mpy", "min")
+RUN_FILES = ("boot.py", "main.py", "code.py")   # soubory, ktere CircuitPython spousti -> zapisuji se posledni
+# Odhad pro pico:ed (RP2040, CircuitPython): preklad zdrojaku pri importu trva zhruba 8 us na bajt
+# a na chvili potrebuje asi dvojnasobek velikosti zdrojaku RAM (tokeny, parse tree, bajtkod).
+COMPILE_US_PER_BYTE = 8
+COMPILE_RAM_PER_BYTE = 2
+
+
+def find_circuitpy():
+    # Vrati cestu k disku CIRCUITPY, nebo None.
+    if sys.platform == "win32":
+        import ctypes
+        for letter in string.ascii_uppercase:
+            root = f"{letter}:\\"
+            label = ctypes.create_unicode_buffer(261)
+            if ctypes.windll.kernel32.GetVolumeInformationW(root, label, 261, None, None, None, None, 0) \
+                    and label.value == "CIRCUITPY":
+                return root
+        return None
+    user = os.environ.get("USER", "")
+    for path in ("/Volumes/CIRCUITPY", f"/media/{user}/CIRCUITPY", f"/run/media/{user}/CIRCUITPY"):
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+def find_mpy_cross(path=None):
+    # Vrati (cesta k mpy-cross, jeho verze), nebo (None, None), pokud neni k dispozici.
+    path = path or os.environ.get("MPY_CROSS") or shutil.which("mpy-cross")
+    if not path:
+        return None, None
+    try:
+        version = subprocess.run([path, "--version"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return path, version
+
+
+def _docstring_starts(tree):
+    # Vrati pozice (radek, sloupec) retezcu, ktere jsou docstringy modulu, tridy nebo funkce,
+    # a pozice tech, ktere jsou v tele jedinym prikazem (musi se nahradit za pass).
+    starts = set()
+    only = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and node.body:
+            first = node.body[0]
+            if isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) \
+                    and isinstance(first.value.value, str):
+                position = (first.value.lineno, first.value.col_offset)
+                starts.add(position)
+                if len(node.body) == 1:
+                    only.add(position)
+    return starts, only
+
+
+def minify(source):
+    # Odstrani docstringy, komentare a prazdne radky. Odsazeni a vse ostatni zustava,
+    # takze vysledek je platny Python se stejnym chovanim.
+    docstrings, only = _docstring_starts(ast.parse(source))
+    lines = source.splitlines(keepends=True)
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+
+    cuts = []           # (zacatek, konec, nahrada) v souradnicich celeho textu
+    protected = set()   # radky uvnitr viceradkovych retezcu - ty se nesmi menit
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        start = offsets[token.start[0] - 1] + token.start[1]
+        end = offsets[token.end[0] - 1] + token.end[1]
+        if token.type == tokenize.COMMENT and not token.string.startswith("# SPDX"):
+            cuts.append((start, end, ""))
+        elif token.type == tokenize.STRING and token.start in docstrings:
+            # Pocet radku zustane stejny, prazdne radky se odstrani az nakonec
+            cuts.append((start, end, ("pass" if token.start in only else "") + "\n" * (token.end[0] - token.start[0])))
+        elif token.type == tokenize.STRING and token.end[0] > token.start[0]:
+            protected.update(range(token.start[0] + 1, token.end[0] + 1))
+
+    parts = []
+    position = 0
+    for start, end, replacement in cuts:
+        parts.append(source[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(source[position:])
+
+    result = []
+    for number, line in enumerate("".join(parts).splitlines(), 1):
+        if number in protected:
+            result.append(line)
+        elif line.strip():
+            result.append(line.rstrip())
+    return "\n".join(result) + "\n"
+
+
+def build(path, mode, mpy_cross=None, mpy_version=None):
+    # Prelozi jeden soubor. Vrati (bajty vystupu, pripona vystupu, pouzity rezim, z cache).
+    with open(path, "rb") as file:
+        source = file.read()
+    if mode == "mpy" and mpy_cross is None:
+        mode = "min"
+    if mode == "py":
+        return source, os.path.splitext(path)[1], mode, False
+
+    key = hashlib.sha256(source + f"\0{mode}\0{mpy_version or ''}".encode()).hexdigest()
+    extension = ".mpy" if mode == "mpy" else ".py"
+    cached = os.path.join(CACHE_DIR, key + extension)
+    if os.path.exists(cached):
+        with open(cached, "rb") as file:
+            return file.read(), extension, mode, True
+
+    if mode == "mpy":
+        relative = os.path.relpath(path, ROOT_DIR).replace(os.sep, "/")
+        with tempfile.TemporaryDirectory() as temp:
+            output = os.path.join(temp, "out.mpy")
+            subprocess.run([mpy_cross, "-o", output, "-s", relative, path], check=True)
+            with open(output, "rb") as file:
+                data = file.read()
+    else:
+        data = minify(source.decode("utf-8")).encode("utf-8")
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(cached, "wb") as file:
+        file.write(data)
+    return data, extension, mode, False
+
+
+def target_name(relative, extension):
+    # Relativni cesta vystupu na disku (lib/cutebot.py -> lib/cutebot.mpy).
+    return os.path.splitext(relative)[0] + extension
+
+
+def stale_name(relative, extension):
+    # Relativni cesta zastarale varianty (.py vs .mpy), nebo None u ostatnich souboru.
+    if extension not in (".py", ".mpy"):
+        return None
+    return target_name(relative, ".py" if extension == ".mpy" else ".mpy")
+
+
+def write_atomic(path, data):
+    # Zapise soubor pres docasny soubor a prejmenovani: na disku nikdy neni napul zapsany soubor.
+    # Bez fsync: kazdy fsync by soubor poslal na CIRCUITPY zvlast (a pico:ed by se mohl
+    # restartovat po kazdem souboru); na disk se vse posle jednim os.sync() v commit_batch.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = os.path.join(os.path.dirname(path), "." + os.path.basename(path) + ".tmp")
+    with open(temporary, "wb") as file:
+        file.write(data)
+    os.replace(temporary, path)
+
+
+def install(dest_root, relative, data, extension):
+    # Zapise vystup na disk a smaze zastaralou variantu (.py vs .mpy) se stejnym jmenem.
+    # Vrati relativni cestu smazaneho souboru, nebo None.
+    write_atomic(os.path.join(dest_root, target_name(relative, extension)), data)
+    stale = stale_name(relative, extension)
+    if stale and os.path.exists(os.path.join(dest_root, stale)):
+        os.remove(os.path.join(dest_root, stale))
+        return stale
+    return None
+
+
+def load_ignore(path=IGNORE_FILE):
+    # Nacte masky z .ignoreCopy a slozi je do jednoho regularniho vyrazu (jen jednou pro cely beh).
+    # Masky maji stejny vyznam jako v copy.sh: * odpovida cemukoli vcetne '/'.
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as file:
+        patterns = [line.strip() for line in file if line.strip() and not line.startswith("#")]
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+def project_files(root=ROOT_DIR, ignore=None):
+    # Vrati relativni cesty vsech souboru projektu, ktere patri na pico:ed
+    # (bez skrytych adresaru a souboru, __pycache__ a souboru podle .ignoreCopy).
+    result = []
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+        for name in sorted(files):
+            if name.startswith("."):
+                continue
+            relative = os.path.relpath(os.path.join(directory, name), root).replace(os.sep, "/")
+            if ignore is None or not ignore.match(relative):
+                result.append(relative)
+    return result
+
+
+def file_mode(relative, mode):
+    # Prekladaji se jen knihovny (lib/**/*.py); code.py a ostatni soubory se kopiruji beze zmeny.
+    if relative.startswith("lib/") and relative.endswith(".py"):
+        return mode
+    return "py"
+
+
+def read_manifest(dest_root):
+    # Nacte manifest z disku ({relativni cesta: sha256}), nebo prazdny slovnik.
+    try:
+        with open(os.path.join(dest_root, MANIFEST), encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(dest_root, manifest):
+    text = json.dumps(dict(sorted(manifest.items())), indent=1) + "\n"
+    write_atomic(os.path.join(dest_root, MANIFEST), text.encode("utf-8"))
+
+
+def write_order(target):
+    # Poradi zapisu v davce: knihovny a data driv, boot.py / main.py / code.py az na konec,
+    # aby restart po posledni zmene uz nasel vsechny knihovny nove.
+    return (target in RUN_FILES, RUN_FILES.index(target) if target in RUN_FILES else 0, target)
+
+
+def commit_batch(dest_root, staged, deleted, manifest):
+    # Zapise vsechny pripravene soubory najednou (bez prekladu mezi zapisy) a na konci jednou
+    # vyprazdni cache disku. CircuitPython restartuje az po chvili klidu na USB disku,
+    # takze celou davku zpracuje jednim restartem. Vrati (zapsanych bajtu, smazanych starych variant).
+    written_bytes = 0
+    removed = []
+    for name in deleted:
+        device_path = os.path.join(dest_root, name)
+        if os.path.exists(device_path):
+            os.remove(device_path)
+        manifest.pop(name, None)
+    for target, relative, data, extension, digest in sorted(staged, key=lambda item: write_order(item[0])):
+        stale = install(dest_root, relative, data, extension)
+        written_bytes += len(data)
+        if manifest is not None:
+            manifest[target] = digest
+            if stale:
+                manifest.pop(stale, None)
+        if stale:
+            removed.append(stale)
+    if manifest is not None:
+        write_manifest(dest_root, manifest)
+    if hasattr(os, "sync"):
+        os.sync()
+    return written_bytes, removed
+
+
+def file_hash(path):
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nahraje knihovny z lib/ do pico:ed-u jako .mpy (nebo zmensene .py).")
+    parser.add_argument("files", nargs="*", help="soubory k nahrani (vychozi: vsechny soubory z lib/)")
+    parser.add_argument("--mode", choices=MODES, default="mpy", help="py = beze zmeny, mpy = mpy-cross, min = zmenseny zdrojak")
+    parser.add_argument("--sync", action="store_true", help="synchronizovat cely projekt (jen zmenene soubory podle manifestu)")
+    parser.add_argument("--verify", action="store_true", help="pri --sync neverit manifestu a porovnat hash souboru na disku")
+    parser.add_argument("--dest", help="cilovy adresar (vychozi: disk CIRCUITPY)")
+    parser.add_argument("--mpy-cross", help="cesta k mpy-cross (vychozi: promenna MPY_CROSS nebo PATH)")
+    parser.add_argument("--dry-run", action="store_true", help="jen prelozit a vypsat, co by se kopirovalo, nic nezapisovat")
+    args = parser.parse_args()
+
+    if args.sync:
+        relatives = project_files(ROOT_DIR, load_ignore())
+    else:
+        files = args.files or sorted(path for path in glob.glob(os.path.join(ROOT_DIR, "lib", "*")) if os.path.isfile(path))
+        relatives = [os.path.relpath(os.path.abspath(path), ROOT_DIR).replace(os.sep, "/") for path in files]
+
+    mpy_cross, mpy_version = (None, None)
+    if args.mode == "mpy":
+        mpy_cross, mpy_version = find_mpy_cross(args.mpy_cross)
+        if mpy_cross is None:
+            print("mpy-cross jsem nenasel (PATH, MPY_CROSS ani --mpy-cross) -> pouziju rezim 'min'.")
+        else:
+            print(f"Pouzivam {mpy_version} ({mpy_cross}).")
+
+    dest_root = args.dest or find_circuitpy()
+    if dest_root is None and not args.dry_run:
+        print("Nenasel jsem disk se jmenem 'CIRCUITPY'. Nemam kam soubory nakopirovat -> koncim akci.")
+        sys.exit(1)
+    if dest_root is not None:
+        print(f"Cil: '{dest_root}'")
+    manifest = read_manifest(dest_root) if args.sync and dest_root else {}
+
+    print(f"{'soubor':<28} {'rezim':>5} {'zdroj':>8} {'na disku':>9} {'uspora':>7} {'parsovani':>10} {'RAM':>8}")
+    total_source = total_output = 0
+    unchanged = []
+    staged = []
+    outputs = set()
+    for relative in relatives:
+        path = os.path.join(ROOT_DIR, relative)
+        source_size = os.path.getsize(path)
+        data, extension, mode, cached = build(path, file_mode(relative, args.mode), mpy_cross, mpy_version)
+        target = target_name(relative, extension)
+        outputs.add(target)
+        digest = hashlib.sha256(data).hexdigest()
+        if args.sync and manifest.get(target) == digest:
+            device_path = os.path.join(dest_root, target)
+            if os.path.exists(device_path) and (not args.verify or file_hash(device_path) == digest):
+                unchanged.append(target)
+                continue
+        staged.append((target, relative, data, extension, digest))
+
+        # .mpy se pri importu neparsuje vubec, zmenseny zdrojak se parsuje kratsi
+        saved = source_size - (0 if extension == ".mpy" else len(data))
+        print(
+            f"{target:<28} {mode:>5} {source_size:>7}B {len(data):>8}B {(1 - len(data) / max(source_size, 1)) * 100:>6.0f}% "
+            f"{-saved * COMPILE_US_PER_BYTE / 1000:>+8.0f}ms {-saved * COMPILE_RAM_PER_BYTE / 1024:>+6.1f}KB"
+            f"{' (cache)' if cached else ''}"
+        )
+        total_source += source_size
+        total_output += len(data)
+
+    # Soubory, ktere jsme nahrali drive, ale v projektu uz nejsou
+    deleted = sorted(name for name in manifest if name not in outputs) if args.sync else []
+    for name in deleted:
+        print(f"{name:<28} smazan (v projektu uz neni)")
+
+    if not args.dry_run and (staged or deleted):
+        # Vse je prelozene v pameti, na disk se zapisuje az ted - jednou davkou
+        start = time.perf_counter()
+        written_bytes, removed = commit_batch(dest_root, staged, deleted, manifest if args.sync else None)
+        elapsed = time.perf_counter() - start
+        for name in removed:
+            print(f"{name:<28} smazan (stara varianta)")
+        print(f"Zapsano {len(staged)} souboru, {written_bytes} B za {elapsed * 1000:.0f} ms (jedna davka, jeden restart).")
+
+    if args.sync:
+        print(f"Zkopirovano {len(staged)}, beze zmeny {len(unchanged)}, smazano {len(deleted)}.")
+
+    if total_source:
+        print(f"Celkem {total_source} B zdrojaku -> {total_output} B na disku ({(1 - total_output / total_source) * 100:.0f}% mene).")
+        print("(parsovani a RAM jsou odhad zmeny casu a spicky pameti pri importu na pico:ed-u)")
+
+
+if __name__ == "__main__":
+    main()
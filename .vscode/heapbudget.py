@@ -0,0 +1,297 @@
+# Davka v Pythonu. Odhad pameti (heap), kterou na pico:ed zabere import knihoven z lib/ a code.py.
+# Slouzi k hledani pricin MemoryError: ukaze, ktere tridy, seznamy a instance zabiraji nejvic RAM,
+# a porovna soucet s rozpoctem zarizeni.
+# Verze souboru ze dne 2026-10-19
+#
+# Jak to funguje:
+# - kazdy soubor se jen rozparsuje (ast), nic se nespousti, takze staci PC bez stubu
+# - velikosti objektu odpovidaji 32bitovemu CircuitPythonu (RP2040): heap se prideluje po blocich
+#   16 B, kazdy objekt ma hlavicku, seznam ma zvlast pole polozek, slovnik tabulku o neco vetsi
+#   nez pocet klicu, float je samostatny objekt, male cele cislo nic nestoji
+# - kratke retezce (do 10 znaku) a jmena jsou qstr - ulozi se jen jednou pro cely program,
+#   takze opakovane noty "g", "e:2" v melodiich stoji jen jednou
+# - bajtkod funkci a metod zustava po importu v RAM (u .py i .mpy), odhaduje se z poctu uzlu AST
+# - _JMENO = const(...) CircuitPython pri prekladu vypusti, nic nestoji
+# - instance vytvorene na urovni modulu (napr. robot = Cutebot()) se odhadnou podle atributu,
+#   ktere jejich __init__ uklada do self
+# - pri importu .py navic kratce spici pamet parseru a prekladace (odhad jako v deploy.py);
+#   s --mpy se nepocita
+#
+# Pouziti:
+#   python .vscode/heapbudget.py                     (lib/*.py a code.py, zebricek 15 nejvetsich polozek)
+#   python .vscode/heapbudget.py --budget 120 --top 30
+#   python .vscode/heapbudget.py lib/elecfreaks_music.py --mpy
+#   python .vscode/heapbudget.py --json heap.json
+import argparse
+import ast
+import builtins
+import glob
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from deploy import COMPILE_RAM_PER_BYTE, ROOT_DIR  # noqa: E402
+
+# gc.mem_free() na pico:ed hned po startu CircuitPythonu (v KB); na svem zarizeni zmerte a predejte --budget
+DEFAULT_BUDGET_KB = 180
+BLOCK = 16                  # velikost bloku heapu v bajtech
+WORD = 4                    # velikost ukazatele
+QSTR_MAX_LEN = 10           # kratsi retezcove literaly prekladac uklada jako qstr
+SIZES = {
+    "object": 16,           # hlavicka bezneho objektu (float, velke int, instance)
+    "list": 16,             # objekt seznamu bez pole polozek
+    "dict": 16,             # objekt slovniku bez tabulky
+    "map_entry": 8,         # jedna polozka tabulky slovniku (klic + hodnota)
+    "str": 16,              # objekt retezce / bajtu bez dat
+    "qstr": 3,              # hash a delka qstr navic k textu
+    "function": 32,         # objekt funkce + raw code
+    "bytecode_node": 2,     # bajtu bajtkodu na jeden uzel AST (prumer)
+    "class": 64,            # objekt tridy bez slovniku clenu
+    "module": 32,           # objekt modulu bez slovniku globalnich jmen
+}
+# Jmena, ktera uz jsou ve firmware (qstr v ROM), nic nestoji
+ROM_NAMES = set(dir(builtins)) | {
+    "self", "__init__", "__name__", "__class__", "__version__", "value", "deinit", "time", "board",
+    "digitalio", "busio", "pwmio", "pulseio", "analogio", "neopixel", "micropython", "const", "asyncio",
+}
+
+
+def blocks(size):
+    # Pocet bajtu, ktere zabere alokace size bajtu (zaokrouhleni na cele bloky).
+    return (size + BLOCK - 1) // BLOCK * BLOCK if size > 0 else 0
+
+
+def dict_size(count):
+    # Slovnik s count klici: objekt + tabulka o ~1/3 vetsi (otevrena adresace).
+    return SIZES["dict"] + blocks(SIZES["map_entry"] * (count + (count + 2) // 3))
+
+
+class _Estimator:
+    # Spocita velikosti objektu, ktere vzniknou pri importu modulu.
+    def __init__(self):
+        self.qstrs = set()      # sdilene pro vsechny moduly - qstr se ulozi jen jednou
+        self.classes = {}       # jmeno tridy -> pocet atributu instance (z __init__)
+
+    def qstr(self, text):
+        if text in self.qstrs or text in ROM_NAMES:
+            return 0
+        self.qstrs.add(text)
+        return len(text) + 1 + SIZES["qstr"]
+
+    def value(self, node):
+        # Velikost hodnoty, kterou vyraz vytvori pri importu (vcetne vnorenych objektu).
+        if isinstance(node, ast.Constant):
+            value = node.value
+            if isinstance(value, bool) or value is None:
+                return 0
+            if isinstance(value, int):
+                return 0 if -2 ** 30 <= value < 2 ** 30 else SIZES["object"]
+            if isinstance(value, float):
+                return SIZES["object"]
+            if isinstance(value, str):
+                if len(value) <= QSTR_MAX_LEN:
+                    return self.qstr(value)
+                return SIZES["str"] + blocks(len(value.encode("utf-8")) + 1)
+            if isinstance(value, bytes):
+                return SIZES["str"] + blocks(len(value) + 1)
+            return 0
+        if isinstance(node, ast.List):
+            return SIZES["list"] + blocks(WORD * len(node.elts)) + sum(self.value(item) for item in node.elts)
+        if isinstance(node, (ast.Tuple, ast.Set)):
+            return blocks(8 + WORD * len(node.elts)) + sum(self.value(item) for item in node.elts)
+        if isinstance(node, ast.Dict):
+            return dict_size(len(node.keys)) + sum(
+                self.value(item) for item in node.keys + node.values if item is not None)
+        if isinstance(node, ast.UnaryOp):
+            return self.value(node.operand)
+        if isinstance(node, ast.BinOp):
+            if isinstance(node.op, ast.Div) or any(
+                    isinstance(side, ast.Constant) and isinstance(side.value, float)
+                    for side in (node.left, node.right)):
+                return SIZES["object"]
+            return 0
+        if isinstance(node, ast.Call):
+            name = node.func.id if isinstance(node.func, ast.Name) else None
+            if name == "const":
+                return 0
+            if name in self.classes:
+                return self.instance(self.classes[name])
+            if name in ("bytearray", "bytes") and node.args and isinstance(node.args[0], ast.List):
+                return SIZES["str"] + blocks(len(node.args[0].elts))
+            # Neznama trida nebo funkce: aspon jeden objekt
+            return SIZES["object"] * 2
+        return 0
+
+    @staticmethod
+    def instance(attributes):
+        return SIZES["object"] + dict_size(attributes)
+
+    def function(self, node):
+        # Funkce nebo metoda: objekt + bajtkod + jmena lokalnich promennych a konstant.
+        nodes = sum(1 for _ in ast.walk(node))
+        size = SIZES["function"] + blocks(nodes * SIZES["bytecode_node"]) + self.qstr(node.name)
+        docstring = _docstring(node)    # docstringy CircuitPython pri prekladu zahodi
+        for child in ast.walk(node):
+            if isinstance(child, ast.Constant) and isinstance(child.value, (str, float, bytes)) \
+                    and child is not docstring:
+                size += self.value(child)
+            elif isinstance(child, ast.Attribute):
+                size += self.qstr(child.attr)
+        return size
+
+
+def _docstring(node):
+    body = getattr(node, "body", None)
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+            and isinstance(body[0].value.value, str):
+        return body[0].value
+    return None
+
+
+def _init_attributes(node):
+    # Pocet ruznych atributu, ktere __init__ tridy uklada do self.
+    names = set()
+    for item in node.body:
+        if isinstance(item, ast.FunctionDef) and item.name == "__init__":
+            for child in ast.walk(item):
+                if isinstance(child, ast.Attribute) and isinstance(child.ctx, ast.Store) \
+                        and isinstance(child.value, ast.Name) and child.value.id == "self":
+                    names.add(child.attr)
+    return len(names)
+
+
+def _target_names(node):
+    targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+    return [target.id for target in targets if isinstance(target, ast.Name)]
+
+
+def _kind(node):
+    if isinstance(node, ast.List):
+        return f"seznam ({len(node.elts)} polozek)"
+    if isinstance(node, ast.Tuple):
+        return f"n-tice ({len(node.elts)} polozek)"
+    if isinstance(node, ast.Dict):
+        return f"slovnik ({len(node.keys)} klicu)"
+    if isinstance(node, ast.Call):
+        return "instance"
+    return "hodnota"
+
+
+def analyze(paths, estimator=None):
+    # Vrati seznam polozek (modul, jmeno, druh, bajty) pro vsechny soubory.
+    # Tridy se nejdriv posbiraji ze vsech souboru, aby slo odhadnout instance v code.py.
+    estimator = estimator or _Estimator()
+    trees = []
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            tree = ast.parse(file.read(), path)
+        trees.append((os.path.splitext(os.path.basename(path))[0], tree))
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                estimator.classes[node.name] = _init_attributes(node)
+
+    items = []
+    for module, tree in trees:
+        globals_count = 0
+        for node in tree.body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                for alias in node.names:
+                    globals_count += 1
+                    estimator.qstr((alias.asname or alias.name).split(".")[0])
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                globals_count += 1
+                items.append((module, node.name, "funkce", estimator.function(node)))
+            elif isinstance(node, ast.ClassDef):
+                globals_count += 1
+                members = 0
+                code = SIZES["class"] + estimator.qstr(node.name)
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        members += 1
+                        code += estimator.function(item)
+                    elif isinstance(item, (ast.Assign, ast.AnnAssign)) and item.value is not None:
+                        for name in _target_names(item):
+                            members += 1
+                            size = estimator.value(item.value) + estimator.qstr(name)
+                            # Velke datove cleny tridy (melodie apod.) se vypisuji zvlast
+                            if size >= 4 * BLOCK:
+                                items.append((module, f"{node.name}.{name}", _kind(item.value), size))
+                            else:
+                                code += size
+                code += dict_size(members)
+                items.append((module, node.name, f"trida ({members} clenu)", code))
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None:
+                for name in _target_names(node):
+                    if name.startswith("_") and isinstance(node.value, ast.Call) \
+                            and isinstance(node.value.func, ast.Name) and node.value.func.id == "const":
+                        continue
+                    globals_count += 1
+                    size = estimator.value(node.value) + estimator.qstr(name)
+                    if size:
+                        items.append((module, name, _kind(node.value), size))
+        items.append((module, "<modul>", f"modul ({globals_count} globalnich jmen)",
+                      SIZES["module"] + dict_size(globals_count) + estimator.qstr(module)))
+    return items
+
+
+def default_paths():
+    paths = sorted(glob.glob(os.path.join(ROOT_DIR, "lib", "**", "*.py"), recursive=True))
+    code = os.path.join(ROOT_DIR, "code.py")
+    if os.path.exists(code):
+        paths.append(code)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Odhad RAM, kterou na pico:ed zabere import knihoven z lib/ a code.py.")
+    parser.add_argument("files", nargs="*", help="soubory k odhadu (vychozi: lib/**/*.py a code.py)")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_KB,
+                        help=f"volna RAM zarizeni v KB (vychozi {DEFAULT_BUDGET_KB}, viz gc.mem_free())")
+    parser.add_argument("--top", type=int, default=15, help="kolik nejvetsich polozek vypsat")
+    parser.add_argument("--mpy", action="store_true", help="knihovny jsou nahrane jako .mpy (bez spicky prekladace)")
+    parser.add_argument("--json", help="ulozit vsechny polozky do JSON souboru")
+    args = parser.parse_args()
+
+    paths = [os.path.abspath(path) for path in args.files] or default_paths()
+    items = analyze(paths)
+    items.sort(key=lambda item: -item[3])
+    total = sum(item[3] for item in items)
+
+    print(f"{'modul':<18} {'polozka':<24} {'druh':<28} {'bajty':>8} {'podil':>6}")
+    for module, name, kind, size in items[:args.top]:
+        print(f"{module:<18} {name:<24} {kind:<28} {size:>8} {size / max(total, 1) * 100:>5.1f}%")
+
+    print()
+    print(f"{'modul':<18} {'po importu':>11} {'spicka importu':>15}")
+    peak = 0
+    resident = 0
+    for path in paths:
+        module = os.path.splitext(os.path.basename(path))[0]
+        size = sum(item[3] for item in items if item[0] == module)
+        # Parser a prekladac potrebuji pamet jen behem importu; pak se uvolni, ale uz nahrane moduly zustavaji
+        compile_peak = 0 if args.mpy and module != "code" else os.path.getsize(path) * COMPILE_RAM_PER_BYTE
+        peak = max(peak, resident + size + compile_peak)
+        resident += size
+        print(f"{module:<18} {size / 1024:>9.1f}KB {(size + compile_peak) / 1024:>13.1f}KB")
+
+    budget = args.budget * 1024
+    print()
+    print(f"Celkem po importu {total / 1024:.1f} KB, spicka behem importu {peak / 1024:.1f} KB, "
+          f"rozpocet {args.budget:.0f} KB ({peak / budget * 100:.0f}% vyuzito).")
+    print("(odhad z AST; skutecnou hodnotu ukaze gc.mem_free() pred a po importu na pico:ed-u)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({
+                "budget": budget, "total": total, "peak": peak,
+                "items": [{"module": m, "name": n, "kind": k, "bytes": b} for m, n, k, b in items],
+            }, file, indent=1)
+
+    if peak > budget:
+        print(f"Rozpocet je prekroceny o {(peak - budget) / 1024:.1f} KB.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# Davka v Pythonu. Zabali vestavene melodie knihovny lib/elecfreaks_music.py do binarniho souboru
+# lib/elecfreaks_music.bin. Knihovna si kazdou melodii nacte z flash az pri prvnim prehrani,
+# takze import nevytvari na heapu stovky retezcu s notami.
+# Verze souboru ze dne 2026-10-19
+#
+# Jak to funguje:
+# - melodie jsou zapsane nize ve stejne notaci jako v puvodni knihovne ("c4:1", "d#", "r:2", ...)
+# - poradi melodii v souboru se vezme z lib/elecfreaks_music.py (radky NAZEV = index ve tride Music)
+# - kazda nota se prevede na 1 bajt (nota, krizek) a pokud meni oktavu nebo delku, na 2 bajty;
+#   prevod kontroluje notu stejne jako Music._get_frequency_duration (spatna nota = chyba)
+# - bemol se ulozi jako krizek o notu niz ("eb" -> "d#"), zni stejne
+# - po zmene melodie je potreba spustit davku znovu a nahrat .bin spolu s knihovnou do /lib
+#
+# Pouziti:
+#   python .vscode/music_pack.py                     (zapise lib/elecfreaks_music.bin)
+#   python .vscode/music_pack.py --check             (jen overi, ze .bin odpovida melodiim)
+import argparse
+import ast
+import os
+import struct
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIBRARY = os.path.join(ROOT_DIR, "lib", "elecfreaks_music.py")
+OUTPUT = os.path.join(ROOT_DIR, "lib", "elecfreaks_music.bin")
+MAGIC = b"EFM\x01"
+NOTE_REST = 7
+NOTE_SHARP = 0x08
+NOTE_OCTAVE = 0x10
+NOTE_DURATION = 0x20
+
+# Vestavene melodie (stejna notace jako Music.play)
+DADADADUM = ["r4:2", "g", "g", "g", "eb:8", "r:2", "f", "f", "f", "d:8"]
+ENTERTAINER = [
+    "d4:1", "d#", "e", "c5:2", "e4:1", "c5:2", "e4:1", "c5:3",
+    "c:1", "d", "d#", "e", "c", "d", "e:2", "b4:1", "d5:2", "c:4"
+]
+PRELUDE = [
+    "c4:1", "e", "g", "c5", "e", "g4", "c5", "e", "c4", "e", "g", "c5",
+    "e", "g4", "c5", "e", "c4", "d", "g", "d5", "f", "g4", "d5", "f",
+    "c4", "d", "g", "d5", "f", "g4", "d5", "f", "b3", "d4", "g", "d5",
+    "f", "g4", "d5", "f", "b3", "d4", "g", "d5", "f", "g4", "d5", "f",
+    "c4", "e", "g", "c5", "e", "g4", "c5", "e", "c4", "e", "g", "c5",
+    "e", "g4", "c5", "e"
+]
+ODE = [
+    "e4", "e", "f", "g", "g", "f", "e", "d", "c", "c", "d", "e",
+    "e:6", "d:2", "d:8", "e:4", "e", "f", "g", "g", "f", "e",
+    "d", "c", "c", "d", "e", "d:6", "c:2", "c:8"
+]
+NYAN = [
+    "f#5:2", "g#", "c#:1", "d#:2", "b4:1", "d5:1", "c#", "b4:2", "b",
+    "c#5", "d", "d:1", "c#", "b4:1", "c#5:1", "d#", "f#", "g#", "d#",
+    "f#", "c#", "d", "b4", "c#5", "b4", "d#5:2", "f#", "g#:1", "d#",
+    "f#", "c#", "d#", "b4", "d5", "d#", "d", "c#", "b4", "c#5", "d:2",
+    "b4:1", "c#5", "d#", "f#", "c#", "d", "c#", "b4", "c#5:2", "b4",
+    "c#5", "b4", "f#:1", "g#", "b:2", "f#:1", "g#", "b", "c#5", "d#",
+    "b4", "e5", "d#", "e", "f#", "b4:2", "b", "f#:1", "g#", "b", "f#",
+    "e5", "d#", "c#", "b4", "f#", "d#", "e", "f#", "b:2", "f#:1", "g#",
+    "b:2", "f#:1", "g#", "b", "b", "c#5", "d#", "b4", "f#", "g#", "f#",
+    "b:2", "b:1", "a#", "b", "f#", "g#", "b", "e5", "d#", "e", "f#",
+    "b4:2", "c#5"
+]
+RINGTONE = [
+    "c4:1", "d", "e:2", "g", "d:1", "e", "f:2", "a", "e:1", "f", "g:2",
+    "b", "c5:4"
+]
+FUNK = [
+    "c2:2", "c", "d#", "c:1", "f:2", "c:1", "f:2", "f#", "g", "c", "c",
+    "g", "c:1", "f#:2", "c:1", "f#:2", "f", "d#"
+]
+BLUES = [
+    "c2:2", "e", "g", "a", "a#", "a", "g", "e", "c2:2", "e", "g", "a",
+    "a#", "a", "g", "e", "f", "a", "c3", "d", "d#", "d", "c", "a2",
+    "c2:2", "e", "g", "a", "a#", "a", "g", "e", "g", "b", "d3", "f",
+    "f2", "a", "c3", "d#", "c2:2", "e", "g", "e", "g", "f", "e", "d"
+]
+BIRTHDAY = [
+    "c4:3", "c:1", "d:4", "c:4", "f", "e:8", "c:3", "c:1", "d:4", "c:4",
+    "g", "f:8", "c:3", "c:1", "c5:4", "a4", "f", "e", "d", "a#:3", "a#:1",
+    "a:4", "f", "g", "f:8"
+]
+WEDDING = [
+    "c4:4", "f:3", "f:1", "f:8", "c:4", "g:3", "e:1", "f:8", "c:4", "f:3",
+    "a:1", "c5:4", "a4:3", "f:1", "f:4", "e:3", "f:1", "g:8"
+]
+FUNERAL = [
+    "c3:4", "c:3", "c:1", "c:4", "d#:3", "d:1", "d:3", "c:1", "c:3",
+    "b2:1", "c3:4"
+]
+PUNCHLINE = [
+    "c4:3", "g3:1", "f#", "g", "g#:3", "g", "r", "b", "c4"
+]
+PYTHON = [
+    "d5:1", "b4", "r", "b", "b", "a#", "b", "g5", "r", "d", "d", "r",
+    "b4", "c5", "r", "c", "c", "r", "d", "e:5", "c:1", "a4", "r",
+    "a", "a", "g#", "a", "f#5", "r", "e", "e", "r", "c", "b4", "r",
+    "b", "b", "r", "c5", "d:5", "d:1", "b4", "r", "b", "b", "a#",
+    "b", "b5", "r", "g", "g", "r", "d", "c#", "r", "a", "a", "r",
+    "a", "a:5", "g:1", "f#:2", "a:1", "a", "g#", "a", "e:2", "a:1",
+    "a", "g#", "a", "d", "r", "c#", "d", "r", "c#", "d:2", "r:3"
+]
+BADDY = ["c3:3", "r", "d:2", "d#", "r", "c", "r", "f#:8"]
+CHASE = [
+    "a4:1", "b", "c5", "b4", "a:2", "r", "a:1", "b", "c5", "b4",
+    "a:2", "r", "a:2", "e5", "d#", "e", "f", "e", "d#", "e", "b4:1",
+    "c5", "d", "c", "b4:2", "r", "b:1", "c5", "d", "c", "b4:2", "r",
+    "b:2", "e5", "d#", "e", "f", "e", "d#", "e",
+]
+BA_DING = ["b5:1", "e6:3"]
+WAWAWAWAA = ["e3:3", "r:1", "d#:3", "r:1", "d:4", "r:1", "c#:8"]
+JUMP_UP = ["c5:1", "d", "e", "f", "g"]
+JUMP_DOWN = ["g5:1", "f", "e", "d", "c"]
+POWER_UP = ["g4:1", "c5", "e", "g:2", "e:1", "g:3"]
+POWER_DOWN = ["g5:1", "d#", "c", "g4:2", "b:1", "c5:3"]
+
+
+def encode_note(note_str):
+    # Prevede jednu notu na 1 nebo 2 bajty (format viz komentar v lib/elecfreaks_music.py).
+    note_split = note_str.lower().split(":")
+    note = note_split[0]
+    duration = None
+    if len(note_split) > 1:
+        duration = int(note_split[1])
+        if not 0 <= duration <= 15:
+            raise ValueError(f"nota '{note_str}': delka musi byt 0-15")
+    if not note:
+        raise ValueError(f"nota '{note_str}' ma spatny format")
+    note_index = ord(note[0]) - ord("a")
+    if note_index < 0 or (note_index > 6 and note_index != 17):
+        raise ValueError(f"nota '{note_str}' ma spatny format")
+
+    sharp = False
+    octave = None
+    if len(note) == 2 and note[1].isdigit():
+        octave = int(note[1])
+    elif len(note) in (2, 3):
+        if len(note) == 3:
+            if not note[2].isdigit():
+                raise ValueError(f"nota '{note_str}' ma spatny format")
+            octave = int(note[2])
+        sharp = True
+        if note[1] == "b" and note_index <= 6:
+            note_index -= 1
+        elif note[1] != "#":
+            raise ValueError(f"nota '{note_str}' ma spatny format")
+    elif len(note) != 1:
+        raise ValueError(f"nota '{note_str}' ma spatny format")
+
+    if note_index == 17:
+        code = NOTE_REST
+    else:
+        # "ab" = g# (index -1 ukazuje v tabulce kmitoctu na posledni prvek)
+        code = note_index % 7 | (NOTE_SHARP if sharp else 0)
+    if octave is None and duration is None:
+        return bytes([code])
+    code |= (NOTE_OCTAVE if octave is not None else 0) | (NOTE_DURATION if duration is not None else 0)
+    return bytes([code, (octave or 0) | (duration or 0) << 4])
+
+
+def tune_order(path=LIBRARY):
+    # Vrati jmena melodii v poradi indexu z radku NAZEV = _Tune(index) ve tride Music.
+    with open(path, encoding="utf-8") as file:
+        tree = ast.parse(file.read(), path)
+    order = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == "Music":
+            for item in node.body:
+                value = item.value if isinstance(item, ast.Assign) else None
+                if isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id == "_Tune" \
+                        and item.targets[0].id.isupper() and isinstance(value.args[0], ast.Constant):
+                    order[value.args[0].value] = item.targets[0].id
+    if sorted(order) != list(range(len(order))):
+        raise ValueError("indexy melodii ve tride Music musi byt 0, 1, 2, ... bez mezer")
+    return [order[index] for index in range(len(order))]
+
+
+def pack(names):
+    # Vrati obsah .bin souboru pro melodie v danem poradi.
+    tunes = [b"".join(encode_note(note) for note in globals()[name]) for name in names]
+    offset = len(MAGIC) + 1 + 2 * (len(tunes) + 1)
+    offsets = []
+    for tune in tunes:
+        offsets.append(offset)
+        offset += len(tune)
+    offsets.append(offset)
+    if offset > 0xFFFF:
+        raise ValueError("melodie se nevejdou do 64 KB")
+    return MAGIC + bytes([len(tunes)]) + struct.pack(f"<{len(offsets)}H", *offsets) + b"".join(tunes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zabali vestavene melodie Music do lib/elecfreaks_music.bin.")
+    parser.add_argument("--check", action="store_true", help="jen overit, ze .bin odpovida melodiim (navratovy kod 1, kdyz ne)")
+    parser.add_argument("--output", default=OUTPUT, help="vystupni soubor (vychozi lib/elecfreaks_music.bin)")
+    args = parser.parse_args()
+
+    names = tune_order()
+    missing = [name for name in names if not isinstance(globals().get(name), list)]
+    if missing:
+        print(f"Knihovna odkazuje na melodie, ktere tu nejsou zapsane: {', '.join(missing)}")
+        sys.exit(1)
+    data = pack(names)
+    notes = sum(len(globals()[name]) for name in names)
+
+    if args.check:
+        current = open(args.output, "rb").read() if os.path.exists(args.output) else b""
+        if current != data:
+            print(f"'{args.output}' neodpovida melodiim, spustte: python .vscode/music_pack.py")
+            sys.exit(1)
+        print(f"'{args.output}' je aktualni ({len(names)} melodii, {notes} not, {len(data)} B).")
+        return
+
+    with open(args.output, "wb") as file:
+        file.write(data)
+    print(f"Zapsano {len(names)} melodii, {notes} not -> '{args.output}' ({len(data)} B, {len(data) / notes:.2f} B na notu).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Davka v Pythonu. Umi prehrat melodie z lib/elecfreaks_music.py nad fake hardware (lib_vsc_only)
+# a ulozit je jako WAV soubory. Casovani melodii se overi bez pico:ed-u a rychleji nez v realnem case.
+# Verze souboru ze dne 2026-10-19
+#
+# Jak to funguje:
+# - Music hraje synchronne (play), time.sleep je fake -> jen posouva simulovany cas adafruit_ticks
+# - fake pwmio.PWMOut si uklada kazdy zapis duty_cycle/frequency i s casem (timeline_*)
+# - z casove osy se po blocich (CHUNK vzorku) spocita obdelnikovy signal pomoci NumPy
+# - ke kazde melodii se vypise ocekavana a simulovana delka a drift zacatku not
+#
+# Pouziti:
+#   python .vscode/music_wav.py                      (vsechny vestavene melodie)
+#   python .vscode/music_wav.py --tune NYAN --bpm 140
+#   python .vscode/music_wav.py --no-wav             (jen kontrola casovani)
+import argparse
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib_vsc_only"))
+import fakehw  # noqa: E402
+fakehw.setup_path()
+import adafruit_ticks as ticks  # noqa: E402
+import board  # noqa: E402
+
+SAMPLE_RATE = 22050
+CHUNK = 1 << 16          # pocet vzorku zpracovanych najednou
+AMPLITUDE = 12000        # 16bit vzorky, at to neni moc nahlas
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "music_wav")
+
+
+def tune_names(music_class):
+    # Vestavene melodie jsou atributy tridy psane velkymi pismeny (NYAN, PRELUDE, ...)
+    return sorted(
+        name for name in dir(music_class)
+        if name.isupper() and not name.startswith("_")
+    )
+
+
+def simulate(music_module, tune, tempo_ticks=4, bpm=120):
+    # Prehraje melodii nad fake hardware a vrati (noty, pwm, konec v us).
+    # noty = [(zacatek_us, frekvence, delka_ms), ...] - zachycene z volani Music.pitch
+    ticks.set_ticks_ms(0)
+    music = music_module.Music(board.BUZZER, tempo_ticks, bpm)
+    notes = []
+    original_pitch = music.pitch
+
+    def pitch(frequency, duration=-1):
+        notes.append((ticks.fake_ticks_us(), frequency, duration))
+        original_pitch(frequency, duration)
+
+    music.pitch = pitch
+    music.play(tune)
+    return notes, music._pwm, ticks.fake_ticks_us()
+
+
+def timing(notes, end_us):
+    # Porovna skutecne zacatky not s idealnimi (soucet delek predchozich not).
+    # Vraci (ocekavana delka ms, drift na konci ms, nejvetsi drift zacatku noty ms)
+    expected_ms = 0.0
+    max_drift_ms = 0.0
+    for start_us, _, duration_ms in notes:
+        max_drift_ms = max(max_drift_ms, abs(start_us / 1000 - expected_ms))
+        expected_ms += duration_ms
+    return expected_ms, end_us / 1000 - expected_ms, max_drift_ms
+
+
+def render_wav(path, pwm, end_us, sample_rate=SAMPLE_RATE):
+    # Z casove osy PWM vyrobi obdelnikovy signal a zapise ho po blocich do WAV.
+    # Vraci pocet zapsanych vzorku.
+    starts = np.asarray(pwm.timeline_us, dtype=np.float64) / 1e6
+    freqs = np.asarray(pwm.timeline_frequency, dtype=np.float64)
+    duties = np.asarray(pwm.timeline_duty, dtype=np.float64) / 65536
+    total = int(round(end_us / 1e6 * sample_rate))
+
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        for first in range(0, total, CHUNK):
+            t = np.arange(first, min(first + CHUNK, total)) / sample_rate
+            # Posledni zapis pred kazdym vzorkem (vic zapisu ve stejnem case -> plati posledni)
+            idx = np.maximum(np.searchsorted(starts, t, side="right") - 1, 0)
+            duty = duties[idx]
+            phase = ((t - starts[idx]) * freqs[idx]) % 1.0
+            samples = np.where(phase < duty, AMPLITUDE, -AMPLITUDE)
+            samples[duty == 0] = 0
+            wav.writeframes(samples.astype("<i2").tobytes())
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prehraje melodie z elecfreaks_music nad fake hardware a ulozi je jako WAV.")
+    parser.add_argument("--tune", action="append", help="jmeno melodie (lze opakovat), vychozi jsou vsechny")
+    parser.add_argument("--ticks", type=int, default=4, help="pocet ticku na dobu (jako Music)")
+    parser.add_argument("--bpm", type=int, default=120, help="tempo (jako Music)")
+    parser.add_argument("--rate", type=int, default=SAMPLE_RATE, help="vzorkovaci frekvence WAV")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="adresar pro WAV soubory")
+    parser.add_argument("--no-wav", action="store_true", help="jen zkontrolovat casovani, WAV neukladat")
+    args = parser.parse_args()
+
+    music_module = fakehw.import_lib("elecfreaks_music")
+    names = args.tune or tune_names(music_module.Music)
+    if not args.no_wav:
+        os.makedirs(args.out, exist_ok=True)
+
+    print(f"{'melodie':<12} {'not':>4} {'ocekavano':>10} {'simulace':>10} {'drift':>8} {'max drift':>10} {'zvuk':>7} {'vypocet':>8} {'rychlost':>9}")
+    total_audio = 0.0
+    total_wall = 0.0
+    for name in names:
+        tune = getattr(music_module.Music, name)
+        wall_start = time.perf_counter()
+        notes, pwm, end_us = simulate(music_module, tune, args.ticks, args.bpm)
+        if not args.no_wav:
+            render_wav(os.path.join(args.out, f"{name.lower()}.wav"), pwm, end_us, args.rate)
+        wall = time.perf_counter() - wall_start
+        expected_ms, drift_ms, max_drift_ms = timing(notes, end_us)
+        audio = end_us / 1e6
+        total_audio += audio
+        total_wall += wall
+        print(f"{name:<12} {len(notes):>4} {expected_ms:>8.0f}ms {end_us / 1000:>8.0f}ms {drift_ms:>+6.0f}ms {max_drift_ms:>8.0f}ms {audio:>6.1f}s {wall:>7.3f}s {audio / wall:>8.0f}x")
+
+    print(f"Celkem {total_audio:.1f} s hudby za {total_wall:.2f} s ({total_audio / total_wall:.0f}x rychleji nez realny cas).")
+    if not args.no_wav:
+        print(f"WAV soubory jsou v '{args.out}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,81 +1,891 @@
 # Davka v Pythonu. Umi prijimat hodnoty oddelene carkou zaslane z pico:ed-u pres seriovy port a zobrazit je v grafu.
-# Verze souboru ze dne 2025-02-21
+# Verze souboru ze dne 2026-10-19
+#
+# - prvni hodnota na radku je osa x, dalsi hodnoty jsou jednotlive cary
+# - graf drzi jen poslednich --window vzorku v kruhovem bufferu (NumPy), takze snimek stoji
+#   stejne po minute i po hodine mereni
+# - rozsah os se pocita jen z okna: osa x se posouva skokem o pul okna a osa y se zmeni,
+#   jen kdyz data z rozsahu vyjedou (nebo se hodne zmensi); jinak se prekresluji jen cary (blit)
+# - seriovy port cte samostatne vlakno (SerialReader) a bajty posila do fronty; kazdy snimek grafu
+#   zpracuje najednou vsechno, co mezitim prislo (radky se prevadi na cisla v NumPy po blocich),
+#   takze graf stiha i telemetrii s tisici radky za sekundu a nezpozduje se
+# - v rohu grafu se ukazuje pocet radku za sekundu, vadnych radku a radku zahozenych pri zahlceni
+# - --record ulozi prijate vzorky do souboru (jen se pripisuje na konec, zapisuje se jednou za
+#   --flush sekund), takze mereni zustane i po zavreni okna nebo padu programu
+# - --replay prehraje ulozeny zaznam bez pico:ed-u (soubor se mapuje do pameti, nic se nekopiruje);
+#   s --port loop:// (nebo cestou k pty) se zaznam posila jako text pres nahradni seriovy port,
+#   takze se vyzkousi cela cesta cteni a parsovani
+# - pico:ed muze posilat text "x,h1,h2" (print) nebo binarni ramce z lib/telemetry.py
+#   (synchronizacni slovo, pocet kanalu, poradove cislo, x, float32 hodnoty, CRC-16);
+#   ramce se hledaji a kontroluji v NumPy najednou pro cely blok, vadne (CRC) a ztracene
+#   (mezera v poradovem cisle, vcetne vadnych) se pocitaji; --protocol auto pozna format sam z prvnich dat
+# - bez --port se pouzije datovy port pico:ed-u, pokud ho boot.py zapnul (usb_cdc.enable(data=True));
+#   tam posila lib/telemetry.py. Jinak je jediny port konzole (REPL a print), kam posila i telemetry.py
+# - pocet car se bere z dat (kolik hodnot ma radek nebo ramec), barvy se opakuji z palety matplotlibu;
+#   radek "# x,levy,pravy" (text, nebo Telemetry.header() v lib/telemetry.py) pojmenuje osu x a cary
+# - kdyz je v okne vic vzorku nez --points, graf kresli zmensenou radu: LTTB (Largest Triangle
+#   Three Buckets) vybere z kazdeho useku bod, ktery nejvic meni tvar krivky, takze spicky zustanou;
+#   --decimate minmax nechava z useku minimum i maximum. Useky se pocitaji prubezne jen jednou
+#   (az jsou cele), takze i okno s hodinovym zaznamem se kresli plynule
+# - --info vypise souhrn zaznamu (pocet radku, rozsah x, min/prumer/max kanalu) bez grafu
+#
+# Format zaznamu: hlavicka b"PLOTCAP1", pak useky: b"SEG0", pocet radku (uint32), pocet hodnot
+# na radku (uint32) a radky jako float64 (little endian); kratsi radky jsou doplnene NaN.
+# Usek b"LBL0", delka textu, 0 a text v UTF-8 nese popisky z hlavicky.
+#
+# Pouziti:
+#   python .vscode/ploter.py
+#   python .vscode/ploter.py --window 5000
+#   python .vscode/ploter.py --interval 50            (snimek grafu kazdych 50 ms)
+#   python .vscode/ploter.py --record jizda.cap
+#   python .vscode/ploter.py --replay jizda.cap --rate 500
+#   python .vscode/ploter.py --replay jizda.cap --port loop://
+#   python .vscode/ploter.py --replay jizda.cap --info
+#   python .vscode/ploter.py --replay jizda.cap --rate 0 --window 2000000   (cely zaznam najednou)
+#   python .vscode/ploter.py --window 100000 --points 1500 --decimate minmax
+#   python .vscode/ploter.py --port /dev/pts/3        (jiny port nebo URL pyserial misto pico:ed-u)
+#   python .vscode/ploter.py --protocol text          (jen textove radky, bez hledani binarnich ramcu)
+import argparse
+import collections
+import mmap
+import os
+import queue
+import re
+import struct
+import threading
+import time
 import serial
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+import numpy as np
 import serial.tools.list_ports
-import itertools
 from time import sleep
 
+DEFAULT_WINDOW = 2000        # pocet vzorku v grafu
+DEFAULT_INTERVAL = 30        # ms mezi snimky grafu
+MAX_CHUNKS = 4096            # kolik nezpracovanych bloku bajtu se vejde do fronty, pak se zahazuje
+DEFAULT_FLUSH = 1.0          # s mezi zapisy zaznamu na disk
+DEFAULT_RATE = 1000          # radku za sekundu pri prehravani zaznamu
+DEFAULT_POINTS = 2000        # kolik bodu nejvic kreslit na jednu caru (vic vzorku se zmensi)
+DECIMATIONS = ("lttb", "minmax")
+PROTOCOLS = ("auto", "text", "binary")
+AUTO_PROBE_BYTES = 1 << 16   # kolik bajtu nejvic cist, nez se auto rozhodne pro text
+SYNC = (0xA5, 0x5A)          # stejne jako lib/telemetry.py
+FRAME_HEADER = 8             # sync, pocet kanalu, poradove cislo, x (uint32)
+FRAME_CRC = 2
+HEADER_MAX = 4096            # nejdelsi textova hlavicka pred prvnim ramcem (255 popisku)
+CAPTURE_MAGIC = b"PLOTCAP1"
+SEGMENT = struct.Struct("<4sII")
+SEGMENT_MAGIC = b"SEG0"
+LABELS_MAGIC = b"LBL0"
+Y_MARGIN = 0.05              # rezerva nad a pod daty (podil rozsahu)
+Y_SHRINK = 0.25              # osa y se zmensi, kdyz data zabiraji mene nez tento podil rozsahu
+
+
+def interface_number(port):
+    # Cislo USB rozhrani z umisteni portu ("1-1.2:1.2" -> 2); konzole ma 0, datovy port vyssi.
+    location = port.location or ""
+    try:
+        return int(location.rsplit(":", 1)[1].rsplit(".", 1)[1])
+    except (IndexError, ValueError):
+        return -1
+
+
+def device_number(port):
+    # Cislo na konci jmena portu ("COM10" -> 10, "/dev/ttyACM1" -> 1); jako text by COM9 vyhral nad COM10.
+    match = re.search(r"(\d+)$", port.device or "")
+    return int(match.group(1)) if match else -1
+
+
+def is_data_port(port):
+    # CircuitPython pojmenuje datove rozhrani "CDC2" (v interface, na Windows casto jen v description).
+    return "CDC2" in (port.interface or "") or "CDC2" in (port.description or "")
+
+
 def find_com_device(vid, pid):
-    ports = list(serial.tools.list_ports.comports())
-    for port in ports:
-        if port.vid == vid and port.pid == pid:
-            return port.device
-    return None
+    # pico:ed ma se zapnutym usb_cdc.data dva porty se stejnym VID/PID: konzoli a datovy port.
+    # lib/telemetry.py posila na datovy port, pokud existuje, proto se vybere ten ("CDC2"
+    # v nazvu nebo popisu rozhrani, vyssi cislo rozhrani, nebo vyssi cislo portu); jinak jediny port.
+    ports = [port for port in serial.tools.list_ports.comports() if port.vid == vid and port.pid == pid]
+    if not ports:
+        return None
+    return max(ports, key=lambda port: (is_data_port(port), interface_number(port), device_number(port))).device
 
 def showInfo():
     com_ports = list(serial.tools.list_ports.comports())
     for port in com_ports:
         print(f"Device: {port.device}")
-    
-def init_plot():
-    # ax.set_xlim(0, 20)
-    # ax.set_ylim(0, 1023)
-    for line in lines:
-        line.set_data([], [])
-    return lines
-
-def update_plot(frame):
-    data = ser.readline().decode().strip()
-    if data:
+
+
+class RingBuffer:
+    # Kruhovy buffer pevne velikosti pro osu x a kanaly y.
+    # Kazdy vzorek se zapise dvakrat (na pozici i a i + capacity), takze okno poslednich
+    # vzorku je vzdy souvisly kus pole a do grafu se predava bez kopirovani.
+    def __init__(self, capacity, channels=1):
+        self.capacity = capacity
+        self.count = 0
+        self.total = 0               # pocet vsech vzorku od zacatku (i tech, ktere uz z okna vypadly)
+        self._next = 0
+        self.x = np.zeros(2 * capacity)
+        self.y = np.full((channels, 2 * capacity), np.nan)
+
+    @property
+    def channels(self):
+        return self.y.shape[0]
+
+    def _grow(self, channels):
+        # Novy kanal (radek s vice hodnotami) - stare vzorky v nem zustanou prazdne (NaN)
+        extra = np.full((channels - self.channels, 2 * self.capacity), np.nan)
+        self.y = np.vstack((self.y, extra))
+
+    def extend(self, x, y):
+        # Prida n vzorku: x ma tvar (n,), y tvar (kanaly, n).
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float).reshape(-1, len(x))
+        if y.shape[0] > self.channels:
+            self._grow(y.shape[0])
+        if len(x) > self.capacity:
+            x, y = x[-self.capacity:], y[:, -self.capacity:]
+        n = len(x)
+        if n == 0:
+            return
+        positions = (self._next + np.arange(n)) % self.capacity
+        for offset in (0, self.capacity):
+            self.x[positions + offset] = x
+            self.y[:, positions + offset] = np.nan
+            self.y[:y.shape[0], positions + offset] = y
+        self._next = (self._next + n) % self.capacity
+        self.count = min(self.count + n, self.capacity)
+        self.total += n
+
+    def since(self, index):
+        # Vrati (x, y) vzorku od absolutniho poradi index do konce (index musi byt jeste v okne).
+        start = (self._next - (self.total - index)) % self.capacity
+        length = self.total - index
+        return self.x[start:start + length], self.y[:, start:start + length]
+
+    def window(self):
+        # Vrati (x, y) poslednich count vzorku jako pohledy do bufferu (bez kopie).
+        start = (self._next - self.count) % self.capacity
+        return self.x[start:start + self.count], self.y[:, start:start + self.count]
+
+
+class Decimator:
+    # Prubezne zmensuje okno kruhoveho bufferu na nejvic points bodu na caru.
+    # Vzorky se deli na useky pevne delky podle absolutniho poradi; z celeho useku se vybere
+    # bod (LTTB) nebo minimum a maximum (minmax) a ulozi se spolu s poradim prvniho vzorku useku. Kazdy usek se tak pocita jen jednou,
+    # nezmensene zustavaji jen posledni nedokoncene useky.
+    def __init__(self, buffer, points=DEFAULT_POINTS, method="lttb"):
+        self.buffer = buffer
+        self.method = method
+        per_bucket = 2 if method == "minmax" else 1
+        self.size = max(1, buffer.capacity * per_bucket // max(points, 1))
+        self.active = self.size > 1
+        self._selected = collections.deque(maxlen=buffer.capacity // self.size + 2)
+        self._channels = 0
+        self._next = 0          # absolutni poradi prvniho vzorku useku, ktery se zpracuje pristi
+        self._anchor = None     # LTTB: vybrany bod predchoziho useku (x, y po kanalech)
+
+    def _reset(self):
+        self._selected.clear()
+        self._channels = self.buffer.channels
+        # Zacit od prvniho celeho useku v okne
+        first = self.buffer.total - self.buffer.count
+        self._next = -(-first // self.size) * self.size
+        self._anchor = None
+
+    def _select(self, x, y, x_next, y_next):
+        # Vybere body jednoho useku (x tvar (n,), y tvar (kanaly, n)); x_next, y_next je nasledujici usek.
+        if self.method == "minmax":
+            low = np.argmin(np.where(np.isnan(y), np.inf, y), axis=1)
+            high = np.argmax(np.where(np.isnan(y), -np.inf, y), axis=1)
+            order = np.sort(np.stack((low, high), axis=1), axis=1)
+            rows = np.arange(len(y))[:, None]
+            return x[order], y[rows, order]
+        if self._anchor is None:
+            self._anchor = (np.full(len(y), x[0]), y[:, 0].copy())
+        anchor_x, anchor_y = self._anchor
+        valid = ~np.isnan(y_next)
+        counts = valid.sum(axis=1)
+        average_y = np.where(counts, np.where(valid, y_next, 0).sum(axis=1) / np.maximum(counts, 1), anchor_y)
+        average_x = x_next.mean()
+        area = np.abs((anchor_x[:, None] - average_x) * (y - anchor_y[:, None])
+                      - (anchor_x[:, None] - x[None, :]) * (average_y - anchor_y)[:, None])
+        best = np.argmax(np.where(np.isnan(area), -1, area), axis=1)
+        rows = np.arange(len(y))
+        self._anchor = (x[best], y[rows, best])
+        return x[best][:, None], y[rows, best][:, None]
+
+    def series(self):
+        # Vrati seznam (x, y) pro kazdy kanal: vybrane body celych useku + nezmensene posledni vzorky.
+        buffer = self.buffer
+        if buffer.channels != self._channels or self._next < buffer.total - buffer.count:
+            self._reset()
+        # Usek jde zpracovat, az je cely i ten nasledujici (LTTB potrebuje jeho prumer)
+        while self._next + 2 * self.size <= buffer.total:
+            x, y = buffer.since(self._next)
+            self._selected.append((self._next,) + self._select(
+                x[:self.size], y[:, :self.size], x[self.size:2 * self.size], y[:, self.size:2 * self.size]))
+            self._next += self.size
+        # Useky, ktere uz vypadly z okna, se nekresli. Porovnava se poradi vzorku, ne x:
+        # x se muze vratit na zacatek (restart pico:ed-u, preteceni ticks_ms)
+        first = buffer.total - buffer.count
+        while self._selected and self._selected[0][0] < first:
+            self._selected.popleft()
+        x_tail, y_tail = buffer.since(max(self._next, first))
+        x_tail = np.broadcast_to(x_tail, (buffer.channels, len(x_tail)))
+        if self._selected:
+            x_all = np.concatenate([x for _, x, _ in self._selected] + [x_tail], axis=1)
+            y_all = np.concatenate([y for _, _, y in self._selected] + [y_tail], axis=1)
+        else:
+            x_all, y_all = x_tail, y_tail
+        return [(x_all[i], y_all[i]) for i in range(buffer.channels)]
+
+
+class Plotter:
+    # Graf nad kruhovym bufferem. Osy se meni jen obcas, mezi tim se kresli jen cary (blit).
+    # Cara pribude, kdyz data maji vic kanalu; barvy se opakuji z palety matplotlibu.
+    def __init__(self, ax, buffer, decimator=None):
+        self.ax = ax
+        self.buffer = buffer
+        self.decimator = decimator
+        self.lines = []
+        self.labels = None
+        self._colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+
+    def init(self):
+        for line in self.lines:
+            line.set_data([], [])
+        return self.lines
+
+    def _ensure_lines(self, count):
+        # Vrati True, pokud pribyla cara (legenda a osy se pak musi prekreslit).
+        added = False
+        while len(self.lines) < count:
+            color = self._colors[len(self.lines) % len(self._colors)]
+            self.lines.append(self.ax.plot([], [], lw=2, color=color, animated=True)[0])
+            added = True
+        if added:
+            self._apply_labels()
+        return added
+
+    def set_labels(self, labels):
+        # Popisky z hlavicky "# x,levy,pravy": prvni je osa x, dalsi jsou cary.
+        self.labels = labels
+        self._apply_labels()
+        self.redraw()
+
+    def _apply_labels(self):
+        if not self.labels:
+            return
+        self.ax.set_xlabel(self.labels[0])
+        for i, line in enumerate(self.lines):
+            line.set_label(self.labels[i + 1] if i + 1 < len(self.labels) else f"kanal {i + 1}")
+        legend = self.ax.legend(loc="upper right", fontsize=8)
+        # Legenda se kresli s osami (neni animated), cary v ni jsou jen vzorky barev
+        for handle in legend.get_lines():
+            handle.set_animated(False)
+
+    def _update_limits(self, x_first, x_last, y_min, y_max):
+        # Vrati True, pokud se zmenil rozsah os (pak je potreba prekreslit i osy).
+        changed = False
+        x_low, x_high = self.ax.get_xlim()
+        if x_last > x_high or x_first < x_low:
+            span = max(x_last - x_first, 1e-9)
+            # Posun o pul okna dopredu, aby se osa x nemenila kazdy snimek
+            self.ax.set_xlim(x_first, x_last + span / 2)
+            changed = True
+
+        if np.isnan(y_min):
+            return changed
+        low, high = self.ax.get_ylim()
+        too_small = y_min < low or y_max > high
+        too_big = (y_max - y_min) < Y_SHRINK * (high - low)
+        if too_small or too_big:
+            margin = max((y_max - y_min) * Y_MARGIN, 1e-9)
+            self.ax.set_ylim(y_min - margin, y_max + margin)
+            changed = True
+        return changed
+
+    def redraw(self):
+        # Rozsah os se zmenil: prekreslit osy a popisky (cary jsou animated, kresli je blit).
+        # FuncAnimation si pak samo ulozi nove pozadi, protoze se zmenil pohled os.
+        self.ax.figure.canvas.draw()
+
+    def series(self):
+        if self.decimator is not None and self.decimator.active:
+            return self.decimator.series()
+        x, y = self.buffer.window()
+        return [(x, y[i]) for i in range(self.buffer.channels)]
+
+    def update(self, frame):
+        if self.buffer.count == 0:
+            return self.lines
+        series = self.series()
+        added = self._ensure_lines(len(series))
+        # Rozsah x z kreslenych bodu (ne z prvniho a posledniho vzorku): x se muze vratit
+        # na zacatek (restart pico:ed-u) a v okne jsou pak stara i nova data
+        x = series[0][0]
+        values = [y for _, y in series if len(y) and not np.isnan(y).all()]
+        y_min = min(np.nanmin(y) for y in values) if values else np.nan
+        y_max = max(np.nanmax(y) for y in values) if values else np.nan
+        if self._update_limits(np.min(x), np.max(x), y_min, y_max) or added:
+            self.redraw()
+        for line, (x, y) in zip(self.lines, series):
+            line.set_data(x, y)
+        return self.lines
+
+
+def parse_labels(line):
+    # Z hlavicky "# x,levy,pravy" vrati ["x", "levy", "pravy"].
+    text = line.decode(errors="replace").strip().lstrip("#")
+    return [label.strip() for label in text.split(",")]
+
+
+def parse_block(block):
+    # Prevede blok celych radku (bajty) na pole (radky, hodnoty); kratsi radky se doplni NaN.
+    # Radky se stejnym poctem hodnot se prevadi najednou v NumPy, po jednom jen kdyz je
+    # v bloku vadny radek. Vrati (pole, pocet vadnych radku).
+    lines = np.array([line for line in block.replace(b'\r', b'').split(b'\n') if line.strip()])
+    if len(lines) == 0:
+        return np.empty((0, 2)), 0
+    commas = np.char.count(lines, b',')
+    bad = int(np.count_nonzero(commas == 0))    # jen osa x bez hodnoty
+    width = int(commas.max()) + 1
+    result = np.full((len(lines), width), np.nan)
+    valid = np.ones(len(lines), dtype=bool)
+    for count in np.unique(commas[commas > 0]):
+        rows = np.flatnonzero(commas == count)
         try:
-            values = list(map(float, data.split(',')))
+            values = np.array(b','.join(lines[rows]).split(b',')).astype(float)
+            result[rows, :count + 1] = values.reshape(len(rows), count + 1)
         except ValueError:
-            return lines  # Pokud nelze převést řetězec na číslo, přeskoč řádek
-        if len(values) >= 2:
-            x_data.append(values[0])
-            for i in range(1, len(values)):
-                if len(y_data) < i:
-                    y_data.append([])  # Přidání nového seznamu pro nový y datový bod
-                y_data[i-1].append(values[i])
-            ax.set_xlim(min(x_data), max(x_data))
-            min_y = min(itertools.chain(*y_data))
-            max_y = max(itertools.chain(*y_data))
-            ax.set_ylim(min_y, max_y)
-            for i, line in enumerate(lines):
-                if i < len(y_data):
-                    line.set_data(x_data, y_data[i])
-            fig.canvas.draw()
-            fig.canvas.flush_events()
-    sleep(0.01)
-    return lines
-
-print("Seznam všech COM portů.")
-showInfo()
-
-print("Vyberu a otevřu COM port od připojeného pico:ed-u.")
-comPortPicoEd = find_com_device(0x2e8a, 0x1026)
-
-while True:
-    try:
-        ser = serial.Serial(comPortPicoEd, 9600)
-    except:
-        print(f"Nemohu otevřít {comPortPicoEd}. Není zapnutý REPL?")
-        sleep(1)
+            # Ve skupine je vadny radek - projit ji po radcich
+            for row in rows:
+                try:
+                    result[row, :count + 1] = list(map(float, lines[row].split(b',')))
+                except ValueError:
+                    valid[row] = False  # Pokud nelze převést řetězec na číslo, přeskoč řádek
+                    bad += 1
+    valid &= commas > 0
+    return result[valid], bad
+
+
+class SerialReader(threading.Thread):
+    # Vlakno, ktere porad cte seriovy port a cele bloky bajtu posila do fronty.
+    # Kdyz graf nestiha a fronta je plna, blok se zahodi a spocita se, kolik radku v nem bylo.
+    def __init__(self, ser, max_chunks=MAX_CHUNKS):
+        super().__init__(daemon=True)
+        self.ser = ser
+        self.chunks = queue.Queue(max_chunks)
+        self.bytes_read = 0
+        self.lines_dropped = 0
+        self.error = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                chunk = self.ser.read(max(self.ser.in_waiting, 1))
+            except (serial.SerialException, OSError) as error:
+                self.error = error
+                print(f"Čtení z {self.ser.name} skončilo: {error}")
+                return
+            if not chunk:
+                continue
+            self.bytes_read += len(chunk)
+            try:
+                self.chunks.put_nowait(chunk)
+            except queue.Full:
+                self.lines_dropped += chunk.count(b'\n')
+
+    def stop(self):
+        self._stop_event.set()
+
+    def drain(self):
+        # Vrati vsechny bajty, ktere od minule prisly (jeden blok).
+        parts = []
+        while True:
+            try:
+                parts.append(self.chunks.get_nowait())
+            except queue.Empty:
+                return b''.join(parts)
+
+
+class LineParser:
+    # Sklada bloky bajtu do celych radku (neukonceny konec si necha na priste) a pocita radky.
+    def __init__(self):
+        self.rest = b''
+        self.lines_ok = 0
+        self.lines_bad = 0
+        self.lines_lost = 0
+        self.labels = None
+
+    def feed(self, data):
+        # Vrati pole (radky, hodnoty) ze vsech celych radku v data.
+        data = self.rest + data
+        end = data.rfind(b'\n')
+        if end < 0:
+            self.rest = data
+            return np.empty((0, 2))
+        self.rest = data[end + 1:]
+        block = data[:end + 1]
+        if b'#' in block:
+            # Hlavicka s popisky: radek zacinajici '#'
+            lines = block.split(b'\n')
+            headers = [line for line in lines if line.lstrip().startswith(b'#')]
+            if headers:
+                self.labels = parse_labels(headers[-1])
+                block = b'\n'.join(line for line in lines if not line.lstrip().startswith(b'#'))
+        values, bad = parse_block(block)
+        self.lines_ok += len(values)
+        self.lines_bad += bad
+        return values
+
+
+def _crc_table():
+    # Tabulka CRC-16/CCITT (poly 0x1021) pro vypocet po bajtech, stejna jako v lib/telemetry.py
+    table = np.zeros(256, dtype=np.uint32)
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+        table[byte] = crc & 0xFFFF
+    return table
+
+
+CRC_TABLE = _crc_table()
+
+
+def frames_crc(frames):
+    # CRC-16/CCITT vsech ramcu najednou: frames ma tvar (ramce, delka), pocita se z bajtu
+    # 2 az delka-2. Smycka jde po sloupcich, kazdy krok zpracuje vsechny ramce v NumPy.
+    crc = np.full(len(frames), 0xFFFF, dtype=np.uint32)
+    for column in range(2, frames.shape[1] - FRAME_CRC):
+        crc = ((crc << 8) & 0xFFFF) ^ CRC_TABLE[((crc >> 8) ^ frames[:, column]) & 0xFF]
+    return crc
+
+
+class FrameParser:
+    # Hleda v bajtech binarni ramce z lib/telemetry.py a prevadi je na pole (radky, x + hodnoty).
+    # Rozhrani i pocitadla jsou stejne jako u LineParser (radek = ramec).
+    def __init__(self):
+        self.rest = b''
+        self.lines_ok = 0
+        self.lines_bad = 0
+        self.lines_lost = 0
+        self.labels = None
+        self._last_sequence = None
+        self._text = b''            # text pred prvnim synchronizacnim slovem (None = uz prisel ramec)
+
+    def _take_header(self, data):
+        # Textova hlavicka s popisky se posila pred prvnim ramcem (Telemetry.header()). Hleda se jen
+        # v textu pred prvnim synchronizacnim slovem - v ramcich muzou byt bajty '\n' a '#' kdekoli -
+        # a jen v celych radcich, takze hlavicka rozdelena do vice cteni se slozi.
+        # Vrati bajty od prvniho synchronizacniho slova (b'' = zatim zadne).
+        text = self._text + data
+        sync = text.find(bytes(SYNC))
+        lines = (text if sync < 0 else text[:sync]).split(b'\n')
+        for line in lines[:-1]:
+            if line.startswith(b'#'):
+                self.labels = parse_labels(line)
+        if sync < 0:
+            # Nedokonceny radek (a pripadne prvni bajt synchronizacniho slova) pocka na dalsi data
+            self._text = lines[-1][-HEADER_MAX:]
+            return b''
+        self._text = None
+        return text[sync:]
+
+    def feed(self, data):
+        if self._text is not None:
+            data = self._take_header(data)
+        buffer = np.frombuffer(self.rest + data, dtype=np.uint8)
+        size = len(buffer)
+        starts = np.flatnonzero((buffer[:-1] == SYNC[0]) & (buffer[1:] == SYNC[1]))
+        has_count = starts + 2 < size
+        lengths = np.zeros(len(starts), dtype=np.int64)
+        lengths[has_count] = FRAME_HEADER + 4 * buffer[starts[has_count] + 2].astype(np.int64) + FRAME_CRC
+        complete = has_count & (starts + lengths <= size)
+
+        # Kontrola CRC vsech uplnych kandidatu, po skupinach se stejnou delkou
+        valid = np.zeros(len(starts), dtype=bool)
+        for length in np.unique(lengths[complete]):
+            group = np.flatnonzero(complete & (lengths == length))
+            frames = buffer[starts[group, None] + np.arange(length)]
+            expected = frames[:, -2].astype(np.uint32) | frames[:, -1].astype(np.uint32) << 8
+            valid[group] = frames_crc(frames) == expected
+
+        # Platne ramce se nesmi prekryvat (synchronizacni slovo se muze objevit i uvnitr hodnot)
+        accepted = []
+        end = 0
+        for index in np.flatnonzero(valid):
+            if starts[index] >= end:
+                accepted.append(index)
+                end = starts[index] + lengths[index]
+        accepted = np.array(accepted, dtype=np.int64)
+        inside = np.zeros(len(starts), dtype=bool)
+        if len(accepted):
+            owner = np.searchsorted(starts[accepted], starts, side="right") - 1
+            inside = (owner >= 0) & (starts < (starts[accepted] + lengths[accepted])[np.maximum(owner, 0)])
+        self.lines_bad += int(np.count_nonzero(complete & ~valid & ~inside))
+
+        # Neuplny ramec na konci pocka na dalsi data, ostatni bajty se zahodi
+        pending = np.flatnonzero(~complete & (starts >= end))
+        if len(pending):
+            self.rest = buffer[starts[pending[0]]:].tobytes()
+        else:
+            self.rest = buffer[-1:].tobytes() if size and buffer[-1] == SYNC[0] else b''
+
+        if not len(accepted):
+            return np.empty((0, 2))
+        channels = (lengths[accepted] - FRAME_HEADER - FRAME_CRC) // 4
+        result = np.full((len(accepted), int(channels.max()) + 1), np.nan)
+        sequence = np.empty(len(accepted), dtype=np.int64)
+        for count in np.unique(channels):
+            rows = np.flatnonzero(channels == count)
+            frames = buffer[starts[accepted[rows], None] + np.arange(FRAME_HEADER + 4 * count + FRAME_CRC)]
+            sequence[rows] = frames[:, 3]
+            result[rows, 0] = np.ascontiguousarray(frames[:, 4:8]).view("<u4")[:, 0]
+            result[rows, 1:count + 1] = np.ascontiguousarray(frames[:, FRAME_HEADER:-FRAME_CRC]).view("<f4")
+        if self._last_sequence is not None:
+            sequence = np.concatenate(([self._last_sequence], sequence))
+        self.lines_lost += int(np.sum((np.diff(sequence) - 1) % 256))
+        self._last_sequence = int(sequence[-1])
+        self.lines_ok += len(result)
+        return result
+
+
+class AutoParser:
+    # Pozna z prvnich dat, jestli pico:ed posila binarni ramce nebo text, a pak pouziva jen ten parser.
+    def __init__(self):
+        self.parser = None
+        self._pending = b''
+
+    def __getattr__(self, name):
+        # Pocitadla (lines_ok, lines_bad, lines_lost) a popisky od vybraneho parseru
+        if name.startswith("lines_"):
+            return getattr(self.parser, name) if self.parser else 0
+        if name == "labels":
+            return self.parser.labels if self.parser else None
+        raise AttributeError(name)
+
+    def feed(self, data):
+        if self.parser is not None:
+            return self.parser.feed(data)
+        self._pending += data
+        frames = FrameParser()
+        values = frames.feed(self._pending)
+        if frames.lines_ok:
+            self.parser = frames
+            print("Prijimam binarni ramce (lib/telemetry.py).")
+            return values
+        text = LineParser()
+        values = text.feed(self._pending)
+        if text.lines_ok >= 2 or len(self._pending) > AUTO_PROBE_BYTES:
+            self.parser = text
+            print("Prijimam textove radky.")
+            return values
+        return np.empty((0, 2))
+
+
+def make_parser(protocol):
+    return {"auto": AutoParser, "text": LineParser, "binary": FrameParser}[protocol]()
+
+
+class CaptureWriter:
+    # Zapisuje vzorky do souboru zaznamu. Bloky se sbiraji v pameti a jednou za flush_interval
+    # sekund se zapisou jako jeden usek na konec souboru.
+    def __init__(self, path, flush_interval=DEFAULT_FLUSH):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.rows = 0
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(CAPTURE_MAGIC)
+
+    def write(self, values):
+        if len(values):
+            self._pending.append(values)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        width = max(block.shape[1] for block in self._pending)
+        rows = sum(len(block) for block in self._pending)
+        segment = np.full((rows, width), np.nan, dtype="<f8")
+        row = 0
+        for block in self._pending:
+            segment[row:row + len(block), :block.shape[1]] = block
+            row += len(block)
+        self._pending = []
+        self._file.write(SEGMENT.pack(SEGMENT_MAGIC, rows, width))
+        self._file.write(segment.tobytes())
+        self._file.flush()
+        self.rows += rows
+
+    def write_labels(self, labels):
+        # Popisky z hlavicky se zapisou hned jako samostatny usek.
+        self.flush()
+        text = ",".join(labels).encode("utf-8")
+        self._file.write(SEGMENT.pack(LABELS_MAGIC, len(text), 0))
+        self._file.write(text)
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def capture_segments(path):
+    # Vrati (seznam useku zaznamu jako pole (radky, hodnoty) namapovana primo do souboru, popisky).
+    # Neuplny posledni usek (program spadl pri zapisu) se vynecha.
+    with open(path, "rb") as file:
+        if file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"'{path}' neni zaznam z ploter.py")
+        if os.path.getsize(path) == len(CAPTURE_MAGIC):
+            return [], None
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    segments = []
+    labels = None
+    offset = len(CAPTURE_MAGIC)
+    while offset + SEGMENT.size <= len(data):
+        magic, rows, width = SEGMENT.unpack_from(data, offset)
+        offset += SEGMENT.size
+        if magic == LABELS_MAGIC and offset + rows <= len(data):
+            labels = data[offset:offset + rows].decode("utf-8", errors="replace").split(",")
+            offset += rows
+            continue
+        if magic != SEGMENT_MAGIC or offset + rows * width * 8 > len(data):
+            break
+        segments.append(np.frombuffer(data, dtype="<f8", count=rows * width, offset=offset).reshape(rows, width))
+        offset += rows * width * 8
+    return segments, labels
+
+
+def capture_info(path):
+    # Vypise souhrn zaznamu: pocet radku, rozsah osy x a min/prumer/max kazdeho kanalu.
+    segments, labels = capture_segments(path)
+    rows = sum(len(segment) for segment in segments)
+    print(f"Zaznam '{path}': {rows} radku v {len(segments)} usecich.")
+    labels = labels or []
+    if not rows:
+        return
+    width = max(segment.shape[1] for segment in segments)
+    x_first, x_last = segments[0][0, 0], segments[-1][-1, 0]
+    print(f"{labels[0] if labels else 'x'}: {x_first:g} .. {x_last:g}")
+    for channel in range(1, width):
+        columns = [segment[:, channel] for segment in segments if segment.shape[1] > channel]
+        columns = [column for column in columns if not np.isnan(column).all()]
+        name = labels[channel] if channel < len(labels) else f"kanal {channel}"
+        if not columns:
+            print(f"{name}: bez hodnot")
+            continue
+        low = min(np.nanmin(column) for column in columns)
+        high = max(np.nanmax(column) for column in columns)
+        total = sum(np.nansum(column) for column in columns)
+        count = sum(np.count_nonzero(~np.isnan(column)) for column in columns)
+        print(f"{name}: min {low:g}  prumer {total / max(count, 1):g}  max {high:g}  ({count} hodnot)")
+
+
+class ReplaySource:
+    # Prehrava zaznam rychlosti rate radku za sekundu (0 = vsechno najednou).
+    def __init__(self, path, rate=DEFAULT_RATE):
+        self.segments, self.labels = capture_segments(path)
+        self.total = sum(len(segment) for segment in self.segments)
+        self.rate = rate
+        self.played = 0
+        self._segment = 0
+        self._row = 0
+        self._start = None
+
+    def take(self, count):
+        # Vrati dalsich count radku (nejvic do konce zaznamu) jako jedno pole.
+        parts = []
+        while count > 0 and self._segment < len(self.segments):
+            segment = self.segments[self._segment]
+            part = segment[self._row:self._row + count]
+            parts.append(part)
+            count -= len(part)
+            self._row += len(part)
+            if self._row >= len(segment):
+                self._segment += 1
+                self._row = 0
+        if not parts:
+            return np.empty((0, 2))
+        width = max(part.shape[1] for part in parts)
+        if len(parts) == 1 and parts[0].shape[1] == width:
+            values = parts[0]
+        else:
+            values = np.full((sum(len(part) for part in parts), width), np.nan)
+            row = 0
+            for part in parts:
+                values[row:row + len(part), :part.shape[1]] = part
+                row += len(part)
+        self.played += len(values)
+        return values
+
+    def poll(self):
+        if self._start is None:
+            self._start = time.monotonic()
+        if self.rate <= 0:
+            return self.take(self.total)
+        due = int((time.monotonic() - self._start) * self.rate)
+        return self.take(due - self.played)
+
+    def status(self):
+        return f"prehrano {self.played}/{self.total}"
+
+
+class LiveSource:
+    # Vzorky z serioveho portu (cteci vlakno + parsovani po blocich).
+    def __init__(self, ser, protocol="auto"):
+        self.reader = SerialReader(ser)
+        self.parser = make_parser(protocol)
+        self.reader.start()
+
+    def poll(self):
+        return self.parser.feed(self.reader.drain())
+
+    @property
+    def labels(self):
+        return self.parser.labels
+
+    def status(self):
+        return (f"vadnych {self.parser.lines_bad}  ztracenych {self.parser.lines_lost}  "
+                f"zahozenych {self.reader.lines_dropped}")
+
+    def close(self):
+        self.reader.stop()
+        print(f"Prijato {self.reader.bytes_read} B, {self.parser.lines_ok} radku, "
+              f"vadnych {self.parser.lines_bad}, ztracenych {self.parser.lines_lost}, zahozenych {self.reader.lines_dropped}.")
+
+
+def format_row(row):
+    # Radek zaznamu jako text "x,h1,h2\n". NaN na konci jsou jen doplneni kratsiho radku a vynechaji se;
+    # NaN uprostred se zapise jako "nan" (float() ho precte), aby dalsi hodnoty zustaly ve svem kanalu;
+    # aspon jedna hodnota zustane vzdy, jinak by prijimac radek zahodil jako vadny.
+    present = np.flatnonzero(~np.isnan(row))
+    width = min(max(present[-1] + 1 if len(present) else 0, 2), len(row))
+    return ",".join(f"{value:g}" for value in row[:width]) + "\n"
+
+
+class LoopFeeder(threading.Thread):
+    # Posila zaznam jako textove radky do nahradniho serioveho portu (loop://, pty).
+    def __init__(self, ser, replay):
+        super().__init__(daemon=True)
+        self.ser = ser
+        self.replay = replay
+
+    def run(self):
+        if self.replay.labels:
+            self.ser.write(("# " + ",".join(self.replay.labels) + "\n").encode())
+        while self.replay.played < self.replay.total:
+            values = self.replay.poll()
+            if len(values):
+                self.ser.write("".join(format_row(row) for row in values).encode())
+            time.sleep(0.005)
+
+
+def open_serial(port=None):
+    if port:
+        # Jiny port nebo URL pyserial (loop://, socket://, cesta k pty)
+        ser = serial.serial_for_url(port, 9600, timeout=0.1)
+        print(f"Připojen na {port}. Přijímám data.")
+        return ser
+
+    print("Seznam všech COM portů.")
+    showInfo()
+
+    print("Vyberu a otevřu COM port od připojeného pico:ed-u.")
+    comPortPicoEd = find_com_device(0x2e8a, 0x1026)
+
+    while True:
+        try:
+            ser = serial.Serial(comPortPicoEd, 9600, timeout=0.1)
+        except:
+            print(f"Nemohu otevřít {comPortPicoEd}. Není zapnutý REPL?")
+            sleep(1)
+        else:
+            print(f"Připojen na {ser.name}. Přijímám data.")
+            return ser
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Graf hodnot posilanych z pico:ed-u pres seriovy port.")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help=f"pocet vzorku v grafu (vychozi {DEFAULT_WINDOW})")
+    parser.add_argument("--interval", type=int, default=DEFAULT_INTERVAL, help=f"ms mezi snimky grafu (vychozi {DEFAULT_INTERVAL})")
+    parser.add_argument("--port", help="seriovy port nebo URL pyserial (loop://, cesta k pty); vychozi je pico:ed")
+    parser.add_argument("--protocol", choices=PROTOCOLS, default="auto",
+                        help="format dat z pico:ed-u: text, binary (lib/telemetry.py) nebo auto (vychozi)")
+    parser.add_argument("--record", help="ukladat prijate vzorky do souboru zaznamu")
+    parser.add_argument("--flush", type=float, default=DEFAULT_FLUSH, help=f"s mezi zapisy zaznamu (vychozi {DEFAULT_FLUSH})")
+    parser.add_argument("--replay", help="prehrat soubor zaznamu misto pico:ed-u")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"radku za sekundu pri prehravani (vychozi {DEFAULT_RATE}, 0 = vsechno najednou)")
+    parser.add_argument("--points", type=int, default=DEFAULT_POINTS,
+                        help=f"kolik bodu nejvic kreslit na caru (vychozi {DEFAULT_POINTS}); vic vzorku v okne se zmensi")
+    parser.add_argument("--decimate", choices=DECIMATIONS, default="lttb",
+                        help="jak zmensit radu: lttb (vychozi, tvar krivky) nebo minmax (minimum a maximum useku)")
+    parser.add_argument("--info", action="store_true", help="jen vypsat souhrn zaznamu (s --replay)")
+    args = parser.parse_args()
+
+    if args.info:
+        if not args.replay:
+            parser.error("--info potrebuje --replay")
+        capture_info(args.replay)
+        return
+
+    if args.replay and not args.port:
+        source = ReplaySource(args.replay, args.rate)
+        print(f"Prehravam '{args.replay}' ({source.total} radku).")
     else:
-        print(f"Připojen na {ser.name}. Přijímám data.")
-        break
+        ser = open_serial(args.port)
+        if args.replay:
+            LoopFeeder(ser, ReplaySource(args.replay, args.rate)).start()
+        source = LiveSource(ser, args.protocol)
+    recorder = CaptureWriter(args.record, args.flush) if args.record else None
+    buffer = RingBuffer(args.window)
 
+    fig, ax = plt.subplots()
+    plotter = Plotter(ax, buffer, Decimator(buffer, args.points, args.decimate))
+    stats = ax.text(0.01, 0.99, "", transform=ax.transAxes, va="top", fontsize=8, animated=True)
+    rate = {"time": time.monotonic(), "rows": 0, "text": ""}
 
-x_data = []
-y_data = []
+    def update_plot(frame):
+        values = source.poll()
+        if source.labels and source.labels != plotter.labels:
+            plotter.set_labels(source.labels)
+            if recorder:
+                recorder.write_labels(source.labels)
+        if len(values):
+            buffer.extend(values[:, 0], values[:, 1:].T)
+            rate["rows"] += len(values)
+        if recorder:
+            recorder.write(values)
+        now = time.monotonic()
+        if now - rate["time"] >= 1:
+            rate["text"] = f"{rate['rows'] / (now - rate['time']):.0f} radku/s  {source.status()}"
+            rate.update(time=now, rows=0)
+        stats.set_text(rate["text"])
+        return plotter.update(frame) + [stats]
 
-fig, ax = plt.subplots()
-colors = ['blue', 'green', 'red']
-lines = [ax.plot([], [], lw=2, color=color)[0] for color in colors]
+    # Odkaz na animaci musi zustat, jinak ji garbage collector zrusi
+    ani = animation.FuncAnimation(  # noqa: F841
+        fig, update_plot, init_func=lambda: plotter.init() + [stats],
+        interval=args.interval, blit=True, cache_frame_data=False)
 
-ani = animation.FuncAnimation(fig, update_plot, init_func=init_plot, blit=False, cache_frame_data=False)
+    plt.show()
+    if hasattr(source, "close"):
+        source.close()
+    if recorder:
+        recorder.close()
+        print(f"Zaznam '{recorder.path}': {recorder.rows} radku.")
 
-plt.show()
 
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
 pip install ipympl
 pip install pyserial
+pip install numpy
 pause
@@ -0,0 +1,167 @@
+"""
+buttons.py - debounced button events for pico:ed button_a and button_b.
+
+Instead of reading both buttons with is_pressed()/was_pressed() in every
+pass of the main loop:
+- an asyncio task polls the buttons every poll_ms, debounces them and turns
+  the changes into PRESS, RELEASE and LONG_PRESS events
+- events go into a fixed-size ring buffer (no allocation per event apart
+  from the returned tuple), a full buffer drops new events and counts them
+- the program takes events with get() or waits for them with async for
+
+Works with the built-in picoed buttons on the board and with the stub in
+lib_vsc_only on a PC (where presses can be scripted with Button.inject()
+and Button.click()).
+
+Example:
+    >>> import asyncio, picoed, buttons
+    >>> events = buttons.ButtonEvents((picoed.button_a, picoed.button_b))
+    >>> async def main():
+    ...     events.start()
+    ...     async for button, kind, at_ms in events:
+    ...         if button is picoed.button_a and kind == buttons.PRESS:
+    ...             picoed.led.toggle()
+    >>> asyncio.run(main())
+
+On a PC the stub buttons can be scripted and the service polled without
+the task, stepping the simulated clock:
+    >>> picoed.button_a.click(at_ms=100, hold_ms=900)
+    >>> for _ in range(120):
+    ...     adafruit_ticks.advance_ticks(10)
+    ...     events.poll()
+    >>> [kind for _, kind, _ in iter(events.get, None)]
+    [1, 3, 2]
+"""
+
+import asyncio
+from array import array
+
+from adafruit_ticks import ticks_add, ticks_diff, ticks_ms
+from micropython import const
+
+# Event kinds
+PRESS = const(1)
+RELEASE = const(2)
+LONG_PRESS = const(3)
+
+# State bits of one button
+_RAW = const(0x01)          # last polled state
+_STABLE = const(0x02)       # debounced state
+_LONG_SENT = const(0x04)    # LONG_PRESS of the current press already queued
+
+
+class ButtonEvents:
+    """
+    Button event service - debouncing and a queue of PRESS/RELEASE/LONG_PRESS.
+
+    Args:
+        buttons: tuple of buttons (anything with is_pressed())
+        size (int, optional): Capacity of the event ring buffer. Defaults to 16.
+        poll_ms (int, optional): How often the buttons are read. Defaults to 10.
+        debounce_ms (int, optional): How long a state must not change to
+            count. Defaults to 20.
+        long_press_ms (int, optional): Hold time of a long press.
+            Defaults to 700.
+
+    Attributes:
+        dropped: events dropped because the buffer was full
+    """
+
+    def __init__(self, buttons, size=16, poll_ms=10, debounce_ms=20, long_press_ms=700):
+        self.buttons = tuple(buttons)
+        self.poll_ms = poll_ms
+        self.debounce_ms = debounce_ms
+        self.long_press_ms = long_press_ms
+        self.dropped = 0
+        count = len(self.buttons)
+        self._state = bytearray(count)
+        self._changed_ms = array("L", [0] * count)     # when the raw state last changed
+        self._pressed_ms = array("L", [0] * count)     # when the debounced press started
+        self._size = size
+        self._index = bytearray(size)
+        self._kind = bytearray(size)
+        self._time = array("L", [0] * size)
+        self._head = 0
+        self._count = 0
+        self._ready = asyncio.Event()
+        self._task = None
+
+    def __len__(self):
+        return self._count
+
+    def push(self, index, kind, at_ms):
+        """Queues an event, or drops it and counts it in dropped when the buffer is full"""
+        if self._count == self._size:
+            self.dropped += 1
+            return
+        slot = (self._head + self._count) % self._size
+        self._index[slot] = index
+        self._kind[slot] = kind
+        self._time[slot] = at_ms
+        self._count += 1
+        self._ready.set()
+
+    def get(self):
+        """Returns the oldest event as (button, kind, at_ms), or None"""
+        if not self._count:
+            return None
+        slot = self._head
+        self._head = (slot + 1) % self._size
+        self._count -= 1
+        return (self.buttons[self._index[slot]], self._kind[slot], self._time[slot])
+
+    def poll(self):
+        """Reads and debounces all buttons once (run() calls it every poll_ms)"""
+        now = ticks_ms()
+        for index, button in enumerate(self.buttons):
+            state = self._state[index]
+            raw = _RAW if button.is_pressed() else 0
+            if raw != state & _RAW:
+                state ^= _RAW
+                self._changed_ms[index] = now
+            if bool(state & _RAW) != bool(state & _STABLE) and \
+                    ticks_diff(now, self._changed_ms[index]) >= self.debounce_ms:
+                state ^= _STABLE
+                at_ms = ticks_add(self._changed_ms[index], self.debounce_ms)
+                if state & _STABLE:
+                    self._pressed_ms[index] = at_ms
+                    state &= ~_LONG_SENT
+                    self.push(index, PRESS, at_ms)
+                else:
+                    self.push(index, RELEASE, at_ms)
+            if state & _STABLE and not state & _LONG_SENT and \
+                    ticks_diff(now, self._pressed_ms[index]) >= self.long_press_ms:
+                state |= _LONG_SENT
+                self.push(index, LONG_PRESS, ticks_add(self._pressed_ms[index], self.long_press_ms))
+            self._state[index] = state
+
+    def is_pressed(self, button):
+        """Returns the debounced state of a button"""
+        return bool(self._state[self.buttons.index(button)] & _STABLE)
+
+    async def run(self):
+        """Service loop - polls the buttons every poll_ms"""
+        while True:
+            self.poll()
+            await asyncio.sleep(self.poll_ms / 1000)
+
+    def start(self):
+        """Starts run() as an asyncio task (only once) and returns it"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    def stop(self):
+        """Stops the service task"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._count:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.get()
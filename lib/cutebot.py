@@ -1,11 +1,12 @@
 import time
 import board
 import digitalio
-import pulseio
-import neopixel
-import adafruit_irremote
 from picoed import *
 
+# pulseio, neopixel and adafruit_irremote are imported on first use,
+# so programs that never read the IR remote or drive the rainbow LEDs
+# do not pay for them in boot time and RAM.
+
 class RGB():
     """RGB enum"""
     left = 0x04
@@ -21,27 +22,56 @@ class Unit():
     cm = 1
     inch = 2
 
+# get_tracking() codes indexed by the get_tracking_bits() mask
+_TRACKING_CODES = (0, 1, 10, 11)
+
 class Cutebot():
     """Supports the Pico:ed cutebot by ELECFREAKS"""
 
-    def __init__(self):
+    def __init__(self, defer_init=False):
+        """
+        Init Cutebot
+
+        Args:
+            defer_init (bool, optional): Skip the hardware setup (tracking
+                pins, stopping the motors, turning off the headlights) for a
+                faster start. The tracking pins are set up on the first
+                get_tracking call; call init_hardware to reset the car
+                explicitly. Defaults to False.
+        """
         self._address = 0x10
-        self._tracking_pin_L = digitalio.DigitalInOut(board.P13)
-        self._tracking_pin_L.direction = digitalio.Direction.INPUT
-        self._tracking_pin_R = digitalio.DigitalInOut(board.P14)
-        self._tracking_pin_R.direction = digitalio.Direction.INPUT
+        self._tracking_pin_L = None
+        self._tracking_pin_R = None
         self.distance = 0
+        self._rainbow_leds = None
+        # Motor commands reuse these buffers, so set_speed does not allocate
+        self._left_buffer = bytearray([0x01, 0, 0, 0])
+        self._right_buffer = bytearray([0x02, 0, 0, 0])
+        if not defer_init:
+            self.init_hardware()
+
+    def init_hardware(self):
+        """Set up the tracking pins, stop the motors and turn off the headlights"""
+        # The pins may already exist (second call, or a lazy get_tracking);
+        # creating them again would fail on the device with "P13 in use"
+        if self._tracking_pin_L is None:
+            self._init_tracking_pins()
         self.set_speed(0, 0)
         self.set_light(RGB.left, 0, 0, 0)
         self.set_light(RGB.right, 0, 0, 0)
-        self._rainbow_leds = None
+
+    def _init_tracking_pins(self):
+        self._tracking_pin_L = digitalio.DigitalInOut(board.P13)
+        self._tracking_pin_L.direction = digitalio.Direction.INPUT
+        self._tracking_pin_R = digitalio.DigitalInOut(board.P14)
+        self._tracking_pin_R.direction = digitalio.Direction.INPUT
 
     def set_speed(self, left_speed, right_speed):
         """Set the speed of the car's left wheel and right wheel"""
         if left_speed > 100 or left_speed < -100 or right_speed > 100 or right_speed < -100:
             raise ValueError('speed error,-100~100')
-        left_buffer = bytearray([0x01, 0, 0, 0])
-        right_buffer = bytearray([0x02, 0, 0, 0])
+        left_buffer = self._left_buffer
+        right_buffer = self._right_buffer
         if left_speed > 0:
             left_buffer[1] = 0x02
             left_buffer[2] = left_speed
@@ -77,6 +107,7 @@ class Cutebot():
 
     def get_distance(self, unit:Unit):
         """Gets the distance detected by ultrasound"""
+        import pulseio
         _ultrasonic_trig = digitalio.DigitalInOut(board.P8)
         _ultrasonic_trig.direction = digitalio.Direction.OUTPUT
         _ultrasonic_trig.value = True
@@ -113,16 +144,19 @@ class Cutebot():
 
     def get_tracking(self):
         """Gets the status of the patrol sensor"""
-        left_value = self._tracking_pin_L.value
-        right_value = self._tracking_pin_R.value
-        if left_value and right_value:
-            return 11
-        elif not left_value and right_value:
-            return 10
-        elif left_value and not right_value:
-            return 1
-        elif not left_value and not right_value:
-            return 0
+        return _TRACKING_CODES[self.get_tracking_bits()]
+
+    def get_tracking_bits(self):
+        """
+        Gets the status of the patrol sensor as a bitmask
+
+        Returns:
+            int: bit 0 is the left sensor, bit 1 the right sensor
+                (0-3, the same states as 0, 1, 10 and 11 from get_tracking)
+        """
+        if self._tracking_pin_L is None:
+            self._init_tracking_pins()
+        return self._tracking_pin_L.value | (self._tracking_pin_R.value << 1)
 
     def set_servo(self, servo_num:Servo, angle):
         """Set servo angle"""
@@ -143,6 +177,8 @@ class Cutebot():
             i2c.unlock()
 
     def get_ir_value(self):
+        import pulseio
+        import adafruit_irremote
         pulsein = pulseio.PulseIn(board.P16, maxlen=120, idle_state=True)
         decoder = adafruit_irremote.GenericDecode()
         pulses = decoder.read_pulses(pulsein)
@@ -217,5 +253,6 @@ class Cutebot():
                 immediately change when set. If False, `show` must be called
                 explicitly.. Defaults to True.
         """
+        import neopixel
         self._rainbow_leds = neopixel.NeoPixel(
             board.P15, 2, brightness=brightness, auto_write=auto_write)
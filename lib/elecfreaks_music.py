@@ -38,6 +38,136 @@ _MIDDLE_SHARPS_FREQUENCIES = [
     const(415),
 ]
 
+# Packed melody format (elecfreaks_music.bin):
+#   header  b"EFM\x01", tune count, then count + 1 little-endian uint16 offsets
+#   note    one byte: bits 0-2 note (a-g = 0-6, 7 = rest), bit 3 sharp,
+#           bit 4 octave follows, bit 5 duration follows; when bit 4 or 5 is
+#           set, a second byte holds the octave (low nibble) and duration (high nibble)
+_TUNE_FILE = __file__[:__file__.rfind("elecfreaks_music")] + "elecfreaks_music.bin"
+_TUNE_MAGIC = b"EFM\x01"
+_TUNE_OFFSETS = const(5)
+_NOTE_REST = const(7)
+_NOTE_SHARP = const(0x08)
+_NOTE_OCTAVE = const(0x10)
+_NOTE_DURATION = const(0x20)
+_NOTE_EXTRA = const(0x30)
+
+
+# Only the most recently used melody is kept in RAM, together with the last
+# note looked up by index and its byte position, so a loop over
+# range(len(tune)) reads the file once and scans the bytes once
+_cached_tune = -1
+_cached_data = b""
+_cursor_note = 0
+_cursor_position = 0
+
+
+def _tune_data(tune):
+    """Returns the packed notes of a built-in melody (only the last one used stays cached)."""
+    global _cached_tune, _cached_data, _cursor_note, _cursor_position
+    if tune != _cached_tune:
+        with open(_TUNE_FILE, "rb") as file:
+            if file.read(4) != _TUNE_MAGIC:
+                raise ValueError("elecfreaks_music.bin has an unexpected format.")
+            file.seek(_TUNE_OFFSETS + 2 * tune)
+            offsets = file.read(4)
+            start = offsets[0] | offsets[1] << 8
+            file.seek(start)
+            _cached_data = file.read((offsets[2] | offsets[3] << 8) - start)
+        _cached_tune = tune
+        _cursor_note = 0
+        _cursor_position = 0
+    return _cached_data
+
+
+def _tune_note(data, position):
+    """Decodes the packed note at position into a note in the musical DSL."""
+    code = data[position]
+    note = "r" if code & 7 == _NOTE_REST else "abcdefg"[code & 7]
+    if code & _NOTE_SHARP:
+        note += "#"
+    if code & _NOTE_EXTRA:
+        extra = data[position + 1]
+        if code & _NOTE_OCTAVE:
+            note += str(extra & 0x0F)
+        if code & _NOTE_DURATION:
+            note += ":" + str(extra >> 4)
+    return note
+
+
+def _tune_notes(data):
+    """Decodes packed notes into a list of notes in the musical DSL."""
+    notes = []
+    position = 0
+    while position < len(data):
+        notes.append(_tune_note(data, position))
+        position += 2 if data[position] & _NOTE_EXTRA else 1
+    return notes
+
+
+class _Tune:
+    """A built-in melody stored in elecfreaks_music.bin.
+
+    It still behaves like the list of note strings the built-in melodies
+    used to be (``len``, indexing, slicing, iteration and ``+`` work), but
+    the notes are read from flash only when the melody is used, and indexing
+    or iterating decodes one note at a time. `Music.play` plays it straight
+    from the packed bytes without creating any strings.
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+    def notes(self):
+        """Returns the melody as a new list of notes in the musical DSL."""
+        return _tune_notes(_tune_data(self.index))
+
+    def __len__(self):
+        data = _tune_data(self.index)
+        count = 0
+        position = 0
+        while position < len(data):
+            position += 2 if data[position] & _NOTE_EXTRA else 1
+            count += 1
+        return count
+
+    def __getitem__(self, key):
+        global _cursor_note, _cursor_position
+        if isinstance(key, slice):
+            return self.notes()[key]
+        if key < 0:
+            key += len(self)
+        data = _tune_data(self.index)
+        if key < 0:
+            raise IndexError("tune index out of range")
+        if key < _cursor_note:
+            _cursor_note = 0
+            _cursor_position = 0
+        # Walk forward from the last looked-up note
+        note = _cursor_note
+        position = _cursor_position
+        while note < key and position < len(data):
+            position += 2 if data[position] & _NOTE_EXTRA else 1
+            note += 1
+        if position >= len(data):
+            raise IndexError("tune index out of range")
+        _cursor_note = note
+        _cursor_position = position
+        return _tune_note(data, position)
+
+    def __iter__(self):
+        data = _tune_data(self.index)
+        position = 0
+        while position < len(data):
+            yield _tune_note(data, position)
+            position += 2 if data[position] & _NOTE_EXTRA else 1
+
+    def __add__(self, other):
+        return self.notes() + list(other)
+
+    def __radd__(self, other):
+        return list(other) + self.notes()
+
 
 class Music:
     """
@@ -49,89 +179,31 @@ class Music:
     :param int bpm: Beats per minute. Defaults to 120.
     """
 
-    DADADADUM = ["r4:2", "g", "g", "g", "eb:8", "r:2", "f", "f", "f", "d:8"]
-    ENTERTAINER = [
-        "d4:1", "d#", "e", "c5:2", "e4:1", "c5:2", "e4:1", "c5:3",
-        "c:1", "d", "d#", "e", "c", "d", "e:2", "b4:1", "d5:2", "c:4"
-    ]
-    PRELUDE = [
-        "c4:1", "e", "g", "c5", "e", "g4", "c5", "e", "c4", "e", "g", "c5",
-        "e", "g4", "c5", "e", "c4", "d", "g", "d5", "f", "g4", "d5", "f",
-        "c4", "d", "g", "d5", "f", "g4", "d5", "f", "b3", "d4", "g", "d5",
-        "f", "g4", "d5", "f", "b3", "d4", "g", "d5", "f", "g4", "d5", "f",
-        "c4", "e", "g", "c5", "e", "g4", "c5", "e", "c4", "e", "g", "c5",
-        "e", "g4", "c5", "e"
-    ]
-    ODE = [
-        "e4", "e", "f", "g", "g", "f", "e", "d", "c", "c", "d", "e",
-        "e:6", "d:2", "d:8", "e:4", "e", "f", "g", "g", "f", "e",
-        "d", "c", "c", "d", "e", "d:6", "c:2", "c:8"
-    ]
-    NYAN = [
-        "f#5:2", "g#", "c#:1", "d#:2", "b4:1", "d5:1", "c#", "b4:2", "b",
-        "c#5", "d", "d:1", "c#", "b4:1", "c#5:1", "d#", "f#", "g#", "d#",
-        "f#", "c#", "d", "b4", "c#5", "b4", "d#5:2", "f#", "g#:1", "d#",
-        "f#", "c#", "d#", "b4", "d5", "d#", "d", "c#", "b4", "c#5", "d:2",
-        "b4:1", "c#5", "d#", "f#", "c#", "d", "c#", "b4", "c#5:2", "b4",
-        "c#5", "b4", "f#:1", "g#", "b:2", "f#:1", "g#", "b", "c#5", "d#",
-        "b4", "e5", "d#", "e", "f#", "b4:2", "b", "f#:1", "g#", "b", "f#",
-        "e5", "d#", "c#", "b4", "f#", "d#", "e", "f#", "b:2", "f#:1", "g#",
-        "b:2", "f#:1", "g#", "b", "b", "c#5", "d#", "b4", "f#", "g#", "f#",
-        "b:2", "b:1", "a#", "b", "f#", "g#", "b", "e5", "d#", "e", "f#",
-        "b4:2", "c#5"
-    ]
-    RINGTONE = [
-        "c4:1", "d", "e:2", "g", "d:1", "e", "f:2", "a", "e:1", "f", "g:2",
-        "b", "c5:4"
-    ]
-    FUNK = [
-        "c2:2", "c", "d#", "c:1", "f:2", "c:1", "f:2", "f#", "g", "c", "c",
-        "g", "c:1", "f#:2", "c:1", "f#:2", "f", "d#"
-    ]
-    BLUES = [
-        "c2:2", "e", "g", "a", "a#", "a", "g", "e", "c2:2", "e", "g", "a",
-        "a#", "a", "g", "e", "f", "a", "c3", "d", "d#", "d", "c", "a2",
-        "c2:2", "e", "g", "a", "a#", "a", "g", "e", "g", "b", "d3", "f",
-        "f2", "a", "c3", "d#", "c2:2", "e", "g", "e", "g", "f", "e", "d"
-    ]
-    BIRTHDAY = [
-        "c4:3", "c:1", "d:4", "c:4", "f", "e:8", "c:3", "c:1", "d:4", "c:4",
-        "g", "f:8", "c:3", "c:1", "c5:4", "a4", "f", "e", "d", "a#:3", "a#:1",
-        "a:4", "f", "g", "f:8"
-    ]
-    WEDDING = [
-        "c4:4", "f:3", "f:1", "f:8", "c:4", "g:3", "e:1", "f:8", "c:4", "f:3",
-        "a:1", "c5:4", "a4:3", "f:1", "f:4", "e:3", "f:1", "g:8"
-    ]
-    FUNERAL = [
-        "c3:4", "c:3", "c:1", "c:4", "d#:3", "d:1", "d:3", "c:1", "c:3",
-        "b2:1", "c3:4"
-    ]
-    PUNCHLINE = [
-        "c4:3", "g3:1", "f#", "g", "g#:3", "g", "r", "b", "c4"
-    ]
-    PYTHON = [
-        "d5:1", "b4", "r", "b", "b", "a#", "b", "g5", "r", "d", "d", "r",
-        "b4", "c5", "r", "c", "c", "r", "d", "e:5", "c:1", "a4", "r",
-        "a", "a", "g#", "a", "f#5", "r", "e", "e", "r", "c", "b4", "r",
-        "b", "b", "r", "c5", "d:5", "d:1", "b4", "r", "b", "b", "a#",
-        "b", "b5", "r", "g", "g", "r", "d", "c#", "r", "a", "a", "r",
-        "a", "a:5", "g:1", "f#:2", "a:1", "a", "g#", "a", "e:2", "a:1",
-        "a", "g#", "a", "d", "r", "c#", "d", "r", "c#", "d:2", "r:3"
-    ]
-    BADDY = ["c3:3", "r", "d:2", "d#", "r", "c", "r", "f#:8"]
-    CHASE = [
-        "a4:1", "b", "c5", "b4", "a:2", "r", "a:1", "b", "c5", "b4",
-        "a:2", "r", "a:2", "e5", "d#", "e", "f", "e", "d#", "e", "b4:1",
-        "c5", "d", "c", "b4:2", "r", "b:1", "c5", "d", "c", "b4:2", "r",
-        "b:2", "e5", "d#", "e", "f", "e", "d#", "e",
-    ]
-    BA_DING = ["b5:1", "e6:3"]
-    WAWAWAWAA = ["e3:3", "r:1", "d#:3", "r:1", "d:4", "r:1", "c#:8"]
-    JUMP_UP = ["c5:1", "d", "e", "f", "g"]
-    JUMP_DOWN = ["g5:1", "f", "e", "d", "c"]
-    POWER_UP = ["g4:1", "c5", "e", "g:2", "e:1", "g:3"]
-    POWER_DOWN = ["g5:1", "d#", "c", "g4:2", "b:1", "c5:3"]
+    # The built-in melodies are packed into elecfreaks_music.bin (see .vscode/music_pack.py);
+    # each attribute is a list-like handle with the melody's index in it. The notes are read
+    # from flash the first time they are used, so importing the library creates no note
+    # strings on the heap.
+    DADADADUM = _Tune(0)
+    ENTERTAINER = _Tune(1)
+    PRELUDE = _Tune(2)
+    ODE = _Tune(3)
+    NYAN = _Tune(4)
+    RINGTONE = _Tune(5)
+    FUNK = _Tune(6)
+    BLUES = _Tune(7)
+    BIRTHDAY = _Tune(8)
+    WEDDING = _Tune(9)
+    FUNERAL = _Tune(10)
+    PUNCHLINE = _Tune(11)
+    PYTHON = _Tune(12)
+    BADDY = _Tune(13)
+    CHASE = _Tune(14)
+    BA_DING = _Tune(15)
+    WAWAWAWAA = _Tune(16)
+    JUMP_UP = _Tune(17)
+    JUMP_DOWN = _Tune(18)
+    POWER_UP = _Tune(19)
+    POWER_DOWN = _Tune(20)
 
     def __init__(self, pin, ticks=4, bpm=120):
         self._ticks = ticks
@@ -219,6 +291,32 @@ class Music:
 
         return [frequency, self._duration * (60000 / self._bpm / self._ticks)]
 
+    def _packed_frequency(self, code, extra):
+        if code & _NOTE_OCTAVE:
+            self._octave = extra & 0x0F
+        if code & _NOTE_DURATION:
+            self._duration = extra >> 4
+        note_index = code & 7
+        if note_index == _NOTE_REST:
+            return 0
+        shift_count = self._octave - 4
+        if code & _NOTE_SHARP:
+            frequency = _MIDDLE_SHARPS_FREQUENCIES[note_index]
+        else:
+            frequency = _MIDDLE_FREQUENCIES[note_index]
+        if shift_count > 0:
+            return frequency << shift_count
+        return frequency >> -shift_count
+
+    @staticmethod
+    def tune_notes(tune):
+        """Returns a built-in melody as a list of notes in the musical DSL,
+        e.g. ``Music.tune_notes(Music.BA_DING)`` gives ``["b5:1", "e6:3"]``.
+
+        :param tune: A built-in melody such as `Music.NYAN`.
+        """
+        return tune.notes()
+
     def set_tempo(self, ticks=4, bpm=120):
         """Sets the approximate tempo for playback.
 
@@ -236,13 +334,28 @@ class Music:
     def play(self, music):
         """Plays a melody.
 
-        :param music: The musical DSL.
+        :param music: The musical DSL, or a built-in melody such as `Music.NYAN`.
         """
         self._octave = 4
         self._duration = 4
 
+        if isinstance(music, _Tune):
+            # Built-in melody: decode the packed notes directly, no strings
+            data = _tune_data(music.index)
+            position = 0
+            while position < len(data):
+                code = data[position]
+                if code & _NOTE_EXTRA:
+                    frequency = self._packed_frequency(code, data[position + 1])
+                    position += 2
+                else:
+                    frequency = self._packed_frequency(code, 0)
+                    position += 1
+                self.pitch(frequency, self._duration * (60000 / self._bpm / self._ticks))
+            return
+
         if not isinstance(music, (list, str)):
-            raise TypeError("the music type must be a list or string.")
+            raise TypeError("the music type must be a list, string or built-in melody.")
 
         if isinstance(music, str):
             frequency_duration = self._get_frequency_duration(music)
@@ -259,14 +372,31 @@ class Music:
     async def play_async(self, music):
         """Asynchronously plays a melody.
 
-        :param music: The musical DSL.
+        :param music: The musical DSL, or a built-in melody such as `Music.NYAN`.
         """
         self._octave = 4
         self._duration = 4
         self._playing = True
 
+        if isinstance(music, _Tune):
+            data = _tune_data(music.index)
+            position = 0
+            while position < len(data) and self._playing:
+                code = data[position]
+                if code & _NOTE_EXTRA:
+                    frequency = self._packed_frequency(code, data[position + 1])
+                    position += 2
+                else:
+                    frequency = self._packed_frequency(code, 0)
+                    position += 1
+                await self.pitch_async(
+                    frequency, self._duration * (60000 / self._bpm / self._ticks)
+                )
+            self._playing = False
+            return
+
         if not isinstance(music, (list, str)):
-            raise TypeError("the music type must be a list or string.")
+            raise TypeError("the music type must be a list, string or built-in melody.")
 
         if isinstance(music, str):
             frequency_duration = self._get_frequency_duration(music)
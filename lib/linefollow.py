@@ -0,0 +1,204 @@
+"""
+linefollow.py - line following with the Cutebot using an integer PID controller.
+
+Instead of a hand-written loop with get_tracking(), an if/elif chain and two set_speed():
+- both line sensors are read at once as a bit mask (get_tracking_bits())
+  and the deviation from the line is looked up in a table
+- the PID uses integers only (the gains are converted to fixed point when
+  the follower is created), so one control step allocates nothing
+- the loop runs on deadlines with a fixed period_ms, so the derivative and
+  the integral do not depend on how long the previous step took
+- motor speeds are sent over I2C only when they actually change
+- report() returns the real loop rate, the delay behind deadlines (jitter)
+  and the number of motor writes
+
+Deviation (positive = the line is to the right, the robot should turn right):
+    both sensors on the line   0
+    only left on the line     -1
+    only right on the line    +1
+    line lost                 +-2 by the side where it was last seen
+
+Example:
+    >>> import cutebot, linefollow
+    >>> robot = cutebot.Cutebot()
+    >>> follower = linefollow.LineFollower(robot, speed=40, kp=25, kd=40)
+    >>> follower.run(20_000)       # drive for 20 s, then stop
+    >>> print(follower.report())
+"""
+
+import time
+
+from adafruit_ticks import ticks_add, ticks_diff, ticks_ms
+from micropython import const
+
+_SHIFT = const(8)           # fixed-point gains: 1.0 = 256
+_LOST = const(2)            # deviation when both sensors lose the line
+# Deviation by the get_tracking_bits() mask (bit 0 left, bit 1 right sensor on the line);
+# mask 0 (line lost) is resolved from the last known side
+_ERRORS = (0, -1, 1, 0)
+
+
+def _fixed(gain):
+    return int(gain * (1 << _SHIFT) + (0.5 if gain >= 0 else -0.5))
+
+
+class LineFollower:
+    """
+    Line follower: a PID controller over the two Cutebot line sensors.
+
+    Args:
+        robot: Cutebot instance (needs set_speed and get_tracking_bits).
+        speed (int, optional): Base speed of both wheels (0-100). Defaults to 40.
+        kp, ki, kd (optional): PID gains (wheel speed per unit of deviation);
+            converted to integers with a step of 1/256. Default to 25, 0, 30.
+        period_ms (int, optional): Control loop period in ms. Defaults to 10.
+        integral_limit (int, optional): Limit of the summed deviation
+            (against integral windup). Defaults to 50.
+        invert (bool, optional): True if the sensor reports the line as 0
+            (light line). Defaults to False.
+
+    Attributes:
+        loops: number of control steps done
+        writes: number of set_speed calls (motor writes over I2C)
+        overruns: number of missed deadlines
+        max_late_ms: largest delay of a step behind its deadline in ms
+    """
+
+    def __init__(self, robot, speed=40, kp=25, ki=0, kd=30, period_ms=10,
+                 integral_limit=50, invert=False):
+        if not 0 <= speed <= 100:
+            raise ValueError("speed must be 0-100")
+        if period_ms < 1:
+            raise ValueError("period_ms must be >= 1")
+        self.robot = robot
+        self.speed = speed
+        self.period_ms = period_ms
+        self.integral_limit = integral_limit
+        self._kp = _fixed(kp)
+        self._ki = _fixed(ki)
+        self._kd = _fixed(kd)
+        self._flip = 3 if invert else 0
+        self.reset()
+
+    def reset(self):
+        """Resets the controller state and the statistics (run() calls it too)"""
+        self._error = 0
+        self._side = 1          # side where the line was last seen (-1 left, +1 right)
+        self._integral = 0
+        self._left = None       # last speeds sent
+        self._right = None
+        self._deadline = None
+        self._started = 0
+        self._late_sum = 0
+        self.loops = 0
+        self.writes = 0
+        self.overruns = 0
+        self.max_late_ms = 0
+
+    def _read_error(self):
+        bits = self.robot.get_tracking_bits() ^ self._flip
+        if bits:
+            error = _ERRORS[bits]
+            if error:
+                self._side = error
+            return error
+        return _LOST * self._side
+
+    def step(self):
+        """
+        One control step: reads the sensors, computes the PID and sends the
+        speeds if they changed. Returns the deviation.
+        """
+        error = self._read_error()
+        integral = self._integral + error
+        if integral > self.integral_limit:
+            integral = self.integral_limit
+        elif integral < -self.integral_limit:
+            integral = -self.integral_limit
+        self._integral = integral
+        output = (self._kp * error + self._ki * integral + self._kd * (error - self._error)) >> _SHIFT
+        self._error = error
+
+        left = self.speed + output
+        right = self.speed - output
+        if left > 100:
+            left = 100
+        elif left < -100:
+            left = -100
+        if right > 100:
+            right = 100
+        elif right < -100:
+            right = -100
+        if left != self._left or right != self._right:
+            self.robot.set_speed(left, right)
+            self._left = left
+            self._right = right
+            self.writes += 1
+        self.loops += 1
+        return error
+
+    def poll(self):
+        """
+        Does a control step when the deadline has come, otherwise nothing.
+
+        Returns the number of ms until the next deadline (0 = step due now).
+        """
+        now = ticks_ms()
+        if self._deadline is None:
+            self._deadline = now
+            self._started = now
+        late = ticks_diff(now, self._deadline)
+        if late < 0:
+            return -late
+        if late >= self.period_ms:
+            # Missed deadlines are not caught up, only counted
+            missed = late // self.period_ms
+            self.overruns += missed
+            self._deadline = ticks_add(self._deadline, missed * self.period_ms)
+            late -= missed * self.period_ms
+        self._late_sum += late
+        if late > self.max_late_ms:
+            self.max_late_ms = late
+        self.step()
+        self._deadline = ticks_add(self._deadline, self.period_ms)
+        return max(0, ticks_diff(self._deadline, ticks_ms()))
+
+    def stop(self):
+        """Stops the motors"""
+        self.robot.set_speed(0, 0)
+        self._left = 0
+        self._right = 0
+        self.writes += 1
+
+    def run(self, duration_ms=None, should_stop=None):
+        """
+        Follows the line until duration_ms passes (None = no limit) or
+        should_stop() returns True, then stops the motors.
+
+        Args:
+            duration_ms (int, optional): How long to drive in ms.
+            should_stop (optional): Function without arguments, called after
+                every step.
+        """
+        self.reset()
+        start = ticks_ms()
+        try:
+            while duration_ms is None or ticks_diff(ticks_ms(), start) < duration_ms:
+                wait = self.poll()
+                if should_stop is not None and should_stop():
+                    break
+                if wait:
+                    time.sleep(wait / 1000)
+        finally:
+            self.stop()
+
+    def loop_rate(self):
+        """Real control loop rate in Hz (since the first step)"""
+        elapsed = ticks_diff(ticks_ms(), self._started)
+        return self.loops * 1000 / elapsed if elapsed > 0 else 0
+
+    def report(self):
+        """Returns a text summary: loop rate, delay behind deadlines and motor writes"""
+        mean_late = self._late_sum / self.loops if self.loops else 0
+        return "loop {:.1f} Hz ({} steps), late mean {:.2f} ms max {} ms, overruns {}, motor writes {}".format(
+            self.loop_rate(), self.loops, mean_late, self.max_late_ms, self.overruns, self.writes)
@@ -0,0 +1,182 @@
+"""
+motion.py - smooth starts and stops (trapezoidal profile) for the Cutebot and the Ring:bit.
+
+Instead of a step change of set_speed() (the wheels slip) or a loop with
+time.sleep() (blocks the program and floods the bus):
+- for a "drive for N ms" or "turn for N ms" move a table of speeds is
+  computed up front: speed-up with acceleration accel, constant speed,
+  stop; a short move never reaches the top speed (triangular profile)
+- speeds are sampled at most rate_hz times per second and equal
+  consecutive values are merged, so driving at constant speed is one write
+- the table is played back as an asyncio task (like Music.play_async()),
+  so the program can do something else meanwhile
+- works through set_speed(), so with both Cutebot and Ringbit; the number
+  of writes (set_speed calls) of every move is known up front and reported
+
+On the Cutebot one write is a pair of I2C transfers (left and right wheel),
+on the Ring:bit a pair of PWM changes.
+
+Example:
+    >>> import asyncio, cutebot, motion
+    >>> player = motion.MotionPlayer(cutebot.Cutebot(), accel=200, rate_hz=50)
+    >>> async def main():
+    ...     await player.play(player.drive(60, 1500))
+    ...     await player.play(player.turn(40, 600))
+    ...     print(player.report())
+    >>> asyncio.run(main())
+"""
+
+import asyncio
+from array import array
+
+DEFAULT_ACCEL = 200         # speed change of 200 (%/s): from 0 to 50 in 250 ms
+DEFAULT_RATE_HZ = 50        # at most 50 speed writes per second
+
+
+class Profile:
+    """
+    Precomputed table of speeds of one move.
+
+    Args:
+        left, right (int): Target speed of the left and right wheel (-100 to 100).
+        duration_ms (int): Length of the whole move including speed-up and stop.
+        accel (optional): Acceleration of the faster wheel in speed units per
+            second. Defaults to DEFAULT_ACCEL.
+        rate_hz (optional): Highest number of speed changes per second.
+            Defaults to DEFAULT_RATE_HZ.
+        stop (bool, optional): True = stop at the end (speed 0, 0).
+            Defaults to True.
+
+    Attributes:
+        left, right: array of wheel speeds for the individual writes
+        hold_ms: array of how long (ms) the speed from the same row holds
+        duration_ms: length of the move
+        steps: how many writes there would be when writing every sample
+    """
+
+    def __init__(self, left, right, duration_ms, accel=DEFAULT_ACCEL, rate_hz=DEFAULT_RATE_HZ, stop=True):
+        if left > 100 or left < -100 or right > 100 or right < -100:
+            raise ValueError("speed must be -100~100")
+        if duration_ms < 1:
+            raise ValueError("duration_ms must be >= 1")
+        if accel <= 0 or rate_hz <= 0:
+            raise ValueError("accel and rate_hz must be > 0")
+        period = max(1, 1000 // rate_hz)
+        top = max(abs(left), abs(right)) or 1
+        # In one ms the faster wheel may change by accel / 1000, i.e. this share of the target speed:
+        ramp = accel / 1000 / top
+        self.duration_ms = duration_ms
+        self.steps = 0
+        self.left = array("b")
+        self.right = array("b")
+        self.hold_ms = array("L")       # a merged constant-speed run can last over 65 s
+        start = 0
+        while start < duration_ms:
+            hold = min(period, duration_ms - start)
+            middle = start + hold / 2
+            scale = min(1, ramp * middle, ramp * (duration_ms - middle))
+            self._append(round(left * scale), round(right * scale), hold)
+            self.steps += 1
+            start += hold
+        if stop:
+            self._append(0, 0, 0)
+
+    def _append(self, left, right, hold):
+        # Same speed as in the previous row: just extend its time
+        if len(self.left) and self.left[-1] == left and self.right[-1] == right:
+            self.hold_ms[-1] += hold
+            return
+        self.left.append(left)
+        self.right.append(right)
+        self.hold_ms.append(hold)
+
+    @property
+    def writes(self):
+        """Number of speed writes (set_speed calls) the move needs"""
+        return len(self.left)
+
+
+class MotionPlayer:
+    """
+    Plays moves with a smooth start and stop.
+
+    Args:
+        robot: Cutebot or Ringbit (anything with set_speed(left, right)).
+        accel (optional): Default acceleration for drive(), turn() and move().
+            Defaults to DEFAULT_ACCEL.
+        rate_hz (optional): Default highest number of speed changes per
+            second. Defaults to DEFAULT_RATE_HZ.
+
+    Attributes:
+        writes: number of all set_speed calls since creation
+        last_writes: number of set_speed calls of the last played move
+        moves: number of played moves
+    """
+
+    def __init__(self, robot, accel=DEFAULT_ACCEL, rate_hz=DEFAULT_RATE_HZ):
+        self.robot = robot
+        self.accel = accel
+        self.rate_hz = rate_hz
+        self.writes = 0
+        self.last_writes = 0
+        self.moves = 0
+        self._steps = 0
+        self._task = None
+
+    def move(self, left, right, duration_ms, stop=True):
+        """Returns the Profile of a move with target speeds of both wheels"""
+        return Profile(left, right, duration_ms, self.accel, self.rate_hz, stop)
+
+    def drive(self, speed, duration_ms, stop=True):
+        """Returns the Profile of driving straight (negative speed = backwards)"""
+        return self.move(speed, speed, duration_ms, stop)
+
+    def turn(self, speed, duration_ms, stop=True):
+        """Returns the Profile of turning on the spot (positive speed = right)"""
+        return self.move(speed, -speed, duration_ms, stop)
+
+    async def play(self, profile):
+        """
+        Plays a move (asyncio, does not block other tasks).
+
+        Returns the number of set_speed calls the move needed.
+        """
+        set_speed = self.robot.set_speed
+        left = profile.left
+        right = profile.right
+        hold_ms = profile.hold_ms
+        written = 0
+        elapsed = 0
+        try:
+            for i in range(len(left)):
+                set_speed(left[i], right[i])
+                written += 1
+                if hold_ms[i]:
+                    await asyncio.sleep(hold_ms[i] / 1000)
+                    elapsed += hold_ms[i]
+        finally:
+            # A cancelled move counts in the comparison only for the played part
+            self.writes += written
+            self.last_writes = written
+            self.moves += 1
+            self._steps += -(-elapsed * profile.steps // profile.duration_ms)
+        return written
+
+    def start(self, profile):
+        """Starts play(profile) as an asyncio task and returns it (cancels the previous move)"""
+        self.cancel()
+        self._task = asyncio.create_task(self.play(profile))
+        return self._task
+
+    def cancel(self):
+        """Cancels a running move started with start() and stops the wheels"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            self.robot.set_speed(0, 0)
+            self.writes += 1
+        self._task = None
+
+    def report(self):
+        """Returns a text summary: moves and speed writes against writing every sample"""
+        return "moves {}, speed writes {} (writing every sample would be {}), last move {}".format(
+            self.moves, self.writes, self._steps, self.last_writes)
@@ -0,0 +1,202 @@
+"""
+sampler.py - samples the Cutebot sensors at a fixed rate and sends them to ploter.py.
+
+Instead of a hand-written loop with get_tracking(), get_distance() and print():
+- samples are taken on deadlines at a fixed period_ms, so one late
+  measurement does not shift all the following ones
+- measured values go into a preallocated ring buffer (array), so sampling
+  allocates no strings or lists
+- the samples are sent to ploter.py as binary frames from lib/telemetry.py,
+  only in the spare time before the next deadline and in batches of at
+  least batch samples
+- counts missed deadlines (overruns) and samples that were not sent in
+  time and were overwritten by newer ones in a full buffer (dropped)
+
+Sensors are given by name or as a pair (label, function without arguments):
+    "tracking" - robot.get_tracking() (11, 10, 1, 0)
+    "distance" - robot.get_distance(Unit.cm); an ultrasonic measurement
+                 takes several ms, so it limits the highest possible rate
+
+Example:
+    >>> import cutebot, sampler
+    >>> robot = cutebot.Cutebot()
+    >>> s = sampler.Sampler(robot, ("tracking", "distance"), period_ms=20)
+    >>> s.run(10_000)              # 10 s of sampling, plot: python .vscode/ploter.py
+    >>> print(s.report())
+"""
+
+import time
+from array import array
+
+from adafruit_ticks import ticks_add, ticks_diff, ticks_ms
+
+import telemetry
+
+
+class Sampler:
+    """
+    Samples the selected sensors at a fixed rate into a ring buffer.
+
+    Args:
+        robot: Cutebot instance (may be None when only custom functions are used).
+        sensors (optional): Sensor names or (label, function) pairs.
+            Defaults to ("tracking",).
+        period_ms (int, optional): Sampling period in ms. Defaults to 10.
+        capacity (int, optional): How many samples fit in the buffer before
+            they start being overwritten. Defaults to 64.
+        batch (int, optional): How many samples must be waiting before
+            sending starts. Defaults to 8.
+        stream (optional): Where the frames go (default see telemetry.Telemetry).
+        binary (bool, optional): True = binary frames, False = text
+            "x,v1,v2\\n". Defaults to True.
+
+    Attributes:
+        samples: number of samples taken
+        sent: number of samples sent
+        overruns: number of missed deadlines (samples never taken)
+        dropped: number of taken samples overwritten in a full buffer
+        max_late_ms: largest delay of a sample behind its deadline in ms
+    """
+
+    def __init__(self, robot, sensors=("tracking",), period_ms=10, capacity=64, batch=8,
+                 stream=None, binary=True):
+        if period_ms < 1:
+            raise ValueError("period_ms must be >= 1")
+        if not 1 <= batch <= capacity:
+            raise ValueError("batch must be 1-capacity")
+        self.labels = ["ms"]
+        self._readers = []
+        for sensor in sensors:
+            if isinstance(sensor, str):
+                self.labels.append(sensor)
+                self._readers.append(self._sensor_reader(robot, sensor))
+            else:
+                self.labels.append(sensor[0])
+                self._readers.append(sensor[1])
+        self.channels = len(self._readers)
+        self.period_ms = period_ms
+        self.capacity = capacity
+        self.batch = batch
+        self.telemetry = telemetry.Telemetry(self.channels, stream, binary)
+        self._x = array("L", [0] * capacity)
+        self._values = array("f", [0.0] * (capacity * self.channels))
+        self._row = [0.0] * self.channels
+        self._head = 0          # index of the oldest unsent sample
+        self._count = 0         # number of unsent samples in the buffer
+        self._deadline = None
+        self._send_ms = 0       # how many ms sending one sample took last time
+        self.samples = 0
+        self.sent = 0
+        self.overruns = 0
+        self.dropped = 0
+        self.max_late_ms = 0
+
+    @staticmethod
+    def _sensor_reader(robot, name):
+        if name == "tracking":
+            return robot.get_tracking
+        if name == "distance":
+            from cutebot import Unit
+            unit = Unit.cm
+            return lambda: robot.get_distance(unit)
+        raise ValueError("unknown sensor, use 'tracking', 'distance' or (label, function)")
+
+    @property
+    def pending(self):
+        """Number of taken samples still waiting to be sent"""
+        return self._count
+
+    def start(self):
+        """Sends the label header for ploter.py and schedules the first sample for now"""
+        self.telemetry.header(self.labels)
+        self._deadline = ticks_ms()
+
+    def _sample(self, now):
+        if self._count == self.capacity:
+            # The buffer is full: the oldest unsent sample is overwritten
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+            self.dropped += 1
+        slot = (self._head + self._count) % self.capacity
+        self._x[slot] = now
+        base = slot * self.channels
+        values = self._values
+        for i, read in enumerate(self._readers):
+            values[base + i] = read()
+        self._count += 1
+        self.samples += 1
+
+    def _send_one(self):
+        start = ticks_ms()
+        slot = self._head
+        base = slot * self.channels
+        row = self._row
+        for i in range(self.channels):
+            row[i] = self._values[base + i]
+        self.telemetry.send(self._x[slot], row)
+        self._head = (slot + 1) % self.capacity
+        self._count -= 1
+        self.sent += 1
+        self._send_ms = ticks_diff(ticks_ms(), start)
+
+    def poll(self):
+        """
+        One step without waiting: takes a sample when the deadline has come,
+        otherwise sends waiting samples in the spare time.
+
+        Returns the number of ms until the next deadline (0 = already due).
+        """
+        if self._deadline is None:
+            self.start()
+        now = ticks_ms()
+        late = ticks_diff(now, self._deadline)
+        if late >= 0:
+            if late >= self.period_ms:
+                # Missed deadlines are not caught up, only counted
+                missed = late // self.period_ms
+                self.overruns += missed
+                self._deadline = ticks_add(self._deadline, missed * self.period_ms)
+                late -= missed * self.period_ms
+            if late > self.max_late_ms:
+                self.max_late_ms = late
+            self._sample(now)
+            self._deadline = ticks_add(self._deadline, self.period_ms)
+            now = ticks_ms()
+        # Send only in batches and only what fits before the next deadline;
+        # on a slow link overwriting the buffer is better than missing a sample
+        if self._count >= self.batch:
+            if self._count == self.capacity and ticks_diff(self._deadline, now) <= self._send_ms:
+                # Not a single sample fits before the deadline: send one anyway so sending never stalls
+                self._send_one()
+                now = ticks_ms()
+            while self._count and ticks_diff(self._deadline, now) > self._send_ms:
+                self._send_one()
+                now = ticks_ms()
+        return max(0, ticks_diff(self._deadline, now))
+
+    def flush(self):
+        """Sends all waiting samples (regardless of deadlines)"""
+        while self._count:
+            self._send_one()
+
+    def run(self, duration_ms):
+        """
+        Samples for duration_ms milliseconds, sleeps between deadlines and
+        finally sends the rest.
+
+        Args:
+            duration_ms (int): How long to sample in ms.
+        """
+        self.start()
+        end = ticks_add(self._deadline, duration_ms)
+        while ticks_diff(end, self._deadline) > 0:
+            # poll() already sent what fit before the deadline; sleep the rest
+            wait = self.poll()
+            if wait:
+                time.sleep(wait / 1000)
+        self.flush()
+
+    def report(self):
+        """Returns a text summary (print it after sampling so it does not mix with the frames)"""
+        return "samples {}, sent {}, overruns {}, dropped {}, max late {} ms".format(
+            self.samples, self.sent, self.overruns, self.dropped, self.max_late_ms)
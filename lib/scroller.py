@@ -0,0 +1,223 @@
+"""
+scroller.py - non-blocking text scrolling for the pico:ed LED display.
+
+The built-in picoed.display.scroll() renders the text again on every call
+and blocks the program until the whole message has passed. This module:
+- renders a string once into a column bitmap (a bytearray, one byte per
+  display column, bit 0 = top row) and keeps recently used strings in a
+  small LRU cache
+- scrolls one column per frame as an asyncio task, so the main loop keeps
+  running while a status message moves across the display
+- draws through display.pixel() and only writes the pixels that differ
+  from the previous frame, so each frame costs as few I2C writes as possible
+
+Works with the built-in picoed.display on the board and with the stub in
+lib_vsc_only on a PC.
+
+Example:
+    >>> import asyncio, picoed, scroller
+    >>> text = scroller.Scroller(picoed.display)
+    >>> async def main():
+    ...     text.start("Ready")
+    ...     while True:
+    ...         ...                  # the main loop keeps running
+    ...         await asyncio.sleep(0)
+    >>> asyncio.run(main())
+"""
+
+import asyncio
+
+# 5x7 font for ASCII 32-126: 5 columns per character, bit 0 = top row
+_FONT = (
+    b"\x00\x00\x00\x00\x00\x00\x00\x5f\x00\x00\x00\x07\x00\x07\x00\x14\x7f\x14\x7f\x14"
+    b"\x24\x2a\x7f\x2a\x12\x23\x13\x08\x64\x62\x36\x49\x55\x22\x50\x00\x05\x03\x00\x00"
+    b"\x00\x1c\x22\x41\x00\x00\x41\x22\x1c\x00\x08\x2a\x1c\x2a\x08\x08\x08\x3e\x08\x08"
+    b"\x00\x50\x30\x00\x00\x08\x08\x08\x08\x08\x00\x60\x60\x00\x00\x20\x10\x08\x04\x02"
+    b"\x3e\x51\x49\x45\x3e\x00\x42\x7f\x40\x00\x42\x61\x51\x49\x46\x21\x41\x45\x4b\x31"
+    b"\x18\x14\x12\x7f\x10\x27\x45\x45\x45\x39\x3c\x4a\x49\x49\x30\x01\x71\x09\x05\x03"
+    b"\x36\x49\x49\x49\x36\x06\x49\x49\x29\x1e\x00\x36\x36\x00\x00\x00\x56\x36\x00\x00"
+    b"\x08\x14\x22\x41\x00\x14\x14\x14\x14\x14\x00\x41\x22\x14\x08\x02\x01\x51\x09\x06"
+    b"\x32\x49\x79\x41\x3e\x7e\x11\x11\x11\x7e\x7f\x49\x49\x49\x36\x3e\x41\x41\x41\x22"
+    b"\x7f\x41\x41\x22\x1c\x7f\x49\x49\x49\x41\x7f\x09\x09\x09\x01\x3e\x41\x49\x49\x7a"
+    b"\x7f\x08\x08\x08\x7f\x00\x41\x7f\x41\x00\x20\x40\x41\x3f\x01\x7f\x08\x14\x22\x41"
+    b"\x7f\x40\x40\x40\x40\x7f\x02\x0c\x02\x7f\x7f\x04\x08\x10\x7f\x3e\x41\x41\x41\x3e"
+    b"\x7f\x09\x09\x09\x06\x3e\x41\x51\x21\x5e\x7f\x09\x19\x29\x46\x46\x49\x49\x49\x31"
+    b"\x01\x01\x7f\x01\x01\x3f\x40\x40\x40\x3f\x1f\x20\x40\x20\x1f\x3f\x40\x38\x40\x3f"
+    b"\x63\x14\x08\x14\x63\x07\x08\x70\x08\x07\x61\x51\x49\x45\x43\x00\x7f\x41\x41\x00"
+    b"\x02\x04\x08\x10\x20\x00\x41\x41\x7f\x00\x04\x02\x01\x02\x04\x40\x40\x40\x40\x40"
+    b"\x00\x01\x02\x04\x00\x20\x54\x54\x54\x78\x7f\x48\x44\x44\x38\x38\x44\x44\x44\x20"
+    b"\x38\x44\x44\x48\x7f\x38\x54\x54\x54\x18\x08\x7e\x09\x01\x02\x0c\x52\x52\x52\x3e"
+    b"\x7f\x08\x04\x04\x78\x00\x44\x7d\x40\x00\x20\x40\x44\x3d\x00\x7f\x10\x28\x44\x00"
+    b"\x00\x41\x7f\x40\x00\x7c\x04\x18\x04\x78\x7c\x08\x04\x04\x78\x38\x44\x44\x44\x38"
+    b"\x7c\x14\x14\x14\x08\x08\x14\x14\x18\x7c\x7c\x08\x04\x04\x08\x48\x54\x54\x54\x20"
+    b"\x04\x3f\x44\x40\x20\x3c\x40\x40\x20\x7c\x1c\x20\x40\x20\x1c\x3c\x40\x30\x40\x3c"
+    b"\x44\x28\x10\x28\x44\x0c\x50\x50\x50\x3c\x44\x64\x54\x4c\x44\x00\x08\x36\x41\x00"
+    b"\x00\x00\x7f\x00\x00\x00\x41\x36\x08\x00\x08\x04\x08\x10\x08"
+)
+_FONT_FIRST = 32
+_FONT_LAST = 126
+_GLYPH_WIDTH = 5
+_UNKNOWN = 0xFF             # shown column state before the first draw: every row is rewritten
+
+
+def render(text):
+    """Renders text into display columns (one byte per column, unknown characters as '?')"""
+    columns = bytearray((_GLYPH_WIDTH + 1) * len(text))
+    pos = 0
+    for char in text:
+        code = ord(char)
+        if code < _FONT_FIRST or code > _FONT_LAST:
+            code = ord("?")
+        start = (code - _FONT_FIRST) * _GLYPH_WIDTH
+        columns[pos:pos + _GLYPH_WIDTH] = _FONT[start:start + _GLYPH_WIDTH]
+        pos += _GLYPH_WIDTH + 1
+    return columns
+
+
+class ColumnCache:
+    """
+    LRU cache of rendered texts.
+
+    Args:
+        maxsize (int, optional): How many texts to keep; 0 renders every
+            time. Defaults to 8.
+
+    Attributes:
+        hits: texts found in the cache
+        misses: texts rendered
+    """
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = {}
+        # Most recently used text last; a plain dict does not keep
+        # insertion order on CircuitPython, so the order is kept here
+        self._order = []
+
+    def get(self, text):
+        """Returns the columns of text from the cache, rendering them on a miss"""
+        columns = self._items.get(text)
+        if columns is not None:
+            self.hits += 1
+            self._order.remove(text)
+            self._order.append(text)
+            return columns
+        self.misses += 1
+        columns = render(text)
+        if self.maxsize > 0:
+            if len(self._order) >= self.maxsize:
+                del self._items[self._order.pop(0)]
+            self._items[text] = columns
+            self._order.append(text)
+        return columns
+
+    def clear(self):
+        """Forgets all cached texts"""
+        self._items.clear()
+        self._order.clear()
+
+
+class Scroller:
+    """
+    Scrolls text across the display as an asyncio task.
+
+    Args:
+        display: picoed.display (anything with width, height and
+            pixel(x, y, color))
+        delay_ms (int, optional): Time per frame (one column). Defaults to 80.
+        cache_size (int, optional): How many rendered texts to keep.
+            Defaults to 8.
+
+    Attributes:
+        cache: the ColumnCache of rendered texts
+        pixel_writes: pixels written to the display so far
+    """
+
+    def __init__(self, display, delay_ms=80, cache_size=8):
+        self.display = display
+        self.delay_ms = delay_ms
+        self.cache = ColumnCache(cache_size)
+        self.pixel_writes = 0
+        # Column bits currently on the display (_UNKNOWN = not drawn by us yet)
+        self._shown = bytearray([_UNKNOWN]) * display.width
+        self._brightness = None
+        self._task = None
+
+    def clear(self):
+        """Turns the display off and forgets what was drawn"""
+        self.display.fill(0)
+        for x in range(len(self._shown)):
+            self._shown[x] = 0
+
+    def show(self, value, brightness=30):
+        """Shows text from the left edge (what does not fit is cut off)"""
+        self.draw(self.cache.get(str(value)), 0, brightness)
+
+    def draw(self, columns, offset, brightness=30):
+        """
+        Draws columns[offset:offset + width] and writes only the changed pixels
+
+        Columns outside columns are blank, so a negative offset starts the
+        text off the right edge.
+        """
+        display = self.display
+        shown = self._shown
+        restyle = brightness != self._brightness
+        self._brightness = brightness
+        count = len(columns)
+        for x in range(len(shown)):
+            index = offset + x
+            bits = columns[index] if 0 <= index < count else 0
+            old = shown[x]
+            if old == _UNKNOWN:
+                changed = 0xFF
+            elif restyle:
+                # Lit pixels must be rewritten with the new brightness
+                changed = bits | old
+            else:
+                changed = bits ^ old
+            if not changed:
+                continue
+            for y in range(display.height):
+                if changed >> y & 1:
+                    display.pixel(x, y, brightness if bits >> y & 1 else 0)
+                    self.pixel_writes += 1
+            shown[x] = bits
+
+    def frames(self, value, brightness=30):
+        """Generator that draws one scroll frame per step (the caller waits between them)"""
+        columns = self.cache.get(str(value))
+        for offset in range(-self.display.width, len(columns)):
+            self.draw(columns, offset, brightness)
+            yield offset
+
+    async def scroll(self, value, brightness=30, delay_ms=None):
+        """Scrolls text right to left once, one column every delay_ms"""
+        if delay_ms is None:
+            delay_ms = self.delay_ms
+        for _ in self.frames(value, brightness):
+            await asyncio.sleep(delay_ms / 1000)
+
+    def start(self, value, brightness=30, delay_ms=None):
+        """
+        Starts scroll() as an asyncio task and returns it
+
+        A message that is still scrolling is cancelled, the display always
+        shows just one.
+        """
+        self.cancel()
+        self._task = asyncio.create_task(self.scroll(value, brightness, delay_ms))
+        return self._task
+
+    def cancel(self):
+        """Cancels the running scroll started by start()"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    @property
+    def scrolling(self):
+        """True while a scroll started by start() is running"""
+        return self._task is not None and not self._task.done()
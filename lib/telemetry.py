@@ -0,0 +1,144 @@
+"""
+telemetry.py - sends measured values from the pico:ed to ploter.py.
+
+Instead of the text "x,value,value\\n" the values are sent in binary frames:
+- the frame is assembled in a preallocated bytearray, so sending a sample
+  creates no strings or other objects on the heap
+- the frame is shorter than the text (4 bytes per value) and the PC does
+  not have to parse text
+- the sync word and CRC let the receiver find the start of a frame and
+  drop corrupted frames, the sequence number shows lost frames
+
+Frame layout (little endian), n = number of channels:
+    0   2 B   sync word 0xA5 0x5A
+    2   1 B   number of channels n
+    3   1 B   frame sequence number (0-255, then from 0 again)
+    4   4 B   x as uint32 (typically ticks_ms() from adafruit_ticks)
+    8   4n B  channel values as float32
+    8+4n 2 B  CRC-16/CCITT (poly 0x1021, initial 0xFFFF) of bytes 2 to 8+4n
+
+Text mode (binary=False) sends the same values as "x,v1,v2\\n", ploter.py
+reads both. A text line "# x,left,right\\n" (header()) names the x axis
+and the channels in ploter.py.
+
+Example:
+    >>> import telemetry
+    >>> tele = telemetry.Telemetry(2)
+    >>> tele.header(("ms", "distance", "sensor"))
+    >>> values = [0.0, 0.0]
+    >>> values[0] = robot.get_distance(cutebot.Unit.cm)
+    >>> values[1] = sensor.value
+    >>> tele.send(ticks_ms(), values)
+"""
+
+import struct
+from array import array
+
+from micropython import const
+
+SYNC_0 = const(0xA5)
+SYNC_1 = const(0x5A)
+_HEADER = const(8)
+_CRC_SIZE = const(2)
+MAX_CHANNELS = const(255)
+
+
+def _crc_table():
+    table = array("H", bytes(512))
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+        table[byte] = crc & 0xFFFF
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def crc16(buffer, start, end):
+    """
+    Returns the CRC-16/CCITT (poly 0x1021, initial value 0xFFFF) of buffer[start:end].
+
+    Computed without taking a slice (no allocation).
+    """
+    crc = 0xFFFF
+    table = _CRC_TABLE
+    for index in range(start, end):
+        crc = ((crc << 8) & 0xFFFF) ^ table[((crc >> 8) ^ buffer[index]) & 0xFF]
+    return crc
+
+
+class Telemetry:
+    """
+    Sends samples to ploter.py.
+
+    Args:
+        channels (int): Number of values in a sample (without x), 1-255.
+        stream (optional): Where the frames are written (anything with
+            write(bytes)). Defaults to usb_cdc.data; when the data port is
+            not enabled in boot.py, usb_cdc.console is used and the
+            telemetry switches to text mode, because binary frames would
+            end up in the REPL. ploter.py without --port reads the same
+            port (the data port if there is one, otherwise the console).
+        binary (bool, optional): True = binary frames, False = text
+            "x,v1,v2\\n". Defaults to True.
+
+    Attributes:
+        frames_sent: number of samples sent
+    """
+
+    def __init__(self, channels, stream=None, binary=True):
+        if not 1 <= channels <= MAX_CHANNELS:
+            raise ValueError("channels must be 1-255")
+        if stream is None:
+            import usb_cdc
+            stream = usb_cdc.data
+            if stream is None:
+                # Only the console - binary frames would garble the REPL
+                stream = usb_cdc.console
+                binary = False
+        self.channels = channels
+        self.stream = stream
+        self.binary = binary
+        self.frames_sent = 0
+        self._frame = bytearray(_HEADER + 4 * channels + _CRC_SIZE)
+        self._frame[0] = SYNC_0
+        self._frame[1] = SYNC_1
+        self._frame[2] = channels
+        self._crc_end = _HEADER + 4 * channels
+
+    def send(self, x, values):
+        """
+        Sends one sample.
+
+        Args:
+            x (int): Value on the x axis (0 to 2^32-1, e.g. ticks_ms()).
+            values: List (or array) with at least channels values; reusing
+                one prepared list keeps binary sending allocation-free.
+        """
+        if not self.binary:
+            self.stream.write((str(x) + "," + ",".join(str(values[i]) for i in range(self.channels)) + "\n").encode())
+            self.frames_sent += 1
+            return
+        frame = self._frame
+        frame[3] = self.frames_sent & 0xFF
+        struct.pack_into("<I", frame, 4, x & 0xFFFFFFFF)
+        for i in range(self.channels):
+            struct.pack_into("<f", frame, _HEADER + 4 * i, values[i])
+        crc = crc16(frame, 2, self._crc_end)
+        frame[self._crc_end] = crc & 0xFF
+        frame[self._crc_end + 1] = crc >> 8
+        self.stream.write(frame)
+        self.frames_sent += 1
+
+    def header(self, labels):
+        """
+        Sends the label header, ploter.py uses it to name the x axis and lines.
+
+        Args:
+            labels: Labels - the x axis first, then the channels in the order
+                of the values (e.g. ("ms", "left", "right")); send it before
+                the first sample.
+        """
+        self.stream.write(("# " + ",".join(labels) + "\n").encode())
@@ -0,0 +1,200 @@
+"""
+adafruit_irremote.py – společný stub pro VS Code a fake hardware pro testy.
+
+Tento modul napodobuje knihovnu `adafruit_irremote`, která dekóduje
+pulzy z IR přijímače (načtené přes pulseio.PulseIn) na bajty kódu.
+
+V této verzi:
+- dekódování je stejné jako v knihovně (třídění pulzů do „binů“,
+  mark/space podle délky, skládání bitů do bajtů), takže se dá
+  na PC měřit a profilovat
+- čekání (time.sleep) posouvá simulovaný čas adafruit_ticks
+- pulzy se čtou z fake PulseIn, typicky ze zdroje pulseio.NecSource
+- když skript kláves skončí, blokující read_pulses() vyvolá
+  RuntimeError, místo aby čekal věčně
+
+Reálná knihovna `adafruit_irremote` se na pico:ed nahrává do /lib.
+Tento soubor slouží pro výuku, vývoj a testování.
+"""
+
+import adafruit_ticks as ticks
+
+
+class IRDecodeException(Exception):
+    """Pulzy se nepodařilo dekódovat."""
+
+
+class IRNECRepeatException(Exception):
+    """Přijat NEC kód pro opakování (držená klávesa)."""
+
+
+def _sleep(seconds):
+    """Fake time.sleep – posune simulovaný čas."""
+    ticks.advance_ticks(int(seconds * 1000))
+
+
+class GenericDecode:
+    """
+    Fake verze dekodéru GenericDecode.
+
+    V reálném zařízení:
+        - read_pulses() čeká na dávku pulzů z PulseIn
+        - decode_bits() převede pulzy na seznam bajtů
+
+    V této fake verzi:
+        - algoritmus dekódování odpovídá knihovně
+        - čekání posouvá simulovaný čas místo blokování
+    """
+
+    @staticmethod
+    def bin_data(pulses):
+        """
+        Roztřídí pulzy do skupin podobné délky (±25 %).
+
+        Vrací seznam [průměrná_délka, počet] pro každou skupinu.
+        """
+        bins = [[pulses[0], 0]]
+        for pulse in pulses:
+            for pulse_bin in bins:
+                if pulse_bin[0] * 0.75 <= pulse <= pulse_bin[0] * 1.25:
+                    pulse_bin[0] = (pulse_bin[0] + pulse) // 2
+                    pulse_bin[1] += 1
+                    break
+            else:
+                bins.append([pulse, 1])
+        return bins
+
+    def decode_bits(self, pulses):
+        """
+        Dekóduje pulzy na seznam bajtů.
+
+        Stejně jako knihovna zahodí úvodní hlavičku, krátké pulzy
+        považuje za 1 a dlouhé za 0 a bity skládá od nejvyššího.
+
+        Vyvolá IRNECRepeatException pro NEC opakování
+        a IRDecodeException, pokud pulzy nedávají smysl.
+        """
+        num_pulses = len(pulses)
+        if num_pulses < 10:
+            if num_pulses == 3 and 8000 < pulses[0] < 10000 \
+                    and 2000 < pulses[1] < 3000:
+                raise IRNECRepeatException()
+            raise IRDecodeException("10 pulses minimum")
+
+        # Zahodíme hlavičku (mark + space, nebo jen space)
+        pulses = pulses[1:]
+        if num_pulses % 2 == 1:
+            pulses = pulses[1:]
+
+        evens = pulses[0::2]
+        odds = pulses[1::2]
+        even_bins = self.bin_data(evens)
+        odd_bins = self.bin_data(odds)
+
+        outliers = [b[0] for b in (even_bins + odd_bins) if b[1] == 1]
+        even_bins = [b for b in even_bins if b[1] > 1]
+        odd_bins = [b for b in odd_bins if b[1] > 1]
+
+        if not even_bins or not odd_bins:
+            raise IRDecodeException("Not enough data")
+
+        if len(even_bins) == 1:
+            pulses = odds
+            pulse_bins = odd_bins
+        elif len(odd_bins) == 1:
+            pulses = evens
+            pulse_bins = even_bins
+        else:
+            raise IRDecodeException("Both even/odd pulses differ")
+
+        if len(pulse_bins) == 1:
+            raise IRDecodeException("Pulses do not differ")
+        if len(pulse_bins) > 2:
+            raise IRDecodeException("Only mark & space handled")
+
+        mark = min(pulse_bins[0][0], pulse_bins[1][0])
+        space = max(pulse_bins[0][0], pulse_bins[1][0])
+
+        if outliers:
+            # Zahodíme pulzy, které patří k osamělé skupině (např. trailer)
+            pulses = [
+                p for p in pulses
+                if not (outliers[0] * 0.75) <= p <= (outliers[0] * 1.25)
+            ]
+
+        bits = []
+        for pulse_length in pulses:
+            if (space * 0.75) <= pulse_length <= (space * 1.25):
+                bits.append(False)
+            elif (mark * 0.75) <= pulse_length <= (mark * 1.25):
+                bits.append(True)
+            else:
+                raise IRDecodeException("Pulses outside mark/space")
+
+        output = [0] * ((len(bits) + 7) // 8)
+        for i, bit in enumerate(bits):
+            output[i // 8] = output[i // 8] << 1
+            if bit:
+                output[i // 8] |= 1
+        return output
+
+    def _read_pulses_non_blocking(self, input_pulses, max_pulse=10000,
+                                  pulse_window=0.10):
+        """
+        Přečte dávku pulzů, dokud během pulse_window nepřijde nic nového.
+
+        Vrátí seznam pulzů nebo None, pokud nic nepřišlo.
+        """
+        received = None
+        recent_count = 0
+        pruning = False
+        while True:
+            while input_pulses:
+                pulse = input_pulses.popleft()
+                recent_count += 1
+                if pulse > max_pulse:
+                    if received is None:
+                        continue
+                    pruning = True
+                    break
+                if received is None:
+                    received = []
+                received.append(pulse)
+
+            if pruning:
+                # Zbytek po příliš dlouhém pulzu zahodíme
+                input_pulses.clear()
+                return received
+
+            if recent_count == 0:
+                return received
+            recent_count = 0
+            _sleep(pulse_window)
+
+    def read_pulses(self, input_pulses, *, max_pulse=10000, blocking=True,
+                    pulse_window=0.10, blocking_delay=0.10):
+        """
+        Přečte dávku pulzů z PulseIn.
+
+        Parametry:
+            input_pulses   – objekt PulseIn
+            max_pulse      – delší pulzy ukončí dávku
+            blocking       – čekat, dokud nějaké pulzy nepřijdou
+            pulse_window   – ticho, které ukončí dávku (s)
+            blocking_delay – prodleva mezi pokusy při blokujícím čtení (s)
+
+        V této fake verzi blokující čtení vyvolá RuntimeError, pokud
+        zdroj pulzů už nic nepošle (skončil skript kláves).
+        """
+        while True:
+            pulses = self._read_pulses_non_blocking(
+                input_pulses, max_pulse, pulse_window
+            )
+            if blocking and pulses is None:
+                if getattr(input_pulses, "exhausted", False):
+                    raise RuntimeError(
+                        "fake IR: zdroj pulzů je vyčerpaný (skončil skript kláves)"
+                    )
+                _sleep(blocking_delay)
+                continue
+            return pulses
@@ -0,0 +1,9 @@
+"""
+adafruit_motor – společný stub pro VS Code a fake hardware pro testy.
+
+Balíček napodobuje knihovnu `adafruit_motor`. Zatím obsahuje jen modul
+`servo`, který potřebuje lib/ringbit.py.
+
+Reálná knihovna `adafruit_motor` se na pico:ed nahrává do /lib.
+Tento soubor slouží pro výuku, vývoj a testování.
+"""
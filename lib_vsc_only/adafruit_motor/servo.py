@@ -0,0 +1,137 @@
+"""
+servo.py – společný stub pro VS Code a fake hardware pro testy.
+
+Tento modul napodobuje `adafruit_motor.servo`, který převádí úhel
+nebo rychlost serva na duty_cycle PWM výstupu.
+
+V této verzi:
+- převod na duty_cycle počítá stejně jako knihovna (stejná zaokrouhlení),
+  takže fake pwmio.PWMOut dostane přesně ty hodnoty jako na zařízení
+- každá zapsaná hodnota duty_cycle se uloží do `duty_log`
+  (array 'H' – 2 bajty na zápis, vhodné i pro dlouhé simulace)
+- funguje s fake pwmio.PWMOut i s čímkoli, co má atributy
+  frequency a duty_cycle
+
+Reálná knihovna `adafruit_motor` se na pico:ed nahrává do /lib.
+Tento soubor slouží pro výuku, vývoj a testování.
+"""
+
+from array import array
+
+
+class _BaseServo:
+    """
+    Společný základ serv – převod podílu 0.0–1.0 na duty_cycle.
+
+    Parametry:
+        pwm_out   – PWM výstup (typicky 50 Hz)
+        min_pulse – délka pulzu pro podíl 0.0 v µs
+        max_pulse – délka pulzu pro podíl 1.0 v µs
+
+    Atributy:
+        duty_log – všechny zapsané hodnoty duty_cycle (array 'H')
+    """
+
+    def __init__(self, pwm_out, *, min_pulse=750, max_pulse=2250):
+        self._pwm_out = pwm_out
+        self.duty_log = array("H")
+        self.set_pulse_width_range(min_pulse, max_pulse)
+
+    def set_pulse_width_range(self, min_pulse=750, max_pulse=2250):
+        """Změní rozsah délky pulzu (v µs)."""
+        self._min_duty = int((min_pulse * self._pwm_out.frequency) / 1000000 * 0xFFFF)
+        max_duty = (max_pulse * self._pwm_out.frequency) / 1000000 * 0xFFFF
+        self._duty_range = int(max_duty - self._min_duty)
+
+    @property
+    def fraction(self):
+        """
+        Podíl rozsahu pulzu 0.0–1.0, nebo None, pokud je PWM vypnuté.
+        """
+        if self._pwm_out.duty_cycle == 0:  # Special case for disabled servos
+            return None
+        return (self._pwm_out.duty_cycle - self._min_duty) / self._duty_range
+
+    @fraction.setter
+    def fraction(self, value):
+        if value is None:
+            self._write_duty(0)  # disable the motor
+            return
+        if not 0.0 <= value <= 1.0:
+            raise ValueError("Must be 0.0 to 1.0")
+        self._write_duty(self._min_duty + int(value * self._duty_range))
+
+    def _write_duty(self, duty_cycle):
+        """Zapíše duty_cycle do PWM a uloží ho do duty_log."""
+        self._pwm_out.duty_cycle = duty_cycle
+        self.duty_log.append(duty_cycle)
+
+
+class Servo(_BaseServo):
+    """
+    Fake verze standardního serva (úhel 0–actuation_range).
+
+    Parametry:
+        pwm_out          – PWM výstup
+        actuation_range  – rozsah úhlu ve stupních
+        min_pulse        – délka pulzu pro 0° v µs
+        max_pulse        – délka pulzu pro actuation_range v µs
+    """
+
+    def __init__(self, pwm_out, *, actuation_range=180, min_pulse=750,
+                 max_pulse=2250):
+        super().__init__(pwm_out, min_pulse=min_pulse, max_pulse=max_pulse)
+        self.actuation_range = actuation_range
+
+    @property
+    def angle(self):
+        """Úhel serva ve stupních, nebo None, pokud je PWM vypnuté."""
+        if self.fraction is None:  # special case for disabled servos
+            return None
+        return self.actuation_range * self.fraction
+
+    @angle.setter
+    def angle(self, new_angle):
+        if new_angle is None:  # disable the servo by sending 0 signal
+            self.fraction = None
+            return
+        if new_angle < 0 or new_angle > self.actuation_range:
+            raise ValueError("Angle out of range")
+        self.fraction = new_angle / self.actuation_range
+
+
+class ContinuousServo(_BaseServo):
+    """
+    Fake verze serva s plynulou rotací (Ring:bit kola).
+
+    V reálném zařízení:
+        - throttle -1.0 až 1.0 určuje rychlost a směr otáčení
+        - 0.0 je střed rozsahu pulzu (servo stojí)
+
+    V této fake verzi:
+        - throttle se převede na duty_cycle stejně jako v knihovně
+        - zápis se uloží do PWMOut i do duty_log
+    """
+
+    @property
+    def throttle(self):
+        """Rychlost -1.0 (plně vzad) až 1.0 (plně vpřed)."""
+        return self.fraction * 2 - 1
+
+    @throttle.setter
+    def throttle(self, value):
+        if value > 1.0 or value < -1.0:
+            raise ValueError("Throttle must be between -1.0 and 1.0")
+        if value is None:
+            raise ValueError("Continuous servos cannot spin freely")
+        self.fraction = (value + 1) / 2
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.throttle = 0
+
+    def deinit(self):
+        """Zastaví servo."""
+        self.throttle = 0
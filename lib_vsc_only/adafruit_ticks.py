@@ -30,6 +30,9 @@ _TICKS_HALFPERIOD = _TICKS_PERIOD // 2
 # Interní simulovaný čas (v milisekundách)
 # Testy mohou měnit tuto hodnotu pomocí set_ticks_ms()
 _fake_ticks = 0
+# Zbytek simulovaného času pod 1 ms (v mikrosekundách, 0–999)
+# Posouvá ho advance_ticks_us(), např. model ceny operací (costmodel)
+_fake_us = 0
 
 
 # ---------------------------------------------------------
@@ -119,8 +122,9 @@ def set_ticks_ms(value: int) -> None:
         >>> ticks.ticks_ms()
         500
     """
-    global _fake_ticks
+    global _fake_ticks, _fake_us
     _fake_ticks = int(value)
+    _fake_us = 0
 
 
 def advance_ticks(delta: int) -> None:
@@ -137,3 +141,34 @@ def advance_ticks(delta: int) -> None:
     """
     global _fake_ticks
     _fake_ticks = (_fake_ticks + int(delta)) % _TICKS_PERIOD
+
+
+def advance_ticks_us(delta: int) -> None:
+    """
+    Posune simulovaný čas o delta mikrosekund.
+
+    Zlomky milisekundy se neztrácí – hromadí se ve zbytku a ticks_ms()
+    se posune, až zbytek přesáhne celou milisekundu. Díky tomu lze
+    sčítat krátké operace (např. I2C přenos trvá desítky µs).
+
+    Příklad:
+        >>> ticks.set_ticks_ms(0)
+        >>> for _ in range(4):
+        ...     ticks.advance_ticks_us(300)
+        >>> ticks.ticks_ms()
+        1
+    """
+    global _fake_ticks, _fake_us
+    total = _fake_us + int(delta)
+    _fake_ticks = (_fake_ticks + total // 1000) % _TICKS_PERIOD
+    _fake_us = total % 1000
+
+
+def fake_ticks_us() -> int:
+    """
+    Vrátí simulovaný čas v mikrosekundách (ticks_ms() * 1000 + zbytek).
+
+    Reálný adafruit_ticks nic takového nemá – slouží pro měření
+    v simulaci (costmodel, trasování pinů).
+    """
+    return _fake_ticks * 1000 + _fake_us
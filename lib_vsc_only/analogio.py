@@ -9,11 +9,231 @@ V této verzi:
 - funguje jako fake hardware pro unit testy
 - nevyžaduje žádný skutečný mikrořadič ani ADC
 - chová se deterministicky (hodnoty se nastavují ručně)
+- umí přehrávat nahraná data senzorů z CSV nebo .npy souboru
+  (attach_trace), indexovaná časem adafruit_ticks a interpolovaná
 
 Reálný modul `analogio` je součástí CircuitPythonu a není dostupný na PC.
 Tento soubor slouží pro výuku, vývoj a testování.
 """
 
+import csv
+
+import adafruit_ticks as ticks
+
+
+# Záznamy senzorů připojené k pinům (pin -> záznam)
+_traces = {}
+
+
+# ---------------------------------------------------------
+# FakeHW – přehrávání nahraných dat senzorů
+# ---------------------------------------------------------
+
+def attach_trace(pin, trace) -> None:
+    """
+    Připojí k pinu záznam senzoru (CsvTrace, NpyTrace nebo load_trace()).
+
+    Každý AnalogIn na tomto pinu pak místo pevné hodnoty vrací
+    vzorek ze záznamu podle aktuálního času adafruit_ticks.
+    Funguje i pro AnalogIn vytvořené až později (Ringbit.get_tracking
+    si vytváří nový objekt při každém čtení).
+    """
+    _traces[pin] = trace
+
+
+def detach_trace(pin) -> None:
+    """Odpojí záznam od pinu (AnalogIn pak vrací opět `value`)."""
+    _traces.pop(pin, None)
+
+
+def load_trace(path, **kwargs):
+    """
+    Otevře záznam podle přípony souboru: .npy -> NpyTrace, jinak CsvTrace.
+
+    Další parametry se předají konstruktoru záznamu.
+    """
+    if str(path).lower().endswith(".npy"):
+        return NpyTrace(path, **kwargs)
+    return CsvTrace(path, **kwargs)
+
+
+def _to_adc(value):
+    """Ořízne hodnotu na rozsah ADC 0–65535."""
+    value = int(round(value))
+    if value < 0:
+        return 0
+    if value > 65535:
+        return 65535
+    return value
+
+
+class _Trace:
+    """
+    Společný základ záznamů – převod času ticks_ms na čas záznamu.
+
+    Parametry:
+        start_ms  – čas ticks_ms, kterému odpovídá začátek záznamu
+                    (výchozí je čas připojení = vytvoření objektu)
+        loop      – po konci záznamu začít znovu od začátku
+        period_ms – perioda vzorků pro soubory bez časového sloupce
+    """
+
+    def __init__(self, *, start_ms=None, loop=False, period_ms=None):
+        self.start_ms = ticks.ticks_ms() if start_ms is None else start_ms
+        self.loop = loop
+        self.period_ms = period_ms
+
+    def _elapsed(self, now_ms):
+        return ticks.ticks_diff(now_ms, self.start_ms)
+
+
+class CsvTrace(_Trace):
+    """
+    Záznam ze souboru CSV, čtený postupně (celý se nenačítá do paměti).
+
+    Formát řádku: čas_ms, hodnota  (nebo jen hodnota + period_ms).
+    Řádky, které nejsou čísla (hlavička, komentáře), se přeskočí.
+
+    Soubor se čte dopředu podle toho, jak běží simulovaný čas –
+    v paměti jsou jen dva sousední vzorky pro interpolaci. Při skoku
+    času zpět se soubor otevře znovu od začátku.
+
+    Parametry:
+        path         – cesta k CSV
+        time_column  – index sloupce s časem v ms (None = podle period_ms)
+        value_column – index sloupce s hodnotou
+        (další viz _Trace)
+    """
+
+    def __init__(self, path, *, time_column=0, value_column=1, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        if kwargs.get("period_ms") is not None and time_column == 0 \
+                and value_column == 1:
+            # soubor jen s hodnotami
+            time_column, value_column = None, 0
+        self.time_column = time_column
+        self.value_column = value_column
+        self.duration_ms = None     # známá délka záznamu (po prvním průchodu)
+        self._rewind()
+
+    def _rewind(self):
+        if getattr(self, "_file", None) is not None:
+            self._file.close()
+        self._file = open(self.path, newline="", encoding="utf-8")
+        self._rows = self._read_rows()
+        self._prev = None
+        self._next = next(self._rows, None)
+
+    def _read_rows(self):
+        index = 0
+        for row in csv.reader(self._file):
+            try:
+                value = float(row[self.value_column])
+                if self.time_column is None:
+                    t = index * self.period_ms
+                else:
+                    t = float(row[self.time_column])
+            except (ValueError, IndexError):
+                continue
+            index += 1
+            yield (t, value)
+
+    def sample(self, now_ms):
+        """Vrátí interpolovaný vzorek (0–65535) pro čas now_ms."""
+        elapsed = self._elapsed(now_ms)
+        if self.loop and self.duration_ms:
+            elapsed %= self.duration_ms
+        if self._prev is not None and elapsed < self._prev[0]:
+            self._rewind()
+        while self._next is not None and self._next[0] <= elapsed:
+            self._prev = self._next
+            self._next = next(self._rows, None)
+        if self._next is None:
+            if self._prev is None:
+                return 0
+            if self.loop and self.duration_ms is None and self._prev[0] > 0:
+                # konec prvního průchodu – teď už známe délku záznamu
+                self.duration_ms = self._prev[0]
+                self._rewind()
+                return self.sample(now_ms)
+            return _to_adc(self._prev[1])
+        if self._prev is None:
+            return _to_adc(self._next[1])
+        t0, v0 = self._prev
+        t1, v1 = self._next
+        return _to_adc(v0 + (v1 - v0) * (elapsed - t0) / (t1 - t0))
+
+    def close(self):
+        """Zavře soubor."""
+        self._file.close()
+
+
+class NpyTrace(_Trace):
+    """
+    Záznam ze souboru NumPy .npy, namapovaný do paměti (mmap).
+
+    Formát: pole N×2 (čas_ms, hodnota), nebo 1D pole hodnot s period_ms.
+    Data zůstávají na disku – načítají se jen stránky, na které se sahá,
+    takže lze přehrávat i hodinové záznamy. Vzorek se hledá binárně
+    (a při postupném čtení se zkusí nejdřív sousední index).
+
+    Vyžaduje NumPy (pip install numpy).
+    """
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        import numpy  # jen pro PC, na pico:ed NumPy není
+
+        self._np = numpy
+        data = numpy.load(path, mmap_mode="r")
+        if data.ndim == 1:
+            if self.period_ms is None:
+                raise ValueError("1D záznam potřebuje period_ms")
+            self._times = None
+            self._values = data
+        else:
+            self._times = data[:, 0]
+            self._values = data[:, 1]
+        self._index = 0
+        if self._times is None:
+            self.duration_ms = (len(self._values) - 1) * self.period_ms
+        else:
+            self.duration_ms = float(self._times[-1])
+
+    def sample(self, now_ms):
+        """Vrátí interpolovaný vzorek (0–65535) pro čas now_ms."""
+        values = self._values
+        count = len(values)
+        elapsed = self._elapsed(now_ms)
+        if self.loop and self.duration_ms:
+            elapsed %= self.duration_ms
+
+        if self._times is None:
+            position = elapsed / self.period_ms
+            index = int(position)
+            if index < 0:
+                return _to_adc(values[0])
+            if index >= count - 1:
+                return _to_adc(values[-1])
+            v0 = float(values[index])
+            return _to_adc(v0 + (float(values[index + 1]) - v0) * (position - index))
+
+        times = self._times
+        index = self._index
+        if not (index + 1 < count and times[index] <= elapsed < times[index + 1]):
+            index = int(self._np.searchsorted(times, elapsed, side="right")) - 1
+        if index < 0:
+            return _to_adc(values[0])
+        if index >= count - 1:
+            self._index = count - 1
+            return _to_adc(values[-1])
+        self._index = index
+        t0 = float(times[index])
+        v0 = float(values[index])
+        t1 = float(times[index + 1])
+        return _to_adc(v0 + (float(values[index + 1]) - v0) * (elapsed - t0) / (t1 - t0))
+
 
 class AnalogIn:
     """
@@ -26,6 +246,8 @@ class AnalogIn:
     V této fake verzi:
         - hodnota je uložena v atributu `value`
         - testy ji mohou libovolně nastavovat
+        - pokud je k pinu připojený záznam (attach_trace), `value`
+          vrací vzorek ze záznamu pro aktuální čas
         - metoda read() pouze vrací tuto hodnotu
         - čtení je deterministické a bez šumu
 
@@ -43,9 +265,21 @@ class AnalogIn:
             pin – libovolný objekt reprezentující pin (např. board.P0)
         """
         self.pin = pin
-        self.value = 0          # simulovaná ADC hodnota
+        self._value = 0         # simulovaná ADC hodnota
         self.read_count = 0     # počet čtení (pro testy)
 
+    @property
+    def value(self):
+        """Aktuální ADC hodnota (0–65535) – ze záznamu, nebo nastavená."""
+        trace = _traces.get(self.pin)
+        if trace is not None:
+            return trace.sample(ticks.ticks_ms())
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
     def deinit(self):
         """
         Dummy metoda pro kompatibilitu s CircuitPythonem.
@@ -14,6 +14,9 @@ Reálný modul `busio` je součástí CircuitPythonu a není dostupný na PC.
 Tento soubor slouží pro výuku, vývoj a testování.
 """
 
+import costmodel
+import pintrace
+
 
 # ---------------------------------------------------------
 # Fake I2C
@@ -34,10 +37,14 @@ class I2C:
         - všechny zápisy se ukládají do write_history
         - všechny čtecí operace se ukládají do read_history
         - scan() vrací deterministické adresy (0x38, 0x62)
+        - se zapnutým costmodel každý přenos posune simulovaný čas
+          o (bajty + adresa) × 9 / frequency
+        - každý zápis se předá do pintrace (kanál "i2c:<scl>", hodnota
+          je adresa zařízení)
 
     Atributy:
         scl, sda        – symbolické piny
-        frequency       – I2C frekvence (ignorováno)
+        frequency       – I2C frekvence (používá ji costmodel)
         write_history   – seznam všech zápisů (adresa, data)
         read_history    – seznam adres, ze kterých se četlo
         _fake_reads     – fronta dat, která se vrátí při čtení
@@ -52,6 +59,9 @@ class I2C:
         self.read_history = []
         self._fake_reads = []
 
+        # Jméno periferie pro costmodel (např. "i2c:P19")
+        self._cost_label = f"i2c:{getattr(scl, 'name', scl)}"
+
     def try_lock(self):
         """Fake: vždy úspěšné uzamčení sběrnice."""
         return True
@@ -101,6 +111,9 @@ class I2C:
         if end is None:
             end = len(buffer)
         # print("readfrom_into end", end)
+        costmodel.charge(self._cost_label,
+                         costmodel.i2c_transfer_us(end - start, self.frequency),
+                         bus=True)
 
         for i in range(start, end):
             # print(i, start, end, data)
@@ -117,6 +130,10 @@ class I2C:
             end = len(buffer)
         data = bytes(buffer[start:end])
         self.write_history.append((address, data))
+        pintrace.record(self._cost_label, address, 8)
+        costmodel.charge(self._cost_label,
+                         costmodel.i2c_transfer_us(len(data), self.frequency),
+                         bus=True)
 
     def writeto_then_readfrom(self, address, out_buffer, in_buffer, *,
                               out_start=0, out_end=None,
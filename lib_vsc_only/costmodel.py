@@ -0,0 +1,222 @@
+"""
+costmodel.py – model časové ceny operací pro fake hardware (jen pro PC).
+
+Stuby v lib_vsc_only běží na PC „zadarmo“ – I2C zápis, odeslání barev
+do NeoPixelů ani změna frekvence PWM neposunou simulovaný čas. Nejde tak
+odhadnout, jestli se řídicí smyčka na RP2040 vejde do svého časového
+rozpočtu.
+
+Tento modul je volitelný (opt-in) model ceny operací:
+- po zapnutí (enable()) každá stubovaná operace posune hodiny
+  adafruit_ticks o kalibrovanou dobu
+- čas se sčítá pro jednotlivé periferie (např. "i2c:P19", "neopixel:P15")
+- loop_mark() uzavře jeden průchod smyčkou a vrátí report s časem
+  na periferii a vytížením sběrnic
+- když model není zapnutý, stuby se chovají přesně jako dřív (cena 0)
+
+Kalibrace (výchozí hodnoty v COSTS):
+    I2C přenos       – bajty × 9 / frequency (8 bitů + ACK, adresa je 1 bajt)
+    NeoPixel show()  – 30 µs na pixel (24 bitů × 1,25 µs)
+    PulseIn()        – cena vytvoření objektu (načtení PIO programu)
+    PWMOut frequency – cena změny frekvence (přepočet děličky)
+
+Příklad:
+    >>> import costmodel
+    >>> costmodel.enable()
+    >>> while True:
+    ...     robot.set_speed(50, 50)
+    ...     report = costmodel.loop_mark()
+    ...     print(costmodel.format_report(report))
+
+Tento soubor slouží pro výuku, vývoj a testování, na pico:ed nepatří.
+"""
+
+import adafruit_ticks as ticks
+
+
+# ---------------------------------------------------------
+# Kalibrace – ceny jednotlivých operací
+# ---------------------------------------------------------
+
+COSTS = {
+    "i2c_bits_per_byte": 9,         # 8 datových bitů + ACK
+    "i2c_start_stop_us": 5,         # START + STOP podmínka, režie driveru
+    "neopixel_us_per_pixel": 30,    # 24 bitů × 1,25 µs (800 kHz)
+    "neopixel_reset_us": 50,        # latch pauza po přenosu
+    "pulsein_init_us": 200,         # vytvoření PulseIn (PIO program, DMA)
+    "pwm_frequency_change_us": 20,  # přepočet děličky a TOP registru
+}
+
+_DEFAULT_COSTS = dict(COSTS)
+
+# Interní stav modelu
+_enabled = False
+_loop_start_us = 0
+_frac_us = 0.0      # zlomky µs, které ještě neposunuly hodiny
+_busy = {}          # periferie -> [čas v µs, počet operací] v aktuální smyčce
+_buses = set()      # periferie, které jsou sběrnicí (počítá se vytížení)
+loops = []          # reporty uzavřených smyček (viz loop_mark)
+max_loops = 1000    # kolik posledních reportů si pamatovat
+
+
+# ---------------------------------------------------------
+# Zapnutí / vypnutí
+# ---------------------------------------------------------
+
+def enable(**costs) -> None:
+    """
+    Zapne model ceny operací a začne novou smyčku.
+
+    Parametry:
+        **costs – volitelné přepsání kalibrace, např. pulsein_init_us=150
+
+    Neznámý klíč kalibrace vyvolá KeyError (překlep by jinak
+    tiše nic nezměnil).
+    """
+    global _enabled
+    for key, value in costs.items():
+        if key not in COSTS:
+            raise KeyError(f"neznámá položka kalibrace: {key}")
+        COSTS[key] = value
+    _enabled = True
+    reset()
+
+
+def disable() -> None:
+    """Vypne model – stuby opět neposouvají simulovaný čas."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Vrátí True, pokud je model zapnutý."""
+    return _enabled
+
+
+def reset() -> None:
+    """
+    Zahodí nasčítané časy i uložené reporty a začne novou smyčku.
+
+    Kalibraci nemění; výchozí kalibraci vrátí reset_costs().
+    """
+    global _loop_start_us, _frac_us
+    _busy.clear()
+    _buses.clear()
+    loops.clear()
+    _frac_us = 0.0
+    _loop_start_us = ticks.fake_ticks_us()
+
+
+def reset_costs() -> None:
+    """Vrátí kalibraci na výchozí hodnoty."""
+    COSTS.clear()
+    COSTS.update(_DEFAULT_COSTS)
+
+
+# ---------------------------------------------------------
+# Účtování – volají stuby
+# ---------------------------------------------------------
+
+def charge(peripheral: str, us, *, bus=False) -> None:
+    """
+    Započítá operaci periferie a posune simulovaný čas.
+
+    Parametry:
+        peripheral – jméno periferie, např. "i2c:P19"
+        us         – doba operace v mikrosekundách (může být float)
+        bus        – True, pokud je periferie sběrnice (report pak
+                     ukazuje její vytížení)
+
+    Pokud model není zapnutý, nedělá nic.
+    """
+    global _frac_us
+    if not _enabled:
+        return
+    entry = _busy.get(peripheral)
+    if entry is None:
+        entry = _busy[peripheral] = [0.0, 0]
+        if bus:
+            _buses.add(peripheral)
+    entry[0] += us
+    entry[1] += 1
+    _frac_us += us
+    whole = int(_frac_us)
+    _frac_us -= whole
+    ticks.advance_ticks_us(whole)
+
+
+def i2c_transfer_us(nbytes: int, frequency: int) -> float:
+    """
+    Vrátí dobu I2C přenosu v µs: (nbytes + adresa) × 9 / frequency.
+    """
+    bits = (nbytes + 1) * COSTS["i2c_bits_per_byte"]
+    return bits * 1_000_000 / frequency + COSTS["i2c_start_stop_us"]
+
+
+def neopixel_show_us(npixels: int) -> float:
+    """Vrátí dobu odeslání npixels barev do NeoPixelů v µs."""
+    return npixels * COSTS["neopixel_us_per_pixel"] + COSTS["neopixel_reset_us"]
+
+
+# ---------------------------------------------------------
+# Report po smyčkách
+# ---------------------------------------------------------
+
+def loop_mark() -> dict:
+    """
+    Uzavře aktuální průchod smyčkou a vrátí jeho report.
+
+    Report je slovník:
+        {
+            "loop_us": délka smyčky v µs (simulovaný čas),
+            "peripherals": {jméno: (čas_µs, počet_operací, podíl), ...},
+            "buses": {jméno: vytížení 0.0–1.0, ...},
+        }
+
+    Report se také uloží do seznamu `loops` (posledních max_loops).
+    """
+    global _loop_start_us
+    now = ticks.fake_ticks_us()
+    loop_us = now - _loop_start_us
+    if loop_us < 0:
+        # přetečení simulovaných hodin
+        loop_us += ticks._TICKS_PERIOD * 1000
+    peripherals = {}
+    buses = {}
+    for name, (busy_us, count) in _busy.items():
+        share = busy_us / loop_us if loop_us else 0.0
+        peripherals[name] = (busy_us, count, share)
+        if name in _buses:
+            buses[name] = share
+    report = {"loop_us": loop_us, "peripherals": peripherals, "buses": buses}
+
+    loops.append(report)
+    if len(loops) > max_loops:
+        del loops[0]
+    _busy.clear()
+    _loop_start_us = now
+    return report
+
+
+def format_report(report=None) -> str:
+    """
+    Vrátí report smyčky jako čitelný text.
+
+    Bez parametru použije poslední uzavřenou smyčku.
+
+    Příklad výstupu:
+        smyčka: 1250 µs
+          i2c:P19          180.0 µs  4×  14.4 %  (sběrnice)
+    """
+    if report is None:
+        if not loops:
+            return "smyčka: žádná data (zavolej loop_mark())"
+        report = loops[-1]
+    lines = [f"smyčka: {report['loop_us']} µs"]
+    items = sorted(report["peripherals"].items(), key=lambda item: -item[1][0])
+    for name, (busy_us, count, share) in items:
+        note = "  (sběrnice)" if name in report["buses"] else ""
+        lines.append(
+            f"  {name:<16} {busy_us:8.1f} µs {count:4}× {share * 100:5.1f} %{note}"
+        )
+    return "\n".join(lines)
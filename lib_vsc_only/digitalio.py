@@ -15,6 +15,8 @@ Reálný modul `digitalio` je součástí CircuitPythonu a není dostupný na PC
 Tento soubor slouží pro výuku, vývoj a testování.
 """
 
+import pintrace
+
 
 class Direction:
     """
@@ -62,7 +64,9 @@ class DigitalInOut:
         - směr pinu se ukládá do self.direction
         - pull-up/pull-down se ukládá do self.pull
         - hodnota pinu je v self.value (True/False)
-        - všechny zápisy se ukládají do write_history
+        - všechny zápisy výstupu (switch_to_output i přiřazení value)
+          se ukládají do write_history
+        - každá změna hodnoty se předá do pintrace (pokud běží záznam)
         - chování je deterministické a vhodné pro testy
 
     Atributy:
@@ -83,8 +87,22 @@ class DigitalInOut:
         self.pin = pin
         self.direction = None
         self.pull = None
-        self.value = False
+        self._value = False
         self.write_history = []
+        self._trace_name = str(getattr(pin, "name", pin))
+
+    @property
+    def value(self):
+        """Logická hodnota pinu (True/False)."""
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        if self.direction == Direction.OUTPUT:
+            self.write_history.append(("value", value))
+        if value != self._value:
+            pintrace.record(self._trace_name, value)
+        self._value = value
 
     def switch_to_output(self, value=False):
         """
@@ -97,7 +115,9 @@ class DigitalInOut:
             ("set", value)
         """
         self.direction = Direction.OUTPUT
-        self.value = value
+        if value != self._value:
+            pintrace.record(self._trace_name, value)
+        self._value = value
         self.write_history.append(("set", value))
 
     def switch_to_input(self, pull=None):
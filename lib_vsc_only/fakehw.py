@@ -0,0 +1,71 @@
+"""
+fakehw.py – pomocník pro spouštění knihoven z lib/ na PC nad stuby.
+
+Knihovny z lib/ (cutebot, ringbit, elecfreaks_music) dělají `import time`.
+Modul `time` je ale v CPythonu vestavěný (builtin), takže se stub
+lib_vsc_only/time.py při běžném importu nikdy nenačte – time.sleep()
+by na PC opravdu čekal a neposouval simulovaný čas adafruit_ticks.
+
+Tento modul:
+- přidá lib/ a lib_vsc_only/ do sys.path (setup_path)
+- načte stub time.py pod vlastním jménem (fake_time)
+- naimportuje knihovnu z lib/ a podstrčí jí fake time (import_lib)
+
+Použití v nástrojích v .vscode/:
+    >>> import fakehw
+    >>> music_module = fakehw.import_lib("elecfreaks_music")
+
+Tento soubor slouží pro výuku, vývoj a testování, na pico:ed nepatří.
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+
+LIB_VSC_ONLY_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(LIB_VSC_ONLY_DIR)
+LIB_DIR = os.path.join(ROOT_DIR, "lib")
+
+_fake_time = None
+
+
+def setup_path() -> None:
+    """Přidá lib/ a lib_vsc_only/ na začátek sys.path (jen jednou)."""
+    for path in (LIB_VSC_ONLY_DIR, LIB_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def fake_time():
+    """
+    Vrátí stub lib_vsc_only/time.py jako modul (načte ho jen jednou).
+
+    Skutečný modul `time` v sys.modules zůstává beze změny,
+    takže asyncio a další knihovny Pythonu fungují dál.
+    """
+    global _fake_time
+    if _fake_time is None:
+        setup_path()
+        spec = importlib.util.spec_from_file_location(
+            "_fake_time", os.path.join(LIB_VSC_ONLY_DIR, "time.py")
+        )
+        _fake_time = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_fake_time)
+    return _fake_time
+
+
+def import_lib(name):
+    """
+    Naimportuje modul z lib/ a nahradí v něm `time` za fake time.
+
+    Parametry:
+        name – jméno modulu, např. "cutebot"
+
+    Vrací naimportovaný modul.
+    """
+    setup_path()
+    module = importlib.import_module(name)
+    if getattr(module, "time", None) is sys.modules.get("time"):
+        module.time = fake_time()
+    return module
@@ -0,0 +1,16 @@
+"""
+microcontroller.py – společný stub pro VS Code a fake hardware pro testy.
+
+Tento modul napodobuje CircuitPython modul `microcontroller`. Drivery ho
+importují hlavně kvůli typu `microcontroller.Pin` v anotacích
+(např. lib/ringbit.py).
+
+V této verzi:
+- Pin je stejná třída, ze které jsou piny v modulu board
+- nic dalšího (cpu, nvm, reset) stub zatím nepotřebuje
+
+Reálný modul `microcontroller` je součástí CircuitPythonu a není dostupný na PC.
+Tento soubor slouží pro výuku, vývoj a testování.
+"""
+
+from board import _Pin as Pin
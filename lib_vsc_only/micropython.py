@@ -0,0 +1,24 @@
+"""
+micropython.py – společný stub pro VS Code a fake hardware pro testy.
+
+Tento modul napodobuje modul `micropython`, který v CircuitPythonu
+poskytuje hlavně const() pro konstanty vkládané přímo do bytecode.
+
+V této verzi:
+- const() vrací svůj argument beze změny
+- stačí to knihovnám z lib/ (např. elecfreaks_music.py)
+
+Reálný modul `micropython` je součástí CircuitPythonu a není dostupný na PC.
+Tento soubor slouží pro výuku, vývoj a testování.
+"""
+
+
+def const(value):
+    """
+    Fake const().
+
+    V reálném CircuitPythonu kompilátor hodnotu vloží přímo do kódu
+    (a jména začínající podtržítkem ani neuloží do modulu).
+    Zde jen vrací hodnotu.
+    """
+    return value
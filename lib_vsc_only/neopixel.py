@@ -16,6 +16,7 @@ Tento soubor slouží pro výuku, vývoj a testování.
 """
 
 import digitalio
+import costmodel
 
 # ---------------------------------------------------------
 # Pixel order constants (kompatibilní s CircuitPython API)
@@ -60,6 +61,8 @@ class _PixelBuf:
         - brightness se neaplikuje (symbolické)
         - auto_write volá show() automaticky
         - show() pouze nastaví příznak write_called
+        - se zapnutým costmodel show() posune simulovaný čas
+          o 30 µs na pixel
 
     Atributy:
         _pixels       – seznam barev [(r,g,b), ...]
@@ -78,6 +81,9 @@ class _PixelBuf:
         # Pro testy: zda byla volána show()
         self.write_called = False
 
+        # Jméno periferie pro costmodel (NeoPixel ho doplní o pin)
+        self._cost_label = "neopixel"
+
     def __len__(self):
         """Vrací počet LED."""
         return self._n
@@ -116,8 +122,10 @@ class _PixelBuf:
         V této fake verzi:
             - pouze nastaví příznak write_called=True
             - testy mohou ověřit, že došlo k zápisu
+            - costmodel započítá dobu přenosu
         """
         self.write_called = True
+        costmodel.charge(self._cost_label, costmodel.neopixel_show_us(self._n))
 
 
 # ---------------------------------------------------------
@@ -170,6 +178,8 @@ class NeoPixel(_PixelBuf):
             auto_write=auto_write,
         )
 
+        self._cost_label = f"neopixel:{getattr(pin, 'name', pin)}"
+
         # Fake pin object
         self.pin = digitalio.DigitalInOut(pin)
         self.pin.direction = digitalio.Direction.OUTPUT
@@ -14,15 +14,27 @@ předpřipravené instance zařízení na desce pico:ed.
 V této fake verzi:
 - všechny objekty jsou simulované
 - I2C používá busio.I2C
-- display ukládá pixely do bufferu
-- tlačítka mají simulovaný stav
+- display kreslí do bytearray bufferu a do čipu posílá jen změny
+- tlačítka mají simulovaný stav (i naplánované stisky se zákmity)
 - LED má stav True/False
 - vše je deterministické a testovatelné
 
 Reálný modul `picoed` je součástí CircuitPythonu a není dostupný na PC.
 Tento soubor slouží pro výuku, vývoj a testování.
+
+POZOR – jen v tomto stubu, vestavěný `picoed` na desce je nemá
+(kód, který je použije, skončí na pico:ed-u chybou AttributeError):
+- Display.blit(), fill_rect(), flush() a auto_write
+- Button.press(), release(), inject() a click() (ovládání testem)
+Slouží k vyzkoušení a měření na PC (počet zápisů na sběrnici);
+v programech pro desku používejte jen fill(), pixel(), image(),
+scroll() a show(). Neblokující scroll pro desku je lib/scroller.py,
+události tlačítek lib/buttons.py.
 """
 
+from collections import deque
+
+import adafruit_ticks as ticks
 import board
 from busio import I2C
 
@@ -39,40 +51,242 @@ internal_i2c = I2C(board.I2C0_SCL, board.I2C0_SDA)
 # Fake Display
 # ---------------------------------------------------------
 
+# LED driver IS31FL3731 na interní I2C sběrnici
+_IS31_ADDRESS = 0x74
+_IS31_COMMAND = 0xFD        # registr pro výběr stránky (frame 0–7)
+_IS31_PWM_OFFSET = 0x24     # první PWM registr (jas LED) ve stránce
+# Mezera nezměněných pixelů, kterou se ještě vyplatí poslat v jednom
+# zápisu (1 bajt navíc je levnější než nová transakce: adresa + registr)
+_MERGE_GAP = 2
+
+
 class Display:
+    """
+    Fake verze LED displeje 17×7 na pico:ed.
+
+    V reálném zařízení:
+        - displej řídí čip IS31FL3731 přes interní I2C
+        - každý pixel má jas 0–255 (PWM registr čipu)
+
+    V této fake verzi:
+        - kreslí se do bytearray `buffer` (17×7 bajtů, řádek po řádku,
+          index = y * width + x), hodnota je jas pixelu
+        - druhý buffer si pamatuje, co už je zapsané v čipu
+        - flush() porovná oba buffery a pošle po internal_i2c jen změněné
+          pixely (sousední změny spojí do jednoho zápisu s auto-inkrementem)
+        - auto_write=True (výchozí) volá flush() po každé změně stejně jako
+          reálný displej; animace nastaví auto_write=False, nakreslí celý
+          snímek a zavolá flush() jednou
+        - blit(), fill_rect() a clear() pracují s celými řádky najednou
+        - scroll()/show() kreslí text přes lib/scroller.py (pixel po pixelu,
+          jen změněné pixely) – neblokující scroll pro desku je
+          scroller.Scroller, ne metoda displeje
+        - blit(), fill_rect(), flush() a auto_write jsou JEN ve stubu,
+          na pico:ed-u neexistují
+
+    Atributy:
+        buffer          – kreslicí buffer (bytearray width × height)
+        auto_write      – zda se má po každé změně volat flush()
+        register_writes – kolik PWM registrů se celkem zapsalo (pro testy)
+        i2c_writes      – kolik I2C transakcí se celkem poslalo (pro testy)
+    """
+
     width = 17
     height = 7
+    scroll_delay_ms = 80
 
     def __init__(self, i2c=None):
-        self.buffer = [[0] * self.width for _ in range(self.height)]
+        self._i2c = i2c
+        self.buffer = bytearray(self.width * self.height)
+        self._front = bytearray(self.width * self.height)
+        self._page = None
+        self.auto_write = True
+        self.register_writes = 0
+        self.i2c_writes = 0
+        self._scroller = None
 
     @staticmethod
     def pixel_addr(x, y):
-        return 0
+        """
+        Vrátí index PWM registru pixelu (od _IS31_PWM_OFFSET).
 
-    def clear(self):
-        for y in range(self.height):
-            for x in range(self.width):
-                self.buffer[y][x] = 0
+        Zjednodušené lineární mapování – skutečné zapojení matice na desce
+        je jiné, pro počet zápisů na sběrnici na tom ale nezáleží.
+        """
+        return y * Display.width + x
 
-    def scroll(self, value, brightness=30):
-        pass
+    # -----------------------------------------------------
+    # Kreslení do bufferu
+    # -----------------------------------------------------
 
-    def show(self, value, brightness=30):
-        pass
+    def clear(self):
+        """Zhasne všechny pixely."""
+        self.buffer[:] = bytes(len(self.buffer))
+        self._changed()
 
     def reset(self):
         self.clear()
 
     def fill(self, color=None, blink=None, frame=None):
-        pass
+        """Nastaví všem pixelům jas color (None = beze změny)."""
+        if color is None:
+            return
+        self.buffer[:] = bytes((color,)) * len(self.buffer)
+        self._changed()
 
     def pixel(self, x, y, color=None, blink=None, frame=None):
-        if 0 <= x < self.width and 0 <= y < self.height:
-            self.buffer[y][x] = 1
+        """
+        Nastaví jas pixelu (0–255), nebo ho vrátí, pokud color je None.
+
+        Souřadnice mimo displej se ignorují (vrací None).
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        index = y * self.width + x
+        if color is None:
+            return self.buffer[index]
+        self.buffer[index] = color
+        self._changed()
+        return None
+
+    def fill_rect(self, x, y, w, h, color):
+        """
+        Vyplní obdélník jasem color (ořízne se podle displeje).
+
+        Jen ve stubu – vestavěný picoed.display tuto metodu nemá.
+        """
+        x0 = max(x, 0)
+        x1 = min(x + w, self.width)
+        if x0 >= x1:
+            return
+        row = bytes((color,)) * (x1 - x0)
+        for yy in range(max(y, 0), min(y + h, self.height)):
+            start = yy * self.width
+            self.buffer[start + x0:start + x1] = row
+        self._changed()
+
+    def blit(self, src, x=0, y=0, w=None, h=None):
+        """
+        Zkopíruje obdélník src do bufferu na pozici (x, y).
+
+        Parametry:
+            src – bajty jasu po řádcích (w × h), např. bytearray nebo bytes
+            w   – šířka src (výchozí šířka displeje)
+            h   – výška src (výchozí len(src) // w)
+
+        Co přesahuje displej, se ořízne.
+
+        Jen ve stubu – vestavěný picoed.display tuto metodu nemá.
+        """
+        if w is None:
+            w = self.width
+        if h is None:
+            h = len(src) // w
+        x0 = max(x, 0)
+        x1 = min(x + w, self.width)
+        if x0 >= x1:
+            return
+        src = memoryview(src)
+        for yy in range(max(y, 0), min(y + h, self.height)):
+            src_start = (yy - y) * w + (x0 - x)
+            start = yy * self.width
+            self.buffer[start + x0:start + x1] = src[src_start:src_start + x1 - x0]
+        self._changed()
 
     def image(self, img, blink=None, frame=None):
-        pass
+        """Zobrazí obrázek – bajty jasu pro celý displej (17×7)."""
+        if len(img) == len(self.buffer):
+            self.blit(img)
+
+    def scroll(self, value, brightness=30):
+        """
+        Nechá text přejet po displeji zprava doleva (blokuje až do konce).
+
+        V této fake verzi:
+            - text kreslí lib/scroller.py (na desce má písmo firmware)
+            - každý snímek posune simulovaný čas o scroll_delay_ms
+              místo skutečného čekání
+
+        Neblokující scroll (asyncio úloha) je scroller.Scroller.
+        """
+        for _ in self._text().frames(value, brightness):
+            ticks.advance_ticks(self.scroll_delay_ms)
+
+    def show(self, value, brightness=30):
+        """Zobrazí text od levého okraje (co se nevejde, se ořízne)."""
+        self._text().show(value, brightness)
+
+    def _text(self):
+        # Vestavěné scroll()/show() napodobí Scroller z lib/ – stejné písmo
+        # i zápis jen změněných pixelů; načte se až při prvním textu
+        if self._scroller is None:
+            from scroller import Scroller
+            self._scroller = Scroller(self)
+        self._scroller.clear()
+        return self._scroller
+
+    # -----------------------------------------------------
+    # Zápis do čipu
+    # -----------------------------------------------------
+
+    def _changed(self):
+        if self.auto_write:
+            self.flush()
+
+    def flush(self):
+        """
+        Pošle do IS31FL3731 jen pixely, které se od minulého flush() změnily.
+
+        Jen ve stubu (stejně jako auto_write) – vestavěný picoed.display
+        zapisuje do čipu hned a flush() nemá.
+
+        Vrací počet zapsaných PWM registrů (0 = nic se neposílalo).
+        """
+        back = self.buffer
+        front = self._front
+        if back == front:
+            return 0
+        written = 0
+        size = len(back)
+        index = 0
+        while index < size:
+            if back[index] == front[index]:
+                index += 1
+                continue
+            # Začátek úseku změn – prodlužujeme ho přes krátké mezery
+            start = index
+            end = index + 1
+            index += 1
+            while index < size and index - end <= _MERGE_GAP:
+                if back[index] != front[index]:
+                    end = index + 1
+                index += 1
+            index = end
+            self._write_registers(start, back[start:end])
+            front[start:end] = back[start:end]
+            written += end - start
+        self.register_writes += written
+        return written
+
+    def _write_registers(self, start, data):
+        """Zapíše data do PWM registrů od pixelu s indexem start."""
+        if self._i2c is None:
+            return
+        y, x = divmod(start, self.width)
+        out = bytearray(len(data) + 1)
+        out[0] = _IS31_PWM_OFFSET + self.pixel_addr(x, y)
+        out[1:] = data
+        while not self._i2c.try_lock():
+            pass
+        try:
+            if self._page != 0:
+                self._i2c.writeto(_IS31_ADDRESS, bytes((_IS31_COMMAND, 0)))
+                self._page = 0
+                self.i2c_writes += 1
+            self._i2c.writeto(_IS31_ADDRESS, out)
+            self.i2c_writes += 1
+        finally:
+            self._i2c.unlock()
 
 
 # ---------------------------------------------------------
@@ -98,14 +312,103 @@ class Led:
 # ---------------------------------------------------------
 
 class Button:
+    """
+    Fake verze tlačítka na pico:ed.
+
+    V reálném zařízení:
+        - is_pressed() čte aktuální stav pinu
+        - was_pressed() vrátí True, pokud bylo tlačítko od minulého
+          volání stisknuto
+
+    V této fake verzi:
+        - stav pinu je v _pressed (press()/release() hned, nebo skript
+          inject()/click() s časy v ms podle adafruit_ticks, i se zákmity)
+        - is_pressed() vrací stav pinu v aktuálním simulovaném čase
+          (neodrušený, stejně jako na desce)
+        - odrušení a události PRESS/RELEASE/LONG_PRESS řeší
+          lib/buttons.py (ButtonEvents), ne tlačítko
+
+    Atributy:
+        pin – symbolický pin (např. board.BUTTON_A)
+    """
+
     def __init__(self, pin=None):
-        self._pressed = False
+        self.pin = pin
+        self._pressed = False       # stav pinu
+        self._press_count = 0       # stisky od posledního was_pressed()
+        self._script = deque()
+
+    # -----------------------------------------------------
+    # FakeHW – ovládání stavu pinu
+    # -----------------------------------------------------
+
+    def press(self):
+        """Test helper: stiskne tlačítko teď."""
+        self._set(True)
+
+    def release(self):
+        """Test helper: pustí tlačítko teď."""
+        self._set(False)
+
+    def inject(self, script):
+        """
+        Test helper: naplánuje změny stavu pinu.
+
+        Parametry:
+            script – seznam (at_ms, pressed), seřazený podle času
+
+        Příklad (stisk se zákmity a puštění po 1 s):
+            >>> button_a.inject([(100, True), (102, False), (104, True),
+            ...                  (1100, False)])
+        """
+        self._script.extend(script)
+
+    def click(self, at_ms, hold_ms=100, bounces=0):
+        """
+        Test helper: naplánuje jedno kliknutí (volitelně se zákmity).
+
+        Parametry:
+            at_ms   – čas stisku
+            hold_ms – jak dlouho se drží
+            bounces – počet zákmitů po 1 ms na začátku stisku
+        """
+        script = []
+        t = at_ms
+        for _ in range(bounces):
+            script.append((t, True))
+            script.append((t + 1, False))
+            t += 2
+        script.append((t, True))
+        script.append((at_ms + hold_ms, False))
+        self.inject(script)
+
+    def _set(self, pressed):
+        if pressed and not self._pressed:
+            self._press_count += 1
+        self._pressed = pressed
+
+    def _run_script(self):
+        # Provede naplánované změny, jejichž čas už nastal
+        now = ticks.ticks_ms()
+        script = self._script
+        while script and ticks.ticks_diff(now, script[0][0]) >= 0:
+            self._set(script.popleft()[1])
+
+    # -----------------------------------------------------
+    # API jako na desce
+    # -----------------------------------------------------
 
     def is_pressed(self):
+        """Vrátí aktuální stav tlačítka."""
+        self._run_script()
         return self._pressed
 
     def was_pressed(self):
-        return False
+        """Vrátí True, pokud bylo tlačítko od minulého volání stisknuto."""
+        self._run_script()
+        pressed = self._press_count > 0
+        self._press_count = 0
+        return pressed
 
 
 # ---------------------------------------------------------
@@ -158,7 +461,7 @@ class Music:
 # ---------------------------------------------------------
 
 display = Display(internal_i2c)
-button_a = Button()
-button_b = Button()
+button_a = Button(board.BUTTON_A)
+button_b = Button(board.BUTTON_B)
 led = Led()
 music = Music()
@@ -0,0 +1,204 @@
+"""
+pintrace.py – záznam aktivity pinů pro fake hardware (jen pro PC).
+
+Funguje jako jednoduchý logický analyzátor nad stuby z lib_vsc_only:
+- po zapnutí (enable()) se ukládá každá změna digitálního pinu
+  (digitalio.DigitalInOut.value), každá změna PWM (duty_cycle, frequency),
+  každý přečtený pulz z pulseio.PulseIn a každý I2C zápis
+- každý záznam má čas v µs ze simulovaných hodin adafruit_ticks
+- záznamy jsou v kompaktních polích (array), ne v seznamu objektů
+- export_vcd() uloží záznam jako VCD soubor, který otevře např. GTKWave
+  nebo PulseView (stejně jako záznam z logického analyzátoru)
+- latencies() změří zpoždění mezi dvěma kanály, např. od spouštěcího
+  pulzu ultrazvuku (P8) po přečtení odezvy (P12.pulsein)
+
+Jména kanálů:
+    "P8"            – digitální pin (1 bit)
+    "P1.duty"       – duty_cycle PWM (16 bitů)
+    "P1.freq"       – frekvence PWM (32 bitů)
+    "P12.pulsein"   – délka přečteného pulzu v µs (16 bitů)
+    "i2c:P19"       – I2C zápis, hodnota je adresa zařízení (8 bitů)
+    vlastní značky  – mark("jméno"), např. před voláním set_speed()
+
+Příklad:
+    >>> import pintrace
+    >>> pintrace.enable()
+    >>> robot.get_distance(cutebot.Unit.cm)
+    >>> pintrace.latencies("P8", "P12.pulsein", start_value=1)
+    [1959]
+    >>> pintrace.export_vcd("distance.vcd")
+
+Tento soubor slouží pro výuku, vývoj a testování, na pico:ed nepatří.
+"""
+
+from array import array
+
+import adafruit_ticks as ticks
+
+
+_enabled = False
+
+# Kanály: jméno -> index, a pro každý index jméno a šířka v bitech
+# (šířka 0 = značka bez hodnoty, ve VCD jako event)
+_channels = {}
+_names = []
+_widths = []
+
+# Záznamy – tři souběžná pole (čas µs, index kanálu, hodnota)
+_times = array("q")
+_chans = array("H")
+_values = array("q")
+
+
+def enable() -> None:
+    """Zapne záznam a smaže předchozí záznamy."""
+    global _enabled
+    clear()
+    _enabled = True
+
+
+def disable() -> None:
+    """Vypne záznam (uložené záznamy zůstanou)."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Vrátí True, pokud záznam běží."""
+    return _enabled
+
+
+def clear() -> None:
+    """Smaže všechny záznamy i kanály."""
+    _channels.clear()
+    del _names[:]
+    del _widths[:]
+    del _times[:]
+    del _chans[:]
+    del _values[:]
+
+
+def record(name: str, value, width: int = 1) -> None:
+    """
+    Uloží hodnotu kanálu s aktuálním simulovaným časem.
+
+    Volají ho stuby; když záznam neběží, nedělá nic.
+
+    Parametry:
+        name  – jméno kanálu (viz popis modulu)
+        value – nová hodnota (bool nebo int)
+        width – šířka kanálu v bitech (použije se při prvním záznamu)
+    """
+    if not _enabled:
+        return
+    index = _channels.get(name)
+    if index is None:
+        index = _channels[name] = len(_names)
+        _names.append(name)
+        _widths.append(width)
+    _times.append(ticks.fake_ticks_us())
+    _chans.append(index)
+    _values.append(int(value))
+
+
+def mark(name: str, value: int = 1) -> None:
+    """
+    Uloží vlastní značku (např. "motor_cmd" před voláním set_speed).
+
+    Ve VCD se značka zobrazí jako event.
+    """
+    record(name, value, width=0)
+
+
+def count() -> int:
+    """Vrátí počet uložených záznamů."""
+    return len(_times)
+
+
+def events(name: str):
+    """Vrátí seznam (čas_µs, hodnota) pro jeden kanál."""
+    index = _channels.get(name)
+    if index is None:
+        return []
+    return [
+        (_times[i], _values[i]) for i in range(len(_times)) if _chans[i] == index
+    ]
+
+
+def latencies(start: str, end: str, *, start_value=None, end_value=None):
+    """
+    Změří zpoždění mezi kanály start a end v µs.
+
+    Ke každému záznamu kanálu start (volitelně jen s hodnotou start_value)
+    najde první následující záznam kanálu end (volitelně s end_value),
+    který přišel dřív než další start. Start bez odezvy se přeskočí.
+
+    Příklad – od spouštěcího pulzu ultrazvuku po přečtení odezvy:
+        >>> latencies("P8", "P12.pulsein", start_value=1)
+    """
+    start_index = _channels.get(start)
+    end_index = _channels.get(end)
+    result = []
+    if start_index is None or end_index is None:
+        return result
+    pending = None
+    for i in range(len(_times)):
+        chan = _chans[i]
+        if chan == start_index and (start_value is None or _values[i] == start_value):
+            pending = _times[i]
+        elif chan == end_index and pending is not None and \
+                (end_value is None or _values[i] == end_value):
+            result.append(_times[i] - pending)
+            pending = None
+    return result
+
+
+def format_latencies(values) -> str:
+    """Vrátí souhrn latencí jako text (počet, min, průměr, max)."""
+    if not values:
+        return "latence: žádná data"
+    return (
+        f"latence: {len(values)}×  min {min(values)} µs  "
+        f"průměr {sum(values) / len(values):.1f} µs  max {max(values)} µs"
+    )
+
+
+def _vcd_id(index: int) -> str:
+    """Krátký identifikátor signálu ve VCD (tisknutelné ASCII 33–126)."""
+    chars = ""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 94)
+        chars = chr(33 + rest) + chars
+    return chars
+
+
+def export_vcd(path: str, module: str = "pico_ed") -> None:
+    """
+    Uloží záznam jako VCD soubor (časová jednotka 1 µs).
+
+    Parametry:
+        path   – cesta k výstupnímu souboru
+        module – jméno scope ve VCD
+    """
+    with open(path, "w", encoding="ascii", errors="replace") as vcd:
+        vcd.write("$timescale 1us $end\n")
+        vcd.write(f"$scope module {module} $end\n")
+        for index, name in enumerate(_names):
+            width = _widths[index]
+            kind = "event" if width == 0 else "wire"
+            vcd.write(f"$var {kind} {max(width, 1)} {_vcd_id(index)} {name} $end\n")
+        vcd.write("$upscope $end\n$enddefinitions $end\n")
+
+        last_time = None
+        for i in range(len(_times)):
+            if _times[i] != last_time:
+                last_time = _times[i]
+                vcd.write(f"#{last_time}\n")
+            index = _chans[i]
+            width = _widths[index]
+            ident = _vcd_id(index)
+            if width <= 1:
+                vcd.write(f"{1 if width == 0 or _values[i] else 0}{ident}\n")
+            else:
+                vcd.write(f"b{_values[i] & ((1 << width) - 1):b} {ident}\n")
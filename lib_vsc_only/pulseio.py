@@ -0,0 +1,341 @@
+"""
+pulseio.py – společný stub pro VS Code a fake hardware pro testy.
+
+Tento modul napodobuje CircuitPython modul `pulseio`, který měří délky
+pulzů na vstupním pinu (ultrazvukový dálkoměr, IR přijímač).
+
+V této verzi:
+- modul je určený pro vývoj na PC (VS Code / Pylance)
+- funguje jako fake hardware pro unit testy
+- pulzy nepřichází z pinu, ale ze „zdroje“ připojeného k pinu
+  pomocí attach_source()
+- EchoSource generuje odezvu ultrazvuku podle zadané vzdálenosti
+  (se šumem a výpadky)
+- NecSource generuje IR rámce NEC podle skriptu stisknutých kláves
+- chová se deterministicky (náhodnost má volitelný seed)
+
+Příklad:
+    >>> import board, pulseio
+    >>> pulseio.attach_source(board.P12, pulseio.EchoSource(25, noise_cm=0.5))
+    >>> pulseio.attach_source(board.P16, pulseio.NecSource(
+    ...     [pulseio.nec_frame(0x00, 0x0C, address_inv=0xBF)]))
+
+Reálný modul `pulseio` je součástí CircuitPythonu a není dostupný na PC.
+Tento soubor slouží pro výuku, vývoj a testování.
+"""
+
+import random
+from collections import deque
+
+import adafruit_ticks as ticks
+import costmodel
+import pintrace
+
+
+# Rychlost zvuku v cm/µs (343 m/s)
+SOUND_CM_PER_US = 0.0343
+
+# Časování NEC protokolu v µs
+NEC_HEADER_MARK = 9000
+NEC_HEADER_SPACE = 4500
+NEC_BIT_MARK = 560
+NEC_ZERO_SPACE = 560
+NEC_ONE_SPACE = 1690
+
+# Zdroje pulzů připojené k pinům (pin -> zdroj)
+_sources = {}
+
+
+# ---------------------------------------------------------
+# FakeHW – zdroje pulzů
+# ---------------------------------------------------------
+
+def attach_source(pin, source) -> None:
+    """
+    Připojí zdroj pulzů k pinu.
+
+    Každý PulseIn vytvořený na tomto pinu bude číst pulzy ze zdroje.
+    Zdroj musí mít metody arm(now_ms) a take(now_ms) – viz EchoSource.
+    """
+    _sources[pin] = source
+
+
+def detach_source(pin) -> None:
+    """Odpojí zdroj pulzů od pinu (pokud nějaký byl)."""
+    _sources.pop(pin, None)
+
+
+class EchoSource:
+    """
+    Zdroj odezvy ultrazvukového dálkoměru.
+
+    Po každém spuštění měření (vytvoření PulseIn nebo resume()) vydá
+    jeden pulz o délce odpovídající cestě zvuku k překážce a zpět:
+        šířka_µs = 2 × vzdálenost / SOUND_CM_PER_US
+
+    Parametry:
+        distance_cm – vzdálenost překážky v cm, nebo funkce f(now_ms),
+                      která vzdálenost vrací (pohybující se robot)
+        noise_cm    – směrodatná odchylka gaussovského šumu v cm
+        dropout     – pravděpodobnost (0.0–1.0), že odezva nepřijde
+        seed        – seed generátoru náhodných čísel (determinismus)
+
+    Atributy:
+        armed_count – počet spuštěných měření (pro testy)
+    """
+
+    def __init__(self, distance_cm, *, noise_cm=0.0, dropout=0.0, seed=None):
+        self.distance_cm = distance_cm
+        self.noise_cm = noise_cm
+        self.dropout = dropout
+        self.armed_count = 0
+        self._random = random.Random(seed)
+        self._pending = []
+
+    def arm(self, now_ms):
+        """Spustí měření – připraví jeden pulz (nebo žádný při výpadku)."""
+        self.armed_count += 1
+        if self.dropout and self._random.random() < self.dropout:
+            self._pending = []
+            return
+        distance = self.distance_cm
+        if callable(distance):
+            distance = distance(now_ms)
+        if self.noise_cm:
+            distance += self._random.gauss(0.0, self.noise_cm)
+        width = round(2 * max(distance, 0.0) / SOUND_CM_PER_US)
+        self._pending = [width]
+
+    def take(self, now_ms):
+        """Vrátí pulzy připravené k přečtení (každý jen jednou)."""
+        pulses = self._pending
+        self._pending = []
+        return pulses
+
+    @property
+    def exhausted(self):
+        """Odezva ultrazvuku nikdy nedojde."""
+        return False
+
+
+def nec_frame(address, command, *, address_inv=None):
+    """
+    Sestaví 4 bajty NEC rámce: adresa, inverzní adresa, příkaz, inverzní příkaz.
+
+    Parametry:
+        address     – adresa ovladače (0–255)
+        command     – kód klávesy (0–255)
+        address_inv – druhý bajt adresy; výchozí je ~address (klasický NEC),
+                      rozšířený NEC používá libovolnou hodnotu
+
+    Příklad:
+        >>> nec_frame(0x00, 0x0C)
+        (0, 255, 12, 243)
+    """
+    if address_inv is None:
+        address_inv = ~address & 0xFF
+    return (address & 0xFF, address_inv & 0xFF, command & 0xFF, ~command & 0xFF)
+
+
+def nec_pulses(frame, *, jitter_us=0, rnd=None):
+    """
+    Převede 4 bajty NEC rámce na délky pulzů v µs.
+
+    Bajty se vysílají od nejnižšího bitu, logická 1 má dlouhou mezeru.
+    Výsledek odpovídá tomu, co zaznamená PulseIn s idle_state=True:
+        [9000, 4500, 560, mezera, 560, mezera, ..., 560]
+    """
+    pulses = [NEC_HEADER_MARK, NEC_HEADER_SPACE]
+    for byte in frame:
+        for bit in range(8):
+            pulses.append(NEC_BIT_MARK)
+            pulses.append(NEC_ONE_SPACE if (byte >> bit) & 1 else NEC_ZERO_SPACE)
+    pulses.append(NEC_BIT_MARK)
+    if jitter_us:
+        rnd = rnd or random
+        pulses = [p + rnd.randint(-jitter_us, jitter_us) for p in pulses]
+    return pulses
+
+
+class NecSource:
+    """
+    Zdroj IR pulzů podle skriptu stisknutých kláves (protokol NEC).
+
+    Skript je seznam položek:
+        frame             – rámec se vyšle hned, jak o něj někdo požádá
+        (at_ms, frame)    – rámec se vyšle nejdříve v čase at_ms (ticks_ms)
+
+    kde frame je čtveřice bajtů (viz nec_frame()). Dva rámce nikdy
+    nepřijdou těsněji než gap_ms po sobě (jinak by je dekodér spojil
+    do jedné dávky).
+
+    Parametry:
+        script    – seznam rámců
+        gap_ms    – minimální odstup dvou rámců v ms
+        jitter_us – náhodná odchylka délky každého pulzu v µs
+        seed      – seed generátoru náhodných čísel
+
+    Atributy:
+        sent_count – počet odvysílaných rámců
+    """
+
+    def __init__(self, script, *, gap_ms=200, jitter_us=0, seed=None):
+        self._script = deque(script)
+        self.gap_ms = gap_ms
+        self.jitter_us = jitter_us
+        self.sent_count = 0
+        self._last_sent_ms = None
+        self._random = random.Random(seed)
+
+    def arm(self, now_ms):
+        """IR přichází asynchronně, spuštění měření nic nemění."""
+        pass
+
+    def take(self, now_ms):
+        """Vrátí pulzy dalšího rámce, pokud už nastal jeho čas."""
+        if not self._script:
+            return []
+        if self._last_sent_ms is not None and \
+                ticks.ticks_diff(now_ms, self._last_sent_ms) < self.gap_ms:
+            return []
+        entry = self._script[0]
+        if len(entry) == 2:
+            at_ms, frame = entry
+            if ticks.ticks_diff(now_ms, at_ms) < 0:
+                return []
+        else:
+            frame = entry
+        self._script.popleft()
+        self.sent_count += 1
+        self._last_sent_ms = now_ms
+        return nec_pulses(frame, jitter_us=self.jitter_us, rnd=self._random)
+
+    @property
+    def exhausted(self):
+        """True, pokud už skript nemá žádný rámec."""
+        return not self._script
+
+
+# ---------------------------------------------------------
+# Fake PulseIn
+# ---------------------------------------------------------
+
+class PulseIn:
+    """
+    Fake verze třídy PulseIn z CircuitPythonu.
+
+    V reálném zařízení:
+        - PulseIn měří délky pulzů na pinu v µs (0–65535)
+        - ukládá je do kruhového bufferu velikosti maxlen
+        - při zaplnění se nejstarší pulz zahodí
+
+    V této fake verzi:
+        - pulzy dodává zdroj připojený k pinu (attach_source)
+        - bez zdroje PulseIn nikdy nic nenaměří
+        - zdroj se spustí při vytvoření objektu a při resume()
+        - se zapnutým costmodel stojí vytvoření objektu pulsein_init_us
+          a každý přečtený pulz posune čas o svou délku (čekání na odezvu)
+        - popleft() předá přečtený pulz do pintrace ("<pin>.pulsein")
+
+    Atributy:
+        pin         – symbolický pin (např. board.P12)
+        maxlen      – velikost bufferu
+        idle_state  – klidová úroveň pinu
+        paused      – True, pokud je měření pozastavené
+    """
+
+    def __init__(self, pin, maxlen=2, *, idle_state=False):
+        """
+        Inicializuje fake měření pulzů.
+
+        Parametry:
+            pin        – libovolný objekt reprezentující pin
+            maxlen     – maximální počet uložených pulzů
+            idle_state – klidová úroveň pinu (True = high)
+        """
+        self.pin = pin
+        self.maxlen = maxlen
+        self.idle_state = idle_state
+        self.paused = False
+        self._pulses = deque((), maxlen)
+        self._source = _sources.get(pin)
+        self._cost_label = f"pulsein:{getattr(pin, 'name', pin)}"
+        self._trace_name = f"{getattr(pin, 'name', pin)}.pulsein"
+
+        costmodel.charge(self._cost_label, costmodel.COSTS["pulsein_init_us"])
+        if self._source is not None:
+            self._source.arm(ticks.ticks_ms())
+
+    def _poll(self):
+        """Převezme ze zdroje pulzy, které už „přišly“."""
+        if self.paused or self._source is None:
+            return
+        pulses = self._source.take(ticks.ticks_ms())
+        for pulse in pulses:
+            costmodel.charge(self._cost_label, pulse)
+            self._pulses.append(min(max(int(pulse), 0), 0xFFFF))
+
+    @property
+    def exhausted(self):
+        """
+        FakeHW: True, pokud už žádný pulz nepřijde.
+
+        Používá stub adafruit_irremote, aby blokující čtení
+        neviselo věčně, když skript kláves skončí.
+        """
+        return not self._pulses and (self._source is None or self._source.exhausted)
+
+    def __len__(self):
+        self._poll()
+        return len(self._pulses)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        self._poll()
+        return self._pulses[index]
+
+    def popleft(self):
+        """
+        Vrátí a odebere nejstarší pulz.
+
+        Pokud je buffer prázdný, vyvolá IndexError (stejně jako CircuitPython).
+        """
+        self._poll()
+        if not self._pulses:
+            raise IndexError("pop from empty PulseIn")
+        pulse = self._pulses.popleft()
+        pintrace.record(self._trace_name, pulse, 16)
+        return pulse
+
+    def clear(self):
+        """Smaže všechny uložené pulzy."""
+        self._pulses.clear()
+
+    def pause(self):
+        """Pozastaví měření – nové pulzy se nepřebírají."""
+        self.paused = True
+
+    def resume(self, trigger_duration=0):
+        """
+        Obnoví měření.
+
+        Parametry:
+            trigger_duration – délka spouštěcího pulzu v µs (0 = bez pulzu);
+                               pokud je nenulová, zdroj se znovu spustí
+        """
+        self.paused = False
+        if trigger_duration and self._source is not None:
+            self._source.arm(ticks.ticks_ms())
+
+    def deinit(self):
+        """Uvolní pin – zdroj se odpojí od tohoto objektu."""
+        self._source = None
+        self._pulses.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.deinit()
@@ -15,6 +15,12 @@ Reálný modul `pwmio` je součástí CircuitPythonu a není dostupný na PC.
 Tento soubor slouží pro výuku, vývoj a testování.
 """
 
+from array import array
+
+import adafruit_ticks as ticks
+import costmodel
+import pintrace
+
 
 class PWMOut:
     """
@@ -28,32 +34,89 @@ class PWMOut:
     V této fake verzi:
         - duty_cycle a frequency se pouze ukládají do atributů
         - žádný skutečný signál se negeneruje
-        - všechny změny se ukládají do history (užitečné pro testy)
+        - všechny změny se ukládají do history (užitečné pro testy),
+          i když se atribut přiřadí přímo (pwm.duty_cycle = ...)
+        - každý zápis se uloží i s časem z adafruit_ticks do časové osy
+          (timeline_us, timeline_frequency, timeline_duty) – z ní lze
+          zpětně zrekonstruovat signál (např. .vscode/music_wav.py)
+        - se zapnutým costmodel změna frekvence posune simulovaný čas
+        - změny duty_cycle a frekvence se předají do pintrace
+          (kanály "<pin>.duty" a "<pin>.freq")
 
     Atributy:
-        pin         – symbolický pin (např. board.P0)
-        frequency   – aktuální frekvence PWM
-        duty_cycle  – aktuální šířka pulzu (0–65535)
-        history     – seznam všech změn (frequency, duty_cycle)
+        pin                – symbolický pin (např. board.P0)
+        frequency          – aktuální frekvence PWM
+        duty_cycle         – aktuální šířka pulzu (0–65535)
+        variable_frequency – zda smí program frekvenci měnit (jen se ukládá)
+        history            – seznam všech změn (frequency, duty_cycle)
+        timeline_us        – čas každého zápisu v µs (array 'q')
+        timeline_frequency – frekvence po zápisu (array 'L')
+        timeline_duty      – duty_cycle po zápisu (array 'H')
     """
 
-    def __init__(self, pin, *, frequency=5000, duty_cycle=0):
+    def __init__(self, pin, *, frequency=5000, duty_cycle=0,
+                 variable_frequency=False):
         """
         Inicializuje fake PWM výstup.
 
         Parametry:
-            pin         – libovolný objekt reprezentující pin
-            frequency   – počáteční frekvence PWM
-            duty_cycle  – počáteční šířka pulzu
+            pin                – libovolný objekt reprezentující pin
+            frequency          – počáteční frekvence PWM
+            duty_cycle         – počáteční šířka pulzu
+            variable_frequency – zda se bude frekvence měnit (např. bzučák)
 
-        Uloží počáteční stav do history.
+        Uloží počáteční stav do history a timeline.
         """
         self.pin = pin
-        self.frequency = frequency
-        self.duty_cycle = duty_cycle
+        self.variable_frequency = variable_frequency
+        self._frequency = frequency
+        self._duty_cycle = duty_cycle
+        self._cost_label = f"pwm:{getattr(pin, 'name', pin)}"
+        self._trace_name = str(getattr(pin, "name", pin))
 
         # Pro testy: historie všech změn
         self.history = [(frequency, duty_cycle)]
+        # Časová osa zápisů (µs, frekvence, duty_cycle)
+        self.timeline_us = array("q")
+        self.timeline_frequency = array("L")
+        self.timeline_duty = array("H")
+        self._record()
+
+    def _record(self):
+        """Uloží aktuální stav s časem do timeline."""
+        self.timeline_us.append(ticks.fake_ticks_us())
+        self.timeline_frequency.append(int(self._frequency))
+        self.timeline_duty.append(int(self._duty_cycle))
+
+    @property
+    def frequency(self):
+        """Aktuální frekvence PWM v Hz."""
+        return self._frequency
+
+    @frequency.setter
+    def frequency(self, value):
+        # Na reálném zařízení stojí změna frekvence přepočet děličky,
+        # zápis stejné hodnoty je zdarma.
+        if value != self._frequency:
+            costmodel.charge(self._cost_label,
+                             costmodel.COSTS["pwm_frequency_change_us"])
+            pintrace.record(self._trace_name + ".freq", value, 32)
+        self._frequency = value
+        self.history.append((value, self._duty_cycle))
+        self._record()
+
+    @property
+    def duty_cycle(self):
+        """Aktuální šířka pulzu (0–65535)."""
+        return self._duty_cycle
+
+    @duty_cycle.setter
+    def duty_cycle(self, value):
+        if value != self._duty_cycle:
+            pintrace.record(self._trace_name + ".duty", value, 16)
+        self._duty_cycle = value
+        self.history.append((self._frequency, value))
+        self._record()
 
     def deinit(self):
         """
@@ -74,7 +137,6 @@ class PWMOut:
         Uloží změnu do history.
         """
         self.duty_cycle = value
-        self.history.append((self.frequency, value))
 
     def set_frequency(self, value):
         """
@@ -86,4 +148,3 @@ class PWMOut:
         Uloží změnu do history.
         """
         self.frequency = value
-        self.history.append((value, self.duty_cycle))
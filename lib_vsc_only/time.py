@@ -43,11 +43,11 @@ def sleep(seconds: float) -> None:
         time.sleep() blokuje vlákno.
 
     V této fake verzi:
-        - pouze posune simulovaný čas
+        - pouze posune simulovaný čas (s přesností na µs, takže
+          i time.sleep(0.00001) u ultrazvuku je v čase vidět)
         - testy běží okamžitě
     """
-    ms = int(seconds * 1000)
-    ticks.advance_ticks(ms)
+    ticks.advance_ticks_us(round(seconds * 1_000_000))
 
 
 def sleep_ms(ms: int) -> None:
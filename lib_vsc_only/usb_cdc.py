@@ -0,0 +1,109 @@
+"""
+usb_cdc.py – společný stub pro VS Code a fake hardware pro testy.
+
+Tento modul napodobuje CircuitPython modul `usb_cdc`, který zpřístupňuje
+sériové porty přes USB (konzoli s REPL a volitelný datový port).
+
+V této verzi:
+- modul je určený pro vývoj na PC (VS Code / Pylance)
+- funguje jako fake hardware pro unit testy
+- všechno zapsané do portu se ukládá do atributu output
+- data pro čtení lze vložit pomocí queue_read()
+
+Příklad:
+    >>> import usb_cdc
+    >>> usb_cdc.enable(console=True, data=True)
+    >>> usb_cdc.data.write(b"1,2\\n")
+    >>> usb_cdc.data.output
+    bytearray(b'1,2\\n')
+
+Reálný modul `usb_cdc` je součástí CircuitPythonu a není dostupný na PC.
+Tento soubor slouží pro výuku, vývoj a testování.
+"""
+
+
+class Serial:
+    """
+    Fake verze třídy usb_cdc.Serial z CircuitPythonu.
+
+    V reálném zařízení:
+        - posílá a přijímá bajty přes USB (virtuální COM port na PC)
+        - write() vrátí počet zapsaných bajtů
+
+    V této fake verzi:
+        - zapsané bajty se přidávají do output (bytearray)
+        - read() vrací data vložená pomocí queue_read()
+        - connected je vždy True
+
+    Atributy:
+        output – všechno, co se do portu zapsalo
+        timeout, write_timeout – jen se ukládají
+    """
+
+    def __init__(self):
+        self.output = bytearray()
+        self.timeout = 1
+        self.write_timeout = None
+        self._input = bytearray()
+
+    @property
+    def connected(self):
+        """Fake: port je vždy připojený."""
+        return True
+
+    @property
+    def in_waiting(self):
+        """Počet bajtů připravených ke čtení."""
+        return len(self._input)
+
+    def queue_read(self, data):
+        """FakeHW: vloží bajty, které vrátí další read()."""
+        self._input.extend(data)
+
+    def read(self, size=1):
+        """Vrátí nejvýše size bajtů z dat vložených pomocí queue_read()."""
+        data = bytes(self._input[:size])
+        del self._input[:size]
+        return data
+
+    def readline(self):
+        """Vrátí jeden řádek (včetně \\n) nebo všechno, co zbývá."""
+        end = self._input.find(b"\n")
+        return self.read(len(self._input) if end < 0 else end + 1)
+
+    def write(self, buffer):
+        """Uloží bajty do output a vrátí jejich počet."""
+        self.output.extend(buffer)
+        return len(buffer)
+
+    def flush(self):
+        """Fake: nic nedělá."""
+        pass
+
+    def reset_input_buffer(self):
+        """Smaže data připravená ke čtení."""
+        self._input = bytearray()
+
+    def reset_output_buffer(self):
+        """Smaže output."""
+        self.output = bytearray()
+
+
+console = Serial()
+data = None
+
+
+def enable(*, console=True, data=False):
+    """
+    Zapne nebo vypne konzoli a datový port (v CircuitPythonu jen v boot.py).
+
+    Ve fake verzi se změna projeví hned: usb_cdc.data je po enable(data=True)
+    objekt Serial, jinak None.
+    """
+    # Parametry se jmenuji stejne jako promenne modulu, proto pres globals()
+    globals().update(console=Serial() if console else None, data=Serial() if data else None)
+
+
+def disable():
+    """Vypne konzoli i datový port."""
+    enable(console=False, data=False)
@@ -0,0 +1,13 @@
+# Spolecne nastaveni testu: knihovny z lib/ se importuji nad stuby z lib_vsc_only/ (fakehw),
+# nastroje z .vscode/ jako obycejne moduly.
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (os.path.join(ROOT_DIR, "lib_vsc_only"), os.path.join(ROOT_DIR, ".vscode")):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import fakehw  # noqa: E402
+
+fakehw.setup_path()
@@ -0,0 +1,78 @@
+# lib/buttons.py: odruseni, udalosti PRESS/RELEASE/LONG_PRESS a kruhovy buffer.
+import asyncio
+
+import adafruit_ticks as ticks
+import picoed
+import pytest
+
+import fakehw
+
+buttons = fakehw.import_lib("buttons")
+
+
+@pytest.fixture
+def pair():
+    ticks.set_ticks_ms(0)
+    return picoed.Button(), picoed.Button()
+
+
+def step(events, ms, poll_ms=10):
+    for _ in range(ms // poll_ms):
+        ticks.advance_ticks(poll_ms)
+        events.poll()
+
+
+def drain(events):
+    return list(iter(events.get, None))
+
+
+def test_click_with_long_press(pair):
+    a, b = pair
+    events = buttons.ButtonEvents((a, b))
+    a.click(at_ms=100, hold_ms=900)
+    step(events, 1200)
+    assert drain(events) == [
+        (a, buttons.PRESS, 120),
+        (a, buttons.LONG_PRESS, 820),
+        (a, buttons.RELEASE, 1020),
+    ]
+
+
+def test_bounces_are_filtered(pair):
+    a, b = pair
+    events = buttons.ButtonEvents((a, b), poll_ms=1)
+    b.click(at_ms=50, hold_ms=200, bounces=3)
+    step(events, 400, poll_ms=1)
+    assert [kind for _, kind, _ in drain(events)] == [buttons.PRESS, buttons.RELEASE]
+    assert not events.is_pressed(b)
+
+
+def test_short_glitch_is_ignored(pair):
+    a, b = pair
+    events = buttons.ButtonEvents((a, b), poll_ms=1)
+    a.inject([(10, True), (15, False)])
+    step(events, 100, poll_ms=1)
+    assert drain(events) == []
+
+
+def test_full_buffer_drops_new_events(pair):
+    a, b = pair
+    events = buttons.ButtonEvents((a, b), size=2)
+    for at_ms in (100, 300, 500):
+        a.click(at_ms=at_ms, hold_ms=100)
+    step(events, 800)
+    assert len(events) == 2
+    assert events.dropped == 4
+    assert [kind for _, kind, _ in drain(events)] == [buttons.PRESS, buttons.RELEASE]
+
+
+def test_async_iteration(pair):
+    a, b = pair
+    events = buttons.ButtonEvents((a, b))
+
+    async def main():
+        events.push(1, buttons.PRESS, 5)
+        async for event in events:
+            return event
+
+    assert asyncio.run(main()) == (b, buttons.PRESS, 5)
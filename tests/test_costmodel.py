@@ -0,0 +1,99 @@
+# lib_vsc_only/costmodel.py a simulovane hodiny adafruit_ticks.
+import adafruit_ticks as ticks
+import busio
+import board
+import pytest
+
+import costmodel
+
+
+@pytest.fixture(autouse=True)
+def model():
+    ticks.set_ticks_ms(0)
+    yield costmodel
+    costmodel.disable()
+    costmodel.reset_costs()
+    costmodel.reset()
+
+
+def test_ticks_us_remainder_accumulates():
+    for _ in range(4):
+        ticks.advance_ticks_us(300)
+    assert ticks.ticks_ms() == 1
+    assert ticks.fake_ticks_us() == 1200
+    ticks.set_ticks_ms(5)
+    assert ticks.fake_ticks_us() == 5000
+
+
+def test_ticks_wrap_around():
+    ticks.set_ticks_ms(ticks._TICKS_MAX)
+    start = ticks.ticks_ms()
+    ticks.advance_ticks(10)
+    assert ticks.ticks_ms() == 9
+    assert ticks.ticks_diff(ticks.ticks_ms(), start) == 10
+    assert ticks.ticks_add(start, 10) == 9
+    assert ticks.ticks_less(start, ticks.ticks_ms())
+
+
+def test_disabled_model_costs_nothing():
+    costmodel.charge("i2c:P19", 500, bus=True)
+    assert ticks.fake_ticks_us() == 0
+
+
+def test_i2c_transfer_time():
+    # (2 bajty + adresa) x 9 bitu pri 100 kHz + START/STOP
+    assert costmodel.i2c_transfer_us(2, 100_000) == pytest.approx(270 + 5)
+    assert costmodel.neopixel_show_us(2) == 2 * 30 + 50
+
+
+def test_fractions_are_not_lost():
+    costmodel.enable()
+    for _ in range(10):
+        costmodel.charge("pwm:P1", 0.25)
+    assert ticks.fake_ticks_us() == 2
+    costmodel.charge("pwm:P1", 0.5)
+    assert ticks.fake_ticks_us() == 3
+
+
+def test_loop_report_shares_and_buses():
+    costmodel.enable()
+    costmodel.charge("i2c:P19", 300, bus=True)
+    costmodel.charge("neopixel:P15", 100)
+    ticks.advance_ticks_us(600)
+    report = costmodel.loop_mark()
+    assert report["loop_us"] == 1000
+    assert report["peripherals"]["i2c:P19"] == (300, 1, pytest.approx(0.3))
+    assert report["peripherals"]["neopixel:P15"] == (100, 1, pytest.approx(0.1))
+    assert report["buses"] == {"i2c:P19": pytest.approx(0.3)}
+    assert costmodel.loops == [report]
+    # dalsi smycka zacina od nuly
+    assert costmodel.loop_mark()["peripherals"] == {}
+
+
+def test_reset_forgets_buses():
+    costmodel.enable()
+    costmodel.charge("i2c:P19", 100, bus=True)
+    costmodel.reset()
+    costmodel.charge("i2c:P19", 100)
+    assert costmodel.loop_mark()["buses"] == {}
+
+
+def test_calibration_override():
+    with pytest.raises(KeyError):
+        costmodel.enable(i2c_speed=1)
+    costmodel.enable(i2c_start_stop_us=0)
+    assert costmodel.i2c_transfer_us(2, 100_000) == pytest.approx(270)
+    costmodel.reset_costs()
+    assert costmodel.COSTS["i2c_start_stop_us"] == 5
+
+
+def test_i2c_stub_is_charged():
+    costmodel.enable()
+    i2c = busio.I2C(board.P19, board.P20)
+    i2c.writeto(0x10, bytes(3))
+    report = costmodel.loop_mark()
+    name = "i2c:" + getattr(board.P19, "name", str(board.P19))
+    busy_us, count, _ = report["peripherals"][name]
+    assert count == 1
+    assert busy_us == pytest.approx(costmodel.i2c_transfer_us(3, i2c.frequency))
+    assert name in report["buses"]
@@ -0,0 +1,153 @@
+# .vscode/deploy.py --sync: co se nahraje, co se smaze a co je v manifestu.
+import functools
+import hashlib
+import json
+import os
+import sys
+
+import pytest
+
+import deploy
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+def read(path):
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    root = tmp_path / "project"
+    write(str(root / "code.py"), "import cutebot\n")
+    write(str(root / "lib" / "cutebot.py"), '"""Driver"""\n\n# comment\nSPEED = 1\n')
+    write(str(root / "lib" / "ringbit.py"), "SPEED = 2\n")
+    write(str(root / "README.md"), "readme\n")
+    write(str(root / ".vscode" / "deploy.py"), "# tool\n")
+    write(str(root / ".vscode" / ".ignoreCopy"), "README.md\ntests/*\n")
+    write(str(root / "tests" / "test_x.py"), "def test(): pass\n")
+    monkeypatch.setattr(deploy, "ROOT_DIR", str(root))
+    monkeypatch.setattr(deploy, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(deploy, "load_ignore", functools.partial(
+        deploy.load_ignore, str(root / ".vscode" / ".ignoreCopy")))
+    return root
+
+
+@pytest.fixture
+def board(tmp_path):
+    dest = tmp_path / "CIRCUITPY"
+    dest.mkdir()
+    write(str(dest / "boot_out.txt"), "Adafruit CircuitPython\n")
+    return dest
+
+
+def sync(monkeypatch, board, *options):
+    monkeypatch.setattr(sys, "argv", ["deploy.py", "--sync", "--dest", str(board), *options])
+    deploy.main()
+
+
+def manifest(board):
+    with open(os.path.join(str(board), deploy.MANIFEST), encoding="utf-8") as file:
+        return json.load(file)
+
+
+def board_files(board):
+    return sorted(
+        os.path.relpath(os.path.join(directory, name), str(board)).replace(os.sep, "/")
+        for directory, _, files in os.walk(str(board)) for name in files
+    )
+
+
+def test_first_sync_copies_project(project, board, monkeypatch):
+    sync(monkeypatch, board, "--mode", "py")
+    assert board_files(board) == [deploy.MANIFEST, "boot_out.txt", "code.py", "lib/cutebot.py", "lib/ringbit.py"]
+    assert manifest(board) == {
+        "code.py": digest("import cutebot\n"),
+        "lib/cutebot.py": digest(read(str(project / "lib" / "cutebot.py"))),
+        "lib/ringbit.py": digest("SPEED = 2\n"),
+    }
+
+
+def test_second_sync_copies_nothing(project, board, monkeypatch, capsys):
+    sync(monkeypatch, board, "--mode", "py")
+    capsys.readouterr()
+    sync(monkeypatch, board, "--mode", "py")
+    assert "Zkopirovano 0, beze zmeny 3, smazano 0." in capsys.readouterr().out
+
+
+def test_changed_file_is_copied(project, board, monkeypatch, capsys):
+    sync(monkeypatch, board, "--mode", "py")
+    write(str(project / "lib" / "ringbit.py"), "SPEED = 3\n")
+    capsys.readouterr()
+    sync(monkeypatch, board, "--mode", "py")
+    assert "Zkopirovano 1, beze zmeny 2, smazano 0." in capsys.readouterr().out
+    assert read(str(board / "lib" / "ringbit.py")) == "SPEED = 3\n"
+    assert manifest(board)["lib/ringbit.py"] == digest("SPEED = 3\n")
+
+
+def test_removed_file_is_deleted_from_board(project, board, monkeypatch):
+    sync(monkeypatch, board, "--mode", "py")
+    os.remove(str(project / "lib" / "ringbit.py"))
+    sync(monkeypatch, board, "--mode", "py")
+    assert not (board / "lib" / "ringbit.py").exists()
+    assert "lib/ringbit.py" not in manifest(board)
+
+
+def test_files_not_uploaded_by_deploy_are_kept(project, board, monkeypatch):
+    # Soubory, ktere deploy sam nenahral (nejsou v manifestu), se nikdy nemazou
+    write(str(board / "settings.toml"), "WIFI=1\n")
+    write(str(board / "lib" / "neopixel.mpy"), "mpy\n")
+    sync(monkeypatch, board, "--mode", "py")
+    sync(monkeypatch, board, "--mode", "py")
+    assert (board / "settings.toml").exists()
+    assert (board / "lib" / "neopixel.mpy").exists()
+    assert (board / "boot_out.txt").exists()
+
+
+def test_missing_manifest_deletes_nothing(project, board, monkeypatch):
+    sync(monkeypatch, board, "--mode", "py")
+    os.remove(str(board / deploy.MANIFEST))
+    os.remove(str(project / "lib" / "ringbit.py"))
+    sync(monkeypatch, board, "--mode", "py")
+    assert (board / "lib" / "ringbit.py").exists()
+
+
+def test_stale_variant_is_replaced(project, board, monkeypatch):
+    # Drive nahrany .mpy se pri prechodu na .py smaze, jinak by se nacital on
+    write(str(board / "lib" / "cutebot.mpy"), "old\n")
+    with open(os.path.join(str(board), deploy.MANIFEST), "w", encoding="utf-8") as file:
+        json.dump({"lib/cutebot.mpy": digest("old\n")}, file)
+    sync(monkeypatch, board, "--mode", "py")
+    assert not (board / "lib" / "cutebot.mpy").exists()
+    assert (board / "lib" / "cutebot.py").exists()
+    assert "lib/cutebot.mpy" not in manifest(board)
+
+
+def test_verify_catches_file_changed_on_board(project, board, monkeypatch):
+    sync(monkeypatch, board, "--mode", "py")
+    write(str(board / "lib" / "ringbit.py"), "edited on the board\n")
+    sync(monkeypatch, board, "--mode", "py")
+    assert read(str(board / "lib" / "ringbit.py")) == "edited on the board\n"
+    sync(monkeypatch, board, "--mode", "py", "--verify")
+    assert read(str(board / "lib" / "ringbit.py")) == "SPEED = 2\n"
+
+
+def test_min_mode_manifest_hashes_output(project, board, monkeypatch):
+    sync(monkeypatch, board, "--mode", "min")
+    assert read(str(board / "lib" / "cutebot.py")) == "SPEED = 1\n"
+    assert read(str(board / "code.py")) == "import cutebot\n"
+    assert manifest(board)["lib/cutebot.py"] == digest("SPEED = 1\n")
+
+
+def test_dry_run_writes_nothing(project, board, monkeypatch):
+    sync(monkeypatch, board, "--mode", "py", "--dry-run")
+    assert board_files(board) == ["boot_out.txt"]
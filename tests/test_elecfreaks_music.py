@@ -0,0 +1,49 @@
+# lib/elecfreaks_music.py: vestavene melodie z datoveho souboru se chovaji jako seznamy not.
+import board
+import pytest
+
+import fakehw
+
+music = fakehw.import_lib("elecfreaks_music")
+
+NAMES = [name for name in dir(music.Music) if name.isupper() and isinstance(getattr(music.Music, name), music._Tune)]
+
+
+def test_melodies_exist():
+    assert "NYAN" in NAMES and "BA_DING" in NAMES
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_indexing_matches_iteration(name):
+    tune = getattr(music.Music, name)
+    notes = list(tune)
+    assert len(tune) == len(notes)
+    assert [tune[i] for i in range(len(tune))] == notes
+    # zpetne a nahodne poradi (kurzor se musi vratit na zacatek)
+    assert [tune[i] for i in reversed(range(len(tune)))] == notes[::-1]
+    assert tune[-1] == notes[-1]
+    assert tune[1:3] == notes[1:3]
+    with pytest.raises(IndexError):
+        tune[len(notes)]
+
+
+def test_switching_tunes_keeps_cursor_consistent():
+    first = music.Music.NYAN
+    second = music.Music.BA_DING
+    expected = (list(first), list(second))
+    for i in range(3):
+        assert first[i] == expected[0][i]
+        assert second[i % len(expected[1])] == expected[1][i % len(expected[1])]
+
+
+def test_concatenation():
+    assert music.Music.BA_DING + ["c4:4"] == list(music.Music.BA_DING) + ["c4:4"]
+    assert ["c4:4"] + music.Music.BA_DING == ["c4:4"] + list(music.Music.BA_DING)
+
+
+def test_play_uses_the_notes():
+    player = music.Music(board.BUZZER, 4, 6000)
+    played = []
+    player.pitch = lambda frequency, duration=-1: played.append(frequency)
+    player.play(music.Music.BA_DING)
+    assert len(played) == len(music.Music.BA_DING)
@@ -0,0 +1,118 @@
+# lib/linefollow.py: celociselny PID, zapisy do motoru a terminy smycky.
+import adafruit_ticks as ticks
+import pytest
+
+import fakehw
+
+linefollow = fakehw.import_lib("linefollow")
+
+
+class Robot:
+    # Jen to, co LineFollower od Cutebotu potrebuje
+    def __init__(self, bits=3):
+        self.bits = bits
+        self.speeds = []
+
+    def get_tracking_bits(self):
+        return self.bits
+
+    def set_speed(self, left, right):
+        self.speeds.append((left, right))
+
+
+@pytest.fixture(autouse=True)
+def clock():
+    ticks.set_ticks_ms(0)
+
+
+def test_fixed_point_gains():
+    assert linefollow._fixed(1) == 256
+    assert linefollow._fixed(0.3) == 77
+    assert linefollow._fixed(-0.3) == -77
+    assert linefollow._fixed(0) == 0
+
+
+def test_step_output():
+    robot = Robot(bits=0b01)             # jen levy senzor na care
+    follower = linefollow.LineFollower(robot, speed=40, kp=25, kd=30)
+    assert follower.step() == -1
+    # (25 * -1 + 30 * (-1 - 0)) = -55
+    assert robot.speeds == [(-15, 95)]
+    robot.bits = 0b11
+    assert follower.step() == 0
+    # derivace: 30 * (0 - -1) = 30
+    assert robot.speeds[-1] == (70, 10)
+
+
+def test_fractional_gain():
+    robot = Robot(bits=0b10)
+    follower = linefollow.LineFollower(robot, speed=40, kp=2.5, kd=0)
+    follower.step()
+    assert robot.speeds == [(42, 38)]     # (640 * 1) >> 8 = 2
+
+
+def test_lost_line_uses_last_side():
+    robot = Robot(bits=0b10)
+    follower = linefollow.LineFollower(robot, kp=10, kd=0)
+    assert follower.step() == 1
+    robot.bits = 0
+    assert follower.step() == 2
+    robot.bits = 0b01
+    follower.step()
+    robot.bits = 0
+    assert follower.step() == -2
+
+
+def test_invert_flips_sensors():
+    robot = Robot(bits=0b11)             # svetla cara: oba senzory hlasi 1 mimo caru
+    follower = linefollow.LineFollower(robot, invert=True)
+    assert follower.step() == 2
+
+
+def test_writes_only_when_speed_changes():
+    robot = Robot(bits=0b11)
+    follower = linefollow.LineFollower(robot)
+    for _ in range(5):
+        follower.step()
+    assert follower.loops == 5
+    assert follower.writes == 1
+    assert robot.speeds == [(40, 40)]
+
+
+def test_integral_limit_and_clamp():
+    robot = Robot(bits=0b10)
+    follower = linefollow.LineFollower(robot, speed=90, kp=0, ki=30, kd=0, integral_limit=3)
+    for _ in range(5):
+        follower.step()
+    assert follower._integral == 3
+    assert robot.speeds[-1] == (100, 0)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        linefollow.LineFollower(Robot(), speed=101)
+    with pytest.raises(ValueError):
+        linefollow.LineFollower(Robot(), period_ms=0)
+
+
+def test_poll_counts_missed_deadlines():
+    follower = linefollow.LineFollower(Robot(), period_ms=10)
+    assert follower.poll() == 10
+    assert follower.loops == 1
+    ticks.advance_ticks(4)
+    assert follower.poll() == 6
+    assert follower.loops == 1
+    ticks.advance_ticks(31)              # 35 ms: termin 10 o 25 ms pozde -> 2 zmeskane
+    follower.poll()
+    assert follower.loops == 2
+    assert follower.overruns == 2
+    assert follower.max_late_ms == 5
+
+
+def test_run_stops_motors():
+    robot = Robot(bits=0b01)
+    follower = linefollow.LineFollower(robot, period_ms=10)
+    follower.run(100)
+    assert follower.loops == 10
+    assert robot.speeds[-1] == (0, 0)
+    assert "10 steps" in follower.report()
@@ -0,0 +1,98 @@
+# lib/motion.py: tabulky rychlosti (slucovani, rozjezd a zastaveni) a jejich prehravani.
+import asyncio
+
+import pytest
+
+import fakehw
+
+motion = fakehw.import_lib("motion")
+
+
+class Robot:
+    def __init__(self):
+        self.speeds = []
+
+    def set_speed(self, left, right):
+        self.speeds.append((left, right))
+
+
+def rows(profile):
+    return list(zip(profile.left, profile.right, profile.hold_ms))
+
+
+def test_trapezoid_merges_constant_speed():
+    profile = motion.Profile(60, 60, 1000, accel=200, rate_hz=50)
+    table = rows(profile)
+    assert profile.steps == 50
+    assert sum(profile.hold_ms) == 1000
+    assert table[-1] == (0, 0, 0)
+    assert max(profile.left) == 60
+    # rozjezd 60 / 200 = 300 ms po 20 ms, stala rychlost je jeden radek
+    assert 0 < table[0][0] < 60
+    assert [row for row in table if row[0] == 60] == [(60, 60, 1000 - 2 * 300)]
+    assert all(a[:2] != b[:2] for a, b in zip(table, table[1:]))
+    assert profile.writes == len(table) < profile.steps
+
+
+def test_short_move_is_triangular():
+    profile = motion.Profile(100, 100, 200, accel=200, rate_hz=50)
+    assert 0 < max(profile.left) < 100
+    assert sum(profile.hold_ms) == 200
+
+
+def test_scale_follows_faster_wheel():
+    profile = motion.Profile(80, -40, 1000, accel=400, rate_hz=50)
+    assert all(left == -2 * right or abs(left + 2 * right) <= 1
+               for left, right in zip(profile.left, profile.right))
+    assert max(profile.left) == 80
+    assert min(profile.right) == -40
+
+
+def test_without_stop():
+    profile = motion.Profile(30, 30, 100, stop=False)
+    assert rows(profile)[-1][:2] != (0, 0)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        motion.Profile(101, 0, 100)
+    with pytest.raises(ValueError):
+        motion.Profile(50, 50, 0)
+    with pytest.raises(ValueError):
+        motion.Profile(50, 50, 100, accel=0)
+
+
+def test_player_helpers():
+    player = motion.MotionPlayer(Robot(), accel=300, rate_hz=25)
+    turn = player.turn(40, 400)
+    assert [-value for value in turn.left] == list(turn.right)
+    drive = player.drive(-50, 400)
+    assert list(drive.left) == list(drive.right)
+    assert min(drive.left) == -50
+
+
+def test_play_writes_every_row():
+    robot = Robot()
+    player = motion.MotionPlayer(robot, accel=2000, rate_hz=100)
+    profile = player.drive(50, 60)
+    written = asyncio.run(player.play(profile))
+    assert written == profile.writes
+    assert robot.speeds == list(zip(profile.left, profile.right))
+    assert (player.moves, player.writes, player.last_writes) == (1, written, written)
+    assert player._steps == profile.steps
+
+
+def test_cancel_stops_wheels():
+    robot = Robot()
+    player = motion.MotionPlayer(robot)
+
+    async def main():
+        player.start(player.drive(60, 5000))
+        await asyncio.sleep(0.05)
+        player.cancel()
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert robot.speeds[-1] == (0, 0)
+    assert player.moves == 1
+    assert player._steps < player.drive(60, 5000).steps
@@ -0,0 +1,57 @@
+# .vscode/ploter.py: vyber portu a prehravani zaznamu (bez grafu a bez skutecneho portu).
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("serial")
+pytest.importorskip("matplotlib")
+
+import ploter  # noqa: E402
+
+
+def port(device, interface=None, description="", location=None):
+    return SimpleNamespace(device=device, interface=interface, description=description,
+                           location=location, vid=0x2E8A, pid=0x1031)
+
+
+@pytest.fixture
+def ports(monkeypatch):
+    found = []
+    monkeypatch.setattr(ploter.serial.tools.list_ports, "comports", lambda: found)
+    return found
+
+
+def test_no_port(ports):
+    assert ploter.find_com_device(0x2E8A, 0x1031) is None
+
+
+def test_higher_port_number_wins(ports):
+    ports.extend([port("COM10"), port("COM9")])
+    assert ploter.find_com_device(0x2E8A, 0x1031) == "COM10"
+
+
+def test_data_port_by_description(ports):
+    ports.extend([port("COM10", description="CircuitPython CDC control"),
+                  port("COM9", description="CircuitPython CDC2 data")])
+    assert ploter.find_com_device(0x2E8A, 0x1031) == "COM9"
+
+
+def test_data_port_by_interface_number(ports):
+    ports.extend([port("/dev/ttyACM1", location="1-1:1.0"), port("/dev/ttyACM0", location="1-1:1.2")])
+    assert ploter.find_com_device(0x2E8A, 0x1031) == "/dev/ttyACM0"
+
+
+def test_format_row_keeps_gaps():
+    nan = float("nan")
+    assert ploter.format_row(np.array([5.0, 1.0, nan, 3.0])) == "5,1,nan,3\n"
+    assert ploter.format_row(np.array([5.0, 1.0, nan, nan])) == "5,1\n"
+    assert ploter.format_row(np.array([5.0, nan, nan])) == "5,nan\n"
+
+
+def test_replayed_row_stays_in_its_channel():
+    nan = float("nan")
+    parser = ploter.LineParser()
+    values = parser.feed(ploter.format_row(np.array([5.0, nan, 2.0])).encode())
+    assert values.shape == (1, 3)
+    assert np.isnan(values[0, 1]) and values[0, 2] == 2.0
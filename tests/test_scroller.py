@@ -0,0 +1,90 @@
+# lib/scroller.py: vykresleni textu, LRU cache a zapis jen zmenenych pixelu.
+import asyncio
+
+import picoed
+
+import fakehw
+
+scroller = fakehw.import_lib("scroller")
+
+
+def lit(display):
+    return [(x, y) for y in range(display.height) for x in range(display.width) if display.pixel(x, y)]
+
+
+def test_render_columns():
+    columns = scroller.render("I?")
+    assert len(columns) == 12
+    assert bytes(columns[:6]) == b"\x00\x41\x7f\x41\x00\x00"
+    # znak mimo font se vykresli jako '?'
+    assert scroller.render("é") == scroller.render("?")
+
+
+def test_cache_is_lru():
+    cache = scroller.ColumnCache(2)
+    first = cache.get("a")
+    cache.get("b")
+    assert cache.get("a") is first      # "a" je ted nejnovejsi
+    cache.get("c")                      # vyhodi "b"
+    assert cache.get("a") is first
+    assert cache.get("b") is not None
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert sorted(cache._items) == ["a", "b"]
+
+
+def test_cache_without_size_renders_every_time():
+    cache = scroller.ColumnCache(0)
+    assert cache.get("a") == cache.get("a")
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert cache._items == {}
+
+
+def test_draw_writes_only_changed_pixels():
+    display = picoed.Display()
+    text = scroller.Scroller(display)
+    text.clear()
+    text.show("I")
+    assert lit(display) == [(1, 0), (2, 0), (3, 0), (2, 1), (2, 2), (2, 3), (2, 4), (2, 5), (1, 6), (2, 6), (3, 6)]
+    writes = text.pixel_writes
+    assert writes == 11
+    text.show("I")
+    assert text.pixel_writes == writes
+    text.show("I", brightness=50)       # novy jas: prepsat jen rozsvicene pixely
+    assert display.pixel(2, 0) == 50
+    assert text.pixel_writes == 2 * writes
+
+
+def test_first_draw_rewrites_whole_display():
+    # Bez clear() scroller nevi, co na displeji je
+    display = picoed.Display()
+    display.fill(9)
+    text = scroller.Scroller(display)
+    text.show("I")
+    assert text.pixel_writes == display.width * display.height
+    assert len(lit(display)) == 11
+
+
+def test_frames_scroll_across_display():
+    display = picoed.Display()
+    text = scroller.Scroller(display)
+    offsets = list(text.frames("Hi"))
+    assert offsets[0] == -display.width
+    assert offsets[-1] == len(scroller.render("Hi")) - 1
+    assert lit(display) == []
+
+
+def test_start_cancels_previous_message():
+    display = picoed.Display()
+    text = scroller.Scroller(display, delay_ms=1)
+
+    async def main():
+        first = text.start("first")
+        await asyncio.sleep(0.01)
+        text.start("second")
+        await asyncio.sleep(0)
+        assert first.cancelled()
+        assert text.scrolling
+        text.cancel()
+        assert not text.scrolling
+
+    asyncio.run(main())
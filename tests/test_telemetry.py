@@ -0,0 +1,150 @@
+# lib/telemetry.py: CRC, volba portu a cesta vzorku az do parseru v .vscode/ploter.py.
+import math
+import random
+
+import pytest
+
+import fakehw
+import usb_cdc
+
+telemetry = fakehw.import_lib("telemetry")
+
+
+class Sink:
+    def __init__(self):
+        self.output = bytearray()
+
+    def write(self, data):
+        self.output += data
+        return len(data)
+
+
+@pytest.fixture
+def ploter():
+    pytest.importorskip("numpy")
+    pytest.importorskip("serial")
+    pytest.importorskip("matplotlib")
+    import ploter
+    return ploter
+
+
+@pytest.fixture
+def ports():
+    yield usb_cdc
+    usb_cdc.enable(console=True, data=False)
+
+
+def send_all(tele, rows):
+    for x, values in rows:
+        tele.send(x, values)
+
+
+def test_crc16_check_value():
+    # Kontrolni hodnota CRC-16/CCITT-FALSE pro "123456789"
+    data = b"123456789"
+    assert telemetry.crc16(data, 0, len(data)) == 0x29B1
+    assert telemetry.crc16(b"xx" + data, 2, 11) == 0x29B1
+
+
+def test_frame_layout():
+    sink = Sink()
+    tele = telemetry.Telemetry(2, sink)
+    tele.send(0x01020304, [1.5, -2.0])
+    frame = bytes(sink.output)
+    assert len(frame) == 8 + 4 * 2 + 2
+    assert frame[:4] == bytes((telemetry.SYNC_0, telemetry.SYNC_1, 2, 0))
+    assert frame[4:8] == bytes((4, 3, 2, 1))
+    assert int.from_bytes(frame[-2:], "little") == telemetry.crc16(frame, 2, len(frame) - 2)
+
+
+def test_channels_out_of_range():
+    with pytest.raises(ValueError):
+        telemetry.Telemetry(0, Sink())
+    with pytest.raises(ValueError):
+        telemetry.Telemetry(256, Sink())
+
+
+def test_default_stream_is_data_port(ports):
+    ports.enable(console=True, data=True)
+    tele = telemetry.Telemetry(1)
+    assert tele.stream is ports.data
+    assert tele.binary
+
+
+def test_console_only_falls_back_to_text(ports):
+    # Bez datoveho portu by binarni ramce skoncily v REPL
+    ports.enable(console=True, data=False)
+    tele = telemetry.Telemetry(2)
+    assert tele.stream is ports.console
+    assert not tele.binary
+    start = len(ports.console.output)
+    tele.send(7, [1.0, 2.5])
+    assert bytes(ports.console.output[start:]) == b"7,1.0,2.5\n"
+
+
+def test_binary_round_trip(ploter):
+    rows = [(1000 + 10 * i, [i * 0.5, -i, math.pi]) for i in range(200)]
+    sink = Sink()
+    tele = telemetry.Telemetry(3, sink)
+    tele.header(("ms", "left", "right", "pi"))
+    send_all(tele, rows)
+
+    parser = ploter.FrameParser()
+    values = parser.feed(bytes(sink.output))
+    assert parser.labels == ["ms", "left", "right", "pi"]
+    assert (parser.lines_ok, parser.lines_bad, parser.lines_lost) == (200, 0, 0)
+    assert values.shape == (200, 4)
+    assert values[:, 0].tolist() == [x for x, _ in rows]
+    # float32 na draze
+    assert values[:, 1:].ravel().tolist() == pytest.approx([v for _, row in rows for v in row], rel=1e-6)
+
+
+def test_binary_round_trip_in_random_chunks(ploter):
+    rows = [(i, [float(i), 0xA5 + 0x5A * 256.0]) for i in range(300)]
+    sink = Sink()
+    tele = telemetry.Telemetry(2, sink)
+    tele.header(("ms", "a", "b"))
+    send_all(tele, rows)
+    data = bytes(sink.output)
+
+    generator = random.Random(1)
+    for _ in range(20):
+        parser = ploter.FrameParser()
+        parts = []
+        position = 0
+        while position < len(data):
+            step = generator.randint(1, 40)
+            parts.append(parser.feed(data[position:position + step]))
+            position += step
+        assert parser.labels == ["ms", "a", "b"]
+        assert [row[0] for part in parts for row in part] == [x for x, _ in rows]
+        assert parser.lines_bad == 0
+
+
+def test_corrupted_and_lost_frames(ploter):
+    sink = Sink()
+    tele = telemetry.Telemetry(1, sink)
+    frame_size = 8 + 4 + 2
+    for x in range(10):
+        tele.send(x, [x])
+    data = bytearray(sink.output)
+    data[3 * frame_size + 8] ^= 0xFF                     # vadna hodnota ve 4. ramci
+    del data[6 * frame_size:7 * frame_size]              # 7. ramec se ztratil
+
+    parser = ploter.FrameParser()
+    values = parser.feed(bytes(data))
+    assert values[:, 0].tolist() == [0, 1, 2, 4, 5, 7, 8, 9]
+    assert parser.lines_bad == 1
+    assert parser.lines_lost == 2
+
+
+def test_text_round_trip(ploter):
+    sink = Sink()
+    tele = telemetry.Telemetry(2, sink, binary=False)
+    tele.header(("ms", "a", "b"))
+    send_all(tele, [(x, [x * 2, x * 3]) for x in range(5)])
+
+    parser = ploter.LineParser()
+    values = parser.feed(bytes(sink.output))
+    assert parser.labels == ["ms", "a", "b"]
+    assert values.tolist() == [[x, x * 2, x * 3] for x in range(5)]